@@ -0,0 +1,165 @@
+import io
+import struct
+from typing import Optional, Tuple
+
+import numpy as np
+
+# format name -> media type
+MEDIA_TYPES = {
+    "json": "application/json",
+    "f64": "application/x-risklens-f64",
+    "f32": "application/x-risklens-f32",
+    "npy": "application/x-npy",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# streaming format name -> media type
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+_ACCEPT_ALIASES = {
+    "application/octet-stream": "f64",
+    "*/*": "json",
+    "application/*": "json",
+}
+
+# Raw format header: magic, version, item size (4 or 8), reserved, count.
+# Followed by `count` little-endian IEEE floats.
+RAW_MAGIC = b"RLNS"
+RAW_VERSION = 1
+RAW_HEADER = struct.Struct("<4sBBHQ")
+
+
+class UnsupportedFormat(ValueError):
+    """
+    Raised when no acceptable encoding can be produced.
+    """
+
+
+def negotiate(format: Optional[str], accept: Optional[str]) -> str:
+    """
+    Picks the response format: an explicit `format` parameter wins,
+    then the first supported media type in the Accept header
+    (parameters and q-values are ignored), then JSON.
+    """
+    if format is not None:
+        if format not in MEDIA_TYPES:
+            raise UnsupportedFormat(f"Unsupported format: {format}")
+        return format
+
+    if not accept:
+        return "json"
+
+    by_media_type = {media: name for name, media in MEDIA_TYPES.items()}
+    for part in accept.split(","):
+        media = part.split(";")[0].strip().lower()
+        if media in by_media_type:
+            return by_media_type[media]
+        if media in _ACCEPT_ALIASES:
+            return _ACCEPT_ALIASES[media]
+
+    raise UnsupportedFormat(f"None of the accepted media types is supported: {accept}")
+
+
+def negotiate_stream(format: Optional[str], accept: Optional[str]) -> str:
+    """
+    negotiate() for the streaming endpoints: an explicit `format` wins,
+    then the Accept header, then NDJSON.
+    """
+    if format is not None:
+        if format not in STREAM_MEDIA_TYPES:
+            raise UnsupportedFormat(f"Unsupported stream format: {format}")
+        return format
+
+    if not accept:
+        return "ndjson"
+
+    by_media_type = {media: name for name, media in STREAM_MEDIA_TYPES.items()}
+    for part in accept.split(","):
+        media = part.split(";")[0].strip().lower()
+        if media in by_media_type:
+            return by_media_type[media]
+        if media in ("*/*", "application/*", "application/json"):
+            return "ndjson"
+
+    raise UnsupportedFormat(f"None of the accepted media types is supported: {accept}")
+
+
+def encode_event(event: str, data: str, format: str) -> bytes:
+    """
+    Frames one stream message; `data` is a JSON document.
+
+    - ndjson: one line {"event": ..., "data": ...}
+    - sse: an "event:" and a "data:" field, ended by a blank line
+    """
+    if format == "ndjson":
+        return f'{{"event":"{event}","data":{data}}}\n'.encode()
+    if format == "sse":
+        return f"event: {event}\ndata: {data}\n\n".encode()
+    raise UnsupportedFormat(f"Unsupported stream format: {format}")
+
+
+def encode_array(values: np.ndarray, format: str) -> Tuple[memoryview, str]:
+    """
+    Encodes a 1-D float array as (body, media type) for a binary format.
+
+    Every encoder makes at most one copy of the data, straight from the
+    array buffer (with the dtype conversion for f32); no per-element
+    Python objects are created.
+    """
+    values = np.asarray(values)
+    if values.ndim != 1:
+        raise ValueError("Only 1-D arrays can be encoded")
+
+    if format in ("f64", "f32"):
+        dtype = np.dtype("<f8" if format == "f64" else "<f4")
+        header = RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, dtype.itemsize, 0, len(values))
+        return _with_header(header, values, dtype), MEDIA_TYPES[format]
+
+    if format == "npy":
+        dtype = np.dtype("<f8")
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header,
+            {"descr": dtype.str, "fortran_order": False, "shape": (len(values),)},
+        )
+        return _with_header(header.getvalue(), values, dtype), MEDIA_TYPES[format]
+
+    if format == "arrow":
+        return _encode_arrow(values), MEDIA_TYPES[format]
+
+    raise UnsupportedFormat(f"Not a binary format: {format}")
+
+
+def decode_raw(body: bytes) -> np.ndarray:
+    """
+    Inverse of the f64/f32 raw encodings (for clients and tests).
+    """
+    magic, version, itemsize, _, count = RAW_HEADER.unpack_from(body)
+    if magic != RAW_MAGIC or version != RAW_VERSION or itemsize not in (4, 8):
+        raise ValueError("Not a RiskLens raw array")
+    dtype = "<f8" if itemsize == 8 else "<f4"
+    return np.frombuffer(body, dtype=dtype, count=count, offset=RAW_HEADER.size)
+
+
+def _with_header(header: bytes, values: np.ndarray, dtype: np.dtype) -> memoryview:
+    body = bytearray(len(header) + len(values) * dtype.itemsize)
+    body[: len(header)] = header
+    np.frombuffer(body, dtype=dtype, count=len(values), offset=len(header))[:] = values
+    return memoryview(body)
+
+
+def _encode_arrow(values: np.ndarray) -> memoryview:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise UnsupportedFormat("Arrow encoding requires pyarrow")
+
+    # pa.array wraps the numpy buffer without copying
+    batch = pa.record_batch([pa.array(np.ascontiguousarray(values, dtype=np.float64))], names=["profit"])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return memoryview(sink.getvalue())
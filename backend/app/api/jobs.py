@@ -0,0 +1,329 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Awaitable, Callable, Dict, Literal, Optional, Union
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from .scheduler import SchedulerBusy, SimulationScheduler, scheduler
+from .simulation import (
+    SimulateProgress,
+    SimulateRangeRequest,
+    SimulateRangeResponse,
+    SimulateRequest,
+    SimulateResponse,
+    _range_events,
+    _range_plan,
+    _simulation_events,
+    _simulation_plan,
+)
+
+router = APIRouter()
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+PRIORITIES = {"low": -1, "normal": 0, "high": 1}
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    priority: int
+    created_at: float
+    status: JobStatus = "queued"
+
+    # fraction of the work done, and the latest partial summary
+    progress: float = 0.0
+    partial: Optional[Any] = None
+
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+
+# Runs a job: admits its work, sets status "running" and reports progress
+JobWork = Callable[[Job], Awaitable[Any]]
+
+
+class JobManager:
+    """
+    In-process registry of background simulation jobs.
+
+    Each job is an asyncio task on the event loop whose work is admitted
+    by the SimulationScheduler at the job's priority, so jobs share the
+    worker pool and in-flight budget with synchronous requests. At most
+    max_jobs jobs may be unfinished; beyond that submit() raises
+    SchedulerBusy. Cancellation cancels the task: work stepped through
+    ScheduledStream stops after the current chunk.
+
+    Finished jobs (and their results) are kept for ttl_seconds after
+    they end. State is only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        scheduler: SimulationScheduler,
+        max_jobs: int,
+        ttl_seconds: float,
+    ):
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be >= 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+
+        self.scheduler = scheduler
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._submitted = 0
+        self._rejected = 0
+        self._expired = 0
+
+    @staticmethod
+    def from_env(scheduler: SimulationScheduler) -> "JobManager":
+        return JobManager(
+            scheduler,
+            max_jobs=int(os.environ.get("RISKLENS_MAX_JOBS", 256)),
+            ttl_seconds=float(os.environ.get("RISKLENS_JOB_TTL_SECONDS", 3600)),
+        )
+
+    def submit(self, kind: str, work: JobWork, priority: int = 0) -> Job:
+        self._expire()
+
+        if sum(not job.done for job in self._jobs.values()) >= self.max_jobs:
+            self._rejected += 1
+            raise SchedulerBusy(self.scheduler.retry_after())
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            priority=priority,
+            created_at=time.time(),
+        )
+        job.task = asyncio.get_running_loop().create_task(self._run(job, work))
+        self._jobs[job.id] = job
+        self._submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.task.cancel()
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        self._expire()
+        counts = {status: 0 for status in JobStatus.__args__}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {
+            **counts,
+            "max_jobs": self.max_jobs,
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+            "expired": self._expired,
+        }
+
+    def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if not job.done:
+                job.task.cancel()
+
+    async def _run(self, job: Job, work: JobWork) -> None:
+        try:
+            job.result = await work(job)
+            job.progress = 1.0
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self._expired += len(expired)
+
+
+jobs = JobManager.from_env(scheduler)
+
+
+# ==============================
+# /jobs (background simulations)
+# ==============================
+
+Priority = Literal["low", "normal", "high"]
+
+
+class SimulateJobRequest(BaseModel):
+    kind: Literal["simulate"]
+    request: SimulateRequest
+    priority: Priority = "normal"
+
+
+class SimulateRangeJobRequest(BaseModel):
+    kind: Literal["simulate-range"]
+    request: SimulateRangeRequest
+    priority: Priority = "normal"
+
+
+JobRequest = Annotated[Union[SimulateJobRequest, SimulateRangeJobRequest], Field(discriminator="kind")]
+
+
+class RangePartial(BaseModel):
+    prices_completed: int
+    total_prices: int
+    # best price among the completed ones
+    optimal_price: float
+    max_mean_profit: float
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    priority: Priority
+    progress: float
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # running summary so far (simulate: SimulateProgress)
+    partial: Optional[Union[SimulateProgress, RangePartial]] = None
+    # set once succeeded
+    result: Optional[Union[SimulateResponse, SimulateRangeResponse]] = None
+    error: Optional[str] = None
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(req: JobRequest) -> JobResponse:
+    """
+    Starts a /simulate or /simulate-range computation in the background.
+    The request is validated now; poll GET /jobs/{id} for the result.
+    """
+    if req.kind == "simulate":
+        plan = _simulation_plan(req.request)
+        work = _simulate_work(req.request, plan)
+    else:
+        plan = _range_plan(req.request)
+        work = _range_work(req.request, plan)
+
+    job = jobs.submit(req.kind, work, priority=PRIORITIES[req.priority])
+    return _job_response(job)
+
+
+@router.get("/jobs/stats")
+async def job_stats():
+    """
+    Job counts per status and the submission counters.
+    """
+    return jobs.stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    return _job_response(_find(jobs.get(job_id), job_id))
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str) -> JobResponse:
+    """
+    Cancels a queued or running job. A running simulation stops after
+    its current chunk; finished jobs are left as they are.
+    """
+    job = _find(jobs.cancel(job_id), job_id)
+    if not job.done:
+        # Cancellation is delivered at the task's next await; report the outcome
+        await asyncio.wait({job.task}, timeout=1.0)
+    return _job_response(job)
+
+
+def _simulate_work(req: SimulateRequest, plan) -> JobWork:
+    async def work(job: Job):
+        # The job manager bounds the backlog, so wait however long the queue is
+        _, messages = await _simulation_events(
+            req, *plan, priority=job.priority, limit_queue=False
+        )
+        _started(job)
+        async for event, message in messages:
+            if event == "result":
+                return message
+            job.partial = message
+            job.progress = message.runs_completed / message.total_runs
+
+    return work
+
+
+def _range_work(req: SimulateRangeRequest, plan) -> JobWork:
+    async def work(job: Job):
+        _, messages = await _range_events(
+            req, *plan, priority=job.priority, limit_queue=False
+        )
+        _started(job)
+        best = None
+        async for event, message in messages:
+            if event == "result":
+                return message
+            for point in message.points:
+                if best is None or point.mean_profit > best.mean_profit:
+                    best = point
+            job.partial = RangePartial(
+                prices_completed=message.prices_completed,
+                total_prices=message.total_prices,
+                optimal_price=best.price,
+                max_mean_profit=best.mean_profit,
+            )
+            job.progress = message.prices_completed / message.total_prices
+
+    return work
+
+
+def _started(job: Job) -> None:
+    job.status = "running"
+    job.started_at = time.time()
+
+
+def _find(job: Optional[Job], job_id: str) -> Job:
+    if job is None:
+        raise HTTPException(status_code=404, detail={"message": f"Unknown or expired job: {job_id}"})
+    return job
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        priority={value: name for name, value in PRIORITIES.items()}[job.priority],
+        progress=job.progress,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        partial=job.partial,
+        result=job.result,
+        error=job.error,
+    )
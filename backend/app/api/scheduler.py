@@ -0,0 +1,279 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Generic, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SchedulerBusy(RuntimeError):
+    """
+    Raised when a simulation cannot be admitted because the queue is full.
+    """
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__("Simulation queue is full; retry later")
+
+
+class SimulationTooLarge(ValueError):
+    """
+    Raised when a single simulation exceeds the total in-flight cost budget.
+    """
+
+    def __init__(self, cost: int, max_cost: int):
+        self.cost = cost
+        self.max_cost = max_cost
+        super().__init__(
+            f"Simulation cost {cost} (runs x prices) exceeds the limit of {max_cost}"
+        )
+
+
+@dataclass
+class _Waiter:
+    cost: int
+    priority: int
+    future: asyncio.Future
+
+
+class SimulationScheduler:
+    """
+    Runs CPU-bound simulations off the event loop with admission control.
+
+    Work is dispatched to a bounded thread pool. Each job declares a cost
+    (runs x prices); jobs start only while the total cost in flight stays
+    within max_inflight_cost, otherwise they wait in a queue of at most
+    max_queue jobs, ordered by priority (higher first) and FIFO within a
+    priority. When the queue is full, SchedulerBusy is raised with a
+    Retry-After estimate.
+
+    State is only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_inflight_cost: int,
+        max_queue: int,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_inflight_cost < 1:
+            raise ValueError("max_inflight_cost must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+
+        self.max_workers = max_workers
+        self.max_inflight_cost = max_inflight_cost
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="simulation",
+        )
+        self._waiters: Deque[_Waiter] = deque()
+        self._inflight_cost = 0
+        self._running = 0
+
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_service = 0.0
+
+    @staticmethod
+    def from_env() -> "SimulationScheduler":
+        return SimulationScheduler(
+            max_workers=int(os.environ.get("RISKLENS_SIM_WORKERS", os.cpu_count() or 1)),
+            max_inflight_cost=int(os.environ.get("RISKLENS_MAX_INFLIGHT_COST", 50_000_000)),
+            max_queue=int(os.environ.get("RISKLENS_MAX_QUEUE", 64)),
+        )
+
+    async def run(self, cost: int, fn: Callable[..., T], *args, priority: int = 0) -> T:
+        """
+        Waits for admission, then runs fn(*args) in the worker pool.
+        """
+        cost, started_at = await self._admit(cost, priority)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._finish(cost, started_at)
+
+    async def stream(
+        self,
+        cost: int,
+        fn: Callable[..., Iterator[T]],
+        *args,
+        priority: int = 0,
+        limit_queue: bool = True,
+    ) -> "ScheduledStream[T]":
+        """
+        Waits for admission, then returns the items of the generator
+        fn(*args), each computed in the worker pool when requested.
+        The slot is held until the stream is exhausted or closed.
+
+        limit_queue=False waits even when the queue is full, for callers
+        that bound their own backlog (see jobs.JobManager).
+        """
+        cost, started_at = await self._admit(cost, priority, limit_queue)
+        return ScheduledStream(self, cost, started_at, fn(*args))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_workers": self.max_workers,
+            "max_inflight_cost": self.max_inflight_cost,
+            "max_queue": self.max_queue,
+            "inflight_cost": self._inflight_cost,
+            "running": self._running,
+            "queue_depth": len(self._waiters),
+            "queued_cost": sum(w.cost for w in self._waiters),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "avg_wait_seconds": self._total_wait / self._admitted if self._admitted else 0.0,
+            "max_wait_seconds": self._max_wait,
+            "avg_service_seconds": self._total_service / self._completed if self._completed else 0.0,
+        }
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the queue has likely drained by one slot.
+        """
+        avg_service = self._total_service / self._completed if self._completed else 1.0
+        backlog = len(self._waiters) + self._running
+        return max(1, math.ceil(avg_service * backlog / self.max_workers))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _admit(self, cost: int, priority: int = 0, limit_queue: bool = True) -> Tuple[int, float]:
+        cost = max(1, int(cost))
+
+        if cost > self.max_inflight_cost:
+            self._rejected += 1
+            raise SimulationTooLarge(cost, self.max_inflight_cost)
+
+        enqueued_at = time.monotonic()
+        await self._acquire(cost, priority, limit_queue)
+        waited = time.monotonic() - enqueued_at
+
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+        self._running += 1
+        return cost, time.monotonic()
+
+    def _finish(self, cost: int, started_at: float) -> None:
+        self._running -= 1
+        self._completed += 1
+        self._total_service += time.monotonic() - started_at
+        self._release(cost)
+
+    async def _acquire(self, cost: int, priority: int, limit_queue: bool) -> None:
+        if not self._waiters and self._inflight_cost + cost <= self.max_inflight_cost:
+            self._inflight_cost += cost
+            return
+
+        if limit_queue and len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise SchedulerBusy(self.retry_after())
+
+        waiter = _Waiter(
+            cost=cost,
+            priority=priority,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        # Behind every waiter of the same or higher priority
+        position = len(self._waiters)
+        while position > 0 and self._waiters[position - 1].priority < priority:
+            position -= 1
+        self._waiters.insert(position, waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Client went away: give back the slot if it was already granted
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(cost)
+            else:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+            raise
+
+    def _release(self, cost: int) -> None:
+        self._inflight_cost -= cost
+        self._wake()
+
+    def _wake(self) -> None:
+        # Admit from the head (highest priority, oldest) while the budget allows
+        while self._waiters:
+            head = self._waiters[0]
+            if head.future.cancelled():
+                self._waiters.popleft()
+                continue
+            if self._inflight_cost + head.cost > self.max_inflight_cost:
+                return
+            self._waiters.popleft()
+            self._inflight_cost += head.cost
+            head.future.set_result(None)
+
+
+_DONE = object()
+
+
+class ScheduledStream(Generic[T]):
+    """
+    Async iteration over a generator admitted by SimulationScheduler.
+
+    Each item is computed by one step of the generator in the worker
+    pool, only once the consumer asks for it. close() (or leaving the
+    iteration early, e.g. on client disconnect) stops stepping: a step
+    already running in a worker cannot be interrupted, so the generator
+    is closed and the slot released when that step returns.
+    """
+
+    def __init__(self, scheduler: SimulationScheduler, cost: int, started_at: float, iterator: Iterator[T]):
+        self._scheduler = scheduler
+        self._cost = cost
+        self._started_at = started_at
+        self._iterator = iterator
+        self._step: Optional[asyncio.Future] = None
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._closed:
+                self._step = loop.run_in_executor(self._scheduler._executor, next, self._iterator, _DONE)
+                # Shielded: cancelling the consumer must not mark a running step done
+                item = await asyncio.shield(self._step)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._step is not None and not self._step.done():
+            self._step.add_done_callback(lambda _: self._finish())
+        else:
+            self._finish()
+
+    def _finish(self) -> None:
+        self._iterator.close()
+        self._scheduler._finish(self._cost, self._started_at)
+
+
+scheduler = SimulationScheduler.from_env()
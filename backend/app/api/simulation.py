@@ -1,53 +1,146 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import List, Literal
-import math
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.background import BackgroundTask
+from typing import Annotated, Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Tuple, Union
+import dataclasses
+import functools
+import json
+import os
 
+import numpy as np
+
+from app.simulation.adaptive import (
+    MIN_TARGET_RUNS,
+    PrecisionReport,
+    PrecisionTarget,
+    precision_report,
+    run_adaptive_price_grid,
+    run_adaptive_simulation,
+)
+from app.simulation.aggregate import SimulationSummary
+from app.simulation.batch import noise_key, run_scenario_batch
+from app.simulation.analytic import analytic_optimal_price, analytic_profit_moments
+from app.simulation.cache import (
+    SimulationCache,
+    config_key,
+    paired_comparison_key,
+    price_grid_key,
+)
+from app.simulation.compare import PairedComparison, paired_comparison
 from app.simulation.config import PricingSimulationConfig, ConfigValidationError
-from app.simulation.results import run_simulation
+from app.simulation.distribution import ecdf, profit_histogram, quantile_grid
+from app.simulation.global_sensitivity import SobolIndices, sobol_indices
+from app.simulation.grid import iter_price_grid, run_price_grid
+from app.simulation.horizon import (
+    MAX_HORIZON_PERIODS,
+    HorizonAssumptions,
+    HorizonSummary,
+    run_horizon,
+)
+from app.simulation.monte_carlo import STREAM_CHUNK_RUNS
+from app.simulation.pipeline import SimulationPipeline
+from app.simulation.results import SimulationProgress, SimulationResult, iter_simulation, run_simulation
+from app.simulation.sketch import KLLSketch
+from app.simulation.store import SimulationStore
+
+from .encoding import (
+    STREAM_MEDIA_TYPES,
+    UnsupportedFormat,
+    encode_array,
+    encode_event,
+    negotiate,
+    negotiate_stream,
+)
+from .scheduler import ScheduledStream, SimulationTooLarge, scheduler
 
 router = APIRouter()
 
+# Results are deterministic given the config (incl. random_seed), so
+# identical requests are served from a content-addressed cache, optionally
+# backed by an on-disk store that survives restarts.
+_store_dir = os.environ.get("RISKLENS_STORE_DIR")
+
+cache = SimulationCache(
+    max_bytes=int(os.environ.get("RISKLENS_CACHE_BYTES", 256 * 1024 * 1024)),
+    summaries_only=os.environ.get("RISKLENS_CACHE_SUMMARIES_ONLY", "0") == "1",
+    store=SimulationStore(
+        _store_dir,
+        max_bytes=int(os.environ.get("RISKLENS_STORE_BYTES", 10 * 1024 ** 3)),
+    ) if _store_dir else None,
+)
+
+
+async def _cache_get(key: str, need_outcomes: bool = False) -> Optional[Any]:
+    # A memory miss falls through to the store (SQLite, memory-mapped
+    # columns): keep that off the event loop
+    if cache.store is None:
+        return cache.get(key, need_outcomes=need_outcomes)
+    return await run_in_threadpool(cache.get, key, need_outcomes)
+
+
+async def _cache_put(key: str, value: Any, config: Optional[PricingSimulationConfig] = None) -> None:
+    # Results are written through to the store (np.save, SQLite, gc)
+    if cache.store is None:
+        cache.put(key, value, config)
+    else:
+        await run_in_threadpool(cache.put, key, value, config)
+
+# Stage arrays of recent simulations (noise, demand, revenue, ...), so a
+# request differing from a recent one only in costs recomputes only the
+# cost and profit stages
+pipeline = SimulationPipeline(
+    max_bytes=int(os.environ.get("RISKLENS_PIPELINE_BYTES", 256 * 1024 * 1024)),
+)
+
 Dist = Literal["normal", "lognormal"]
+Engine = Literal["python", "numpy"]
+RangeEngine = Literal["python", "numpy", "analytic"]
+Sampling = Literal["iid", "antithetic", "lhs", "sobol", "control_variate"]
+DType = Literal["float64", "float32"]
+RiskLevel = Annotated[float, Field(gt=0, lt=1)]
 
 
-# ==============================
-# /simulate  (atomic evaluation)
-# ==============================
+class TailRisk(BaseModel):
+    level: float
+    value_at_risk: float
+    conditional_value_at_risk: float
 
-class SimulateRequest(BaseModel):
-    # decision
-    price: float = Field(gt=0)
 
-    # assumptions
-    base_demand: float
-    price_elasticity: float
-    unit_cost: float
-    fixed_cost: float
+class PrecisionRequest(BaseModel):
+    # targets (at least one); sampling stops once all are met
+    mean_rel_half_width: Optional[float] = Field(default=None, gt=0)
+    prob_loss_half_width: Optional[float] = Field(default=None, gt=0, lt=1)
+    confidence: float = Field(default=0.95, gt=0, lt=1)
 
-    # uncertainty (NOTE: your config requires sigma > 0)
-    demand_noise_distribution: Dist = "normal"
-    demand_noise_sigma: float = Field(gt=0)
+    # runs per batch between checks, and the run budget (replaces num_runs)
+    batch_runs: int = Field(default=1000, ge=MIN_TARGET_RUNS)
+    max_runs: int = Field(default=100_000, ge=1)
 
-    elasticity_noise_distribution: Dist = "normal"
-    elasticity_noise_sigma: float = Field(gt=0)
 
-    # simulation
-    num_runs: int = Field(default=1000, ge=1)
-    random_seed: int = 0
+class Precision(BaseModel):
+    num_runs: int
+    mean_half_width: float
+    mean_rel_half_width: Optional[float]
+    prob_loss_half_width: float
+    converged: bool
 
 
-class SimulateResponse(BaseModel):
-    profits: List[float]
-    mean_profit: float
-    std_profit: float
-    prob_loss: float
+def _build_config(req, price: float) -> PricingSimulationConfig:
+    """
+    Validates the shared request fields into a config for one price.
+    With a precision target, num_runs is the target's run budget.
+    """
+    try:
+        return PricingSimulationConfig.from_request(_config_payload(req, price))
+    except ConfigValidationError as e:
+        raise HTTPException(status_code=400, detail={"field": e.field, "message": str(e)})
 
 
-@router.post("/simulate", response_model=SimulateResponse)
-async def simulate(req: SimulateRequest) -> SimulateResponse:
-    payload = {
-        "decision": {"price": req.price},
+def _config_payload(req, price: float) -> dict:
+    return {
+        "decision": {"price": price},
         "assumptions": {
             "demand_model": {
                 "base_demand": req.base_demand,
@@ -67,34 +160,329 @@ async def simulate(req: SimulateRequest) -> SimulateResponse:
                 "distribution": req.elasticity_noise_distribution,
                 "sigma": req.elasticity_noise_sigma,
             },
+            "correlation": getattr(req, "noise_correlation", 0.0),
         },
         "simulation": {
-            "num_runs": req.num_runs,
+            "num_runs": req.precision.max_runs if getattr(req, "precision", None) else req.num_runs,
             "random_seed": req.random_seed,
+            # "analytic" needs no sampling engine; validate as numpy
+            "engine": "numpy" if req.engine == "analytic" else req.engine,
+            "sampling": req.sampling,
+            "dtype": getattr(req, "dtype", "float64"),
         },
     }
 
+
+def _precision_target(req) -> PrecisionTarget:
+    if req.engine != "numpy":
+        raise HTTPException(
+            status_code=400,
+            detail={"field": "engine", "message": "Precision targets require the numpy engine"},
+        )
+
     try:
-        config = PricingSimulationConfig.from_request(payload)
-    except ConfigValidationError as e:
-        raise HTTPException(status_code=400, detail={"field": e.field, "message": str(e)})
+        return PrecisionTarget(
+            mean_rel_half_width=req.precision.mean_rel_half_width,
+            prob_loss_half_width=req.precision.prob_loss_half_width,
+            confidence=req.precision.confidence,
+            batch_runs=req.precision.batch_runs,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"field": "precision", "message": str(e)})
+
+
+def _precision(report: PrecisionReport) -> Precision:
+    return Precision(
+        num_runs=report.num_runs,
+        mean_half_width=report.mean_half_width,
+        mean_rel_half_width=report.mean_rel_half_width,
+        prob_loss_half_width=report.prob_loss_half_width,
+        converged=report.converged,
+    )
+
+
+def _tail_risk(summary: SimulationSummary) -> List[TailRisk]:
+    return [
+        TailRisk(
+            level=level,
+            value_at_risk=summary.value_at_risk[level],
+            conditional_value_at_risk=summary.conditional_value_at_risk[level],
+        )
+        for level in summary.value_at_risk
+    ]
+
+
+# ==============================
+# /simulate  (atomic evaluation)
+# ==============================
+
+# Upper bound on histogram bins / grid points per response
+MAX_DISTRIBUTION_POINTS = 10_000
 
-    result = run_simulation(config)
-    profits = [o.profit for o in result.outcomes]
+# Above this many runs, histogram/quantile/ECDF responses come from a
+# constant-memory run (run_simulation(constant_memory=True)): exact
+# moments, sketched quantiles, no outcomes held
+MAX_RETAINED_RUNS = int(os.environ.get("RISKLENS_MAX_RETAINED_RUNS", 1 << 22))
 
-    mean_profit = result.summary.mean_profit
-    std_profit = math.sqrt(result.summary.profit_variance)
+# A constant-memory run holds one chunk of outcomes at a time whatever
+# its num_runs, and is admitted at that cost: runs past the scheduler's
+# in-flight budget (RISKLENS_MAX_INFLIGHT_COST) still get through, one
+# worker thread each
+CONSTANT_MEMORY_COST = STREAM_CHUNK_RUNS
 
-    prob_loss = sum(1 for p in profits if p < 0) / len(profits)
+class SimulateRequest(BaseModel):
+    # decision
+    price: float = Field(gt=0)
+
+    # assumptions
+    base_demand: float
+    price_elasticity: float
+    unit_cost: float
+    fixed_cost: float
+
+    # uncertainty (NOTE: your config requires sigma > 0)
+    demand_noise_distribution: Dist = "normal"
+    demand_noise_sigma: float = Field(gt=0)
+
+    elasticity_noise_distribution: Dist = "normal"
+    elasticity_noise_sigma: float = Field(gt=0)
+
+    # correlation of the two noises (numpy engine only)
+    noise_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
+    # simulation
+    num_runs: int = Field(default=1000, ge=1)
+    random_seed: int = 0
+    engine: Engine = "python"
+    # variance reduction (numpy engine only)
+    sampling: Sampling = "iid"
+    # arithmetic precision (numpy engine only)
+    dtype: DType = "float64"
+
+    # tail risk confidence levels
+    risk_levels: List[RiskLevel] = Field(default=[0.95, 0.99], min_length=1)
+
+    # optional: sample until the CI target is met instead of num_runs
+    precision: Optional[PrecisionRequest] = None
+
+    # what to return for the profit distribution; anything but "samples"
+    # keeps the payload size independent of num_runs
+    distribution: Literal["samples", "histogram", "quantiles", "ecdf"] = "samples"
+    bins: int = Field(default=50, ge=1, le=MAX_DISTRIBUTION_POINTS)
+    hist_range: Optional[Tuple[float, float]] = None
+    # quantile grid / ECDF resolution
+    points: int = Field(default=101, ge=2, le=MAX_DISTRIBUTION_POINTS)
+
+
+class Histogram(BaseModel):
+    edges: List[float]
+    counts: List[int]
+    underflow: int
+    overflow: int
+
+
+class QuantileGrid(BaseModel):
+    levels: List[float]
+    values: List[float]
+
+
+class ECDF(BaseModel):
+    values: List[float]
+    probabilities: List[float]
+
+
+class SimulateMetrics(BaseModel):
+    mean_profit: float
+    std_profit: float
+    prob_loss: float
+    skew_profit: float
+    min_profit: float
+    max_profit: float
+    tail_risk: List[TailRisk]
+    # runs used and achieved CI (precision requests only)
+    precision: Optional[Precision] = None
+
+
+class SimulateResponse(SimulateMetrics):
+    # exactly one of these is set, per the requested distribution mode
+    profits: Optional[List[float]] = None
+    histogram: Optional[Histogram] = None
+    quantiles: Optional[QuantileGrid] = None
+    ecdf: Optional[ECDF] = None
+
+@router.post("/simulate", response_model=SimulateResponse)
+async def simulate(
+    req: SimulateRequest,
+    format: Annotated[
+        Optional[Literal["json", "f64", "f32", "npy", "arrow"]],
+        Query(description="Response format; overrides the Accept header"),
+    ] = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Union[SimulateResponse, Response]:
+    """
+    JSON by default. Binary formats (see api/encoding.py) carry the raw
+    profit samples in the body and the metrics as JSON in the
+    X-Risklens-Metrics header.
+    """
+    try:
+        response_format = negotiate(format, accept)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail={"message": str(e)})
+
+    _check_distribution(req, response_format)
+    config = _build_config(req, req.price)
+    key, target = _simulation_key(req, config)
+
+    constant_memory = _constant_memory(req, config, target, response_format)
+    if constant_memory:
+        key = _constant_memory_key(req, config)
+
+    result = await _cached_simulation(key, constant_memory)
+
+    if result is None:
+        if constant_memory:
+            result = await scheduler.run(
+                min(config.num_runs, CONSTANT_MEMORY_COST),
+                functools.partial(run_simulation, constant_memory=True),
+                config,
+                req.risk_levels,
+            )
+        elif target is None:
+            result = await scheduler.run(
+                config.num_runs,
+                _pipelined(run_simulation, config),
+                config,
+                req.risk_levels,
+            )
+        else:
+            # Admitted at the full budget; early stopping only frees it sooner
+            result = await scheduler.run(
+                config.num_runs,
+                run_adaptive_simulation,
+                config,
+                target,
+                req.risk_levels,
+            )
+        await _cache_put(key, result, config)
+
+    metrics = _metrics(result.summary, target)
+
+    if response_format != "json":
+        try:
+            body, media_type = encode_array(result.outcomes.profit, response_format)
+        except UnsupportedFormat as e:
+            raise HTTPException(status_code=406, detail={"message": str(e)})
+        return Response(
+            content=body,
+            media_type=media_type,
+            headers={"X-Risklens-Metrics": metrics.model_dump_json()},
+        )
 
     return SimulateResponse(
-        profits=profits,
-        mean_profit=mean_profit,
-        std_profit=std_profit,
-        prob_loss=prob_loss,
+        **dict(metrics),
+        **_distribution(req, result.sketch if constant_memory else result.outcomes.profit),
     )
 
 
+def _constant_memory(
+    req: SimulateRequest,
+    config: PricingSimulationConfig,
+    target: Optional[PrecisionTarget],
+    response_format: str = "json",
+) -> bool:
+    # Summary-only responses of huge numpy runs never hold the outcomes
+    return (
+        target is None
+        and config.engine == "numpy"
+        and response_format == "json"
+        and req.distribution != "samples"
+        and config.num_runs > MAX_RETAINED_RUNS
+    )
+
+
+def _constant_memory_key(req: SimulateRequest, config: PricingSimulationConfig) -> str:
+    return config_key("simulation", config, risk_levels=list(req.risk_levels), constant_memory=True)
+
+
+async def _cached_simulation(key: str, constant_memory: bool) -> Optional[SimulationResult]:
+    result = await _cache_get(key, need_outcomes=not constant_memory)
+    if constant_memory and result is not None and result.sketch is None:
+        # The on-disk store keeps summaries, not sketches
+        return None
+    return result
+
+
+def _pipelined(fn, config: PricingSimulationConfig):
+    # run_simulation / iter_simulation on the shared pipeline (numpy engine only)
+    if config.engine != "numpy":
+        return fn
+    return functools.partial(fn, pipeline=pipeline)
+
+
+def _check_distribution(req: SimulateRequest, response_format: str) -> None:
+    if response_format != "json" and req.distribution != "samples":
+        raise HTTPException(
+            status_code=400,
+            detail={"field": "distribution", "message": "Binary formats carry raw samples only"},
+        )
+    if req.hist_range is not None and not req.hist_range[1] > req.hist_range[0]:
+        raise HTTPException(
+            status_code=400,
+            detail={"field": "hist_range", "message": "Upper bound must exceed lower bound"},
+        )
+
+
+def _simulation_key(
+    req: SimulateRequest,
+    config: PricingSimulationConfig,
+) -> Tuple[str, Optional[PrecisionTarget]]:
+    if req.precision is None:
+        return config_key("simulation", config, risk_levels=list(req.risk_levels)), None
+
+    target = _precision_target(req)
+    key = config_key(
+        "adaptive_simulation",
+        config,
+        risk_levels=list(req.risk_levels),
+        precision=dataclasses.asdict(target),
+    )
+    return key, target
+
+
+def _metrics(summary: SimulationSummary, target: Optional[PrecisionTarget]) -> SimulateMetrics:
+    return SimulateMetrics(
+        mean_profit=summary.mean_profit,
+        std_profit=summary.std_profit,
+        prob_loss=summary.prob_loss,
+        skew_profit=summary.profit_skew,
+        min_profit=summary.min_profit,
+        max_profit=summary.max_profit,
+        tail_risk=_tail_risk(summary),
+        precision=_precision(precision_report(summary, target)) if target else None,
+    )
+
+
+def _distribution(req: SimulateRequest, profits: Union[np.ndarray, KLLSketch]) -> dict:
+    if req.distribution == "histogram":
+        hist = profit_histogram(profits, bins=req.bins, range=req.hist_range)
+        return {"histogram": Histogram(
+            edges=hist.edges.tolist(),
+            counts=hist.counts.tolist(),
+            underflow=hist.underflow,
+            overflow=hist.overflow,
+        )}
+
+    if req.distribution == "quantiles":
+        grid = quantile_grid(profits, points=req.points)
+        return {"quantiles": QuantileGrid(levels=grid.levels.tolist(), values=grid.values.tolist())}
+
+    if req.distribution == "ecdf":
+        curve = ecdf(profits, points=req.points)
+        return {"ecdf": ECDF(values=curve.values.tolist(), probabilities=curve.probabilities.tolist())}
+
+    return {"profits": profits.tolist()}
+
+
 # =================================
 # /simulate-range (search/optimize)
 # =================================
@@ -118,16 +506,34 @@ class SimulateRangeRequest(BaseModel):
     elasticity_noise_distribution: Dist = "normal"
     elasticity_noise_sigma: float = Field(gt=0)
 
+    # correlation of the two noises (numpy engine only)
+    noise_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
     # simulation (applied per price)
     num_runs: int = Field(default=500, ge=1)
     random_seed: int = 0
+    # "analytic": exact mean/std from closed forms, no sampling and no tail metrics
+    engine: RangeEngine = "python"
+    # variance reduction and precision (numpy engine only; ignored by "analytic")
+    sampling: Sampling = "iid"
+    dtype: DType = "float64"
+
+    # tail risk confidence levels (per price)
+    risk_levels: List[RiskLevel] = Field(default=[0.95], min_length=1)
+
+    # optional: per-price sampling until the CI target is met
+    precision: Optional[PrecisionRequest] = None
 
 
 class PricePoint(BaseModel):
     price: float
     mean_profit: float
     std_profit: float
-    prob_loss: float
+    # Monte Carlo only (None for the analytic engine)
+    prob_loss: Optional[float] = None
+    tail_risk: Optional[List[TailRisk]] = None
+    # runs used and achieved CI (precision requests only)
+    precision: Optional[Precision] = None
 
 
 class SimulateRangeResponse(BaseModel):
@@ -136,81 +542,896 @@ class SimulateRangeResponse(BaseModel):
     max_mean_profit: float
 
 
-@router.post("/simulate-range", response_model=SimulateRangeResponse)
-async def simulate_range(req: SimulateRangeRequest) -> SimulateRangeResponse:
+# Safety cap on grid size; noise is shared so cost is ~prices x runs array ops
+MAX_GRID_POINTS = 100_000
+
+# Pairs grow quadratically with the number of compared prices
+MAX_COMPARE_PRICES = 50
+
+
+def _price_grid(req: SimulateRangeRequest) -> np.ndarray:
     if req.max_price < req.min_price:
         raise HTTPException(status_code=400, detail={"field": "max_price", "message": "Must be >= min_price"})
 
-    curve: List[PricePoint] = []
-
-    # avoid float drift by iterating with k
+    # avoid float drift by stepping with k
     span = req.max_price - req.min_price
     n_steps = int(span / req.step) + 1  # inclusive-ish
-    # safety cap to prevent accidental huge loops
-    if n_steps > 5000:
-        raise HTTPException(status_code=400, detail={"field": "step", "message": "Too many points (cap 5000). Increase step."})
-
-    for k in range(n_steps + 2):
-        price = req.min_price + k * req.step
-        if price > req.max_price + 1e-12:
-            break
-
-        payload = {
-            "decision": {"price": float(price)},
-            "assumptions": {
-                "demand_model": {
-                    "base_demand": req.base_demand,
-                    "price_elasticity": req.price_elasticity,
-                },
-                "cost_model": {
-                    "unit_cost": req.unit_cost,
-                    "fixed_cost": req.fixed_cost,
-                },
-            },
-            "uncertainty": {
-                "demand_noise": {
-                    "distribution": req.demand_noise_distribution,
-                    "sigma": req.demand_noise_sigma,
-                },
-                "elasticity_noise": {
-                    "distribution": req.elasticity_noise_distribution,
-                    "sigma": req.elasticity_noise_sigma,
-                },
-            },
-            "simulation": {
-                "num_runs": req.num_runs,
-                "random_seed": req.random_seed,
-            },
-        }
+    # safety cap to prevent accidental huge grids
+    if n_steps > MAX_GRID_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail={"field": "step", "message": f"Too many points (cap {MAX_GRID_POINTS}). Increase step."},
+        )
 
-        try:
-            config = PricingSimulationConfig.from_request(payload)
-        except ConfigValidationError as e:
-            raise HTTPException(status_code=400, detail={"field": e.field, "message": str(e)})
-
-        result = run_simulation(config)
-        profits = [o.profit for o in result.outcomes]
-
-        mean_profit = result.summary.mean_profit
-        std_profit = math.sqrt(result.summary.profit_variance)
-        prob_loss = sum(1 for p in profits if p < 0) / len(profits)
-
-        curve.append(
-            PricePoint(
-                price=float(price),
-                mean_profit=float(mean_profit),
-                std_profit=float(std_profit),
-                prob_loss=float(prob_loss),
+    prices = req.min_price + np.arange(n_steps + 2) * req.step
+    prices = prices[prices <= req.max_price + 1e-12]
+
+    if len(prices) == 0:
+        raise HTTPException(status_code=400, detail={"message": "Price range produced no results."})
+
+    return prices
+
+
+@router.post("/simulate-range", response_model=SimulateRangeResponse)
+async def simulate_range(req: SimulateRangeRequest) -> SimulateRangeResponse:
+    prices = _price_grid(req)
+    config = _build_config(req, float(prices[0]))
+
+    if req.engine == "analytic":
+        return _simulate_range_analytic(config, prices)
+
+    key, target = _price_grid_key(req, config, prices)
+
+    summaries = await _cache_get(key)
+    if summaries is None:
+        if target is None:
+            summaries = await scheduler.run(
+                len(prices) * config.num_runs,
+                run_price_grid,
+                config,
+                prices,
+                req.risk_levels,
+            )
+        else:
+            summaries = await scheduler.run(
+                len(prices) * config.num_runs,
+                run_adaptive_price_grid,
+                config,
+                prices,
+                target,
+                req.risk_levels,
             )
+        await _cache_put(key, summaries)
+
+    return _range_response(_price_points(prices, summaries, target))
+
+
+def _price_grid_key(
+    req: SimulateRangeRequest,
+    config: PricingSimulationConfig,
+    prices: np.ndarray,
+) -> Tuple[str, Optional[PrecisionTarget]]:
+    if req.precision is None:
+        return price_grid_key(config, prices, req.risk_levels), None
+
+    target = _precision_target(req)
+    return price_grid_key(config, prices, req.risk_levels, precision=dataclasses.asdict(target)), target
+
+
+def _price_points(
+    prices: np.ndarray,
+    summaries: List[SimulationSummary],
+    target: Optional[PrecisionTarget],
+) -> List[PricePoint]:
+    return [
+        PricePoint(
+            price=float(price),
+            mean_profit=summary.mean_profit,
+            std_profit=summary.std_profit,
+            prob_loss=summary.prob_loss,
+            tail_risk=_tail_risk(summary),
+            precision=_precision(precision_report(summary, target)) if target else None,
         )
+        for price, summary in zip(prices, summaries)
+    ]
 
-    if not curve:
-        raise HTTPException(status_code=400, detail={"message": "Price range produced no results."})
 
+def _range_response(curve: List[PricePoint]) -> SimulateRangeResponse:
     optimal = max(curve, key=lambda p: p.mean_profit)
 
     return SimulateRangeResponse(
         curve=curve,
         optimal_price=optimal.price,
         max_mean_profit=optimal.mean_profit,
-    )
\ No newline at end of file
+    )
+
+def _simulate_range_analytic(
+    config: PricingSimulationConfig,
+    prices: np.ndarray,
+) -> SimulateRangeResponse:
+    if config.noise_correlation != 0:
+        raise HTTPException(
+            status_code=400,
+            detail={"field": "noise_correlation", "message": "The analytic engine requires independent noise"},
+        )
+
+    moments = analytic_profit_moments(config, prices)
+
+    curve = [
+        PricePoint(price=float(price), mean_profit=float(mean), std_profit=float(std))
+        for price, mean, std in zip(prices, moments.mean_profit, moments.std_profit)
+    ]
+
+    # Exact optimum within the requested range, not just the best grid point
+    optimal_price, max_mean_profit = analytic_optimal_price(
+        config,
+        min_price=float(prices[0]),
+        max_price=float(prices[-1]),
+    )
+
+    return SimulateRangeResponse(
+        curve=curve,
+        optimal_price=optimal_price,
+        max_mean_profit=max_mean_profit,
+    )
+
+
+# ===========================================
+# /simulate/stream, /simulate-range/stream
+# ===========================================
+
+# Prices x runs per progress message of a streamed grid
+STREAM_GRID_BLOCK_CELLS = 1 << 16
+
+StreamFormat = Annotated[
+    Optional[Literal["ndjson", "sse"]],
+    Query(description="Stream framing; overrides the Accept header"),
+]
+
+
+class SimulateProgress(BaseModel):
+    runs_completed: int
+    total_runs: int
+    mean_profit: float
+    std_profit: float
+    prob_loss: float
+    # approximate; the final result carries the exact metrics
+    percentiles: Dict[int, float]
+
+
+class SimulateRangeProgress(BaseModel):
+    prices_completed: int
+    total_prices: int
+    # price points completed since the previous message
+    points: List[PricePoint]
+
+
+@router.post("/simulate/stream")
+async def simulate_stream(
+    req: SimulateRequest,
+    format: StreamFormat = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> StreamingResponse:
+    """
+    /simulate with live progress, as NDJSON lines or Server-Sent Events.
+
+    A "progress" message (SimulateProgress) follows every chunk of runs
+    (see monte_carlo.STREAM_CHUNK_RUNS), then one "result" message holds
+    the /simulate JSON response. Disconnecting stops the computation
+    after the current chunk. Precision requests and cached results only
+    produce the result message.
+    """
+    stream_format = _stream_format(format, accept)
+    plan = _simulation_plan(req)
+    stream, messages = await _simulation_events(req, *plan)
+    return _event_stream(messages, stream_format, stream)
+
+
+@router.post("/simulate-range/stream")
+async def simulate_range_stream(
+    req: SimulateRangeRequest,
+    format: StreamFormat = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> StreamingResponse:
+    """
+    /simulate-range with live progress, as NDJSON lines or Server-Sent
+    Events: "progress" messages (SimulateRangeProgress) carry completed
+    price points in price order, then one "result" message holds the
+    /simulate-range response. Disconnecting stops the computation after
+    the current block of prices. Analytic, precision and cached requests
+    only produce the result message.
+    """
+    stream_format = _stream_format(format, accept)
+    plan = _range_plan(req)
+    stream, messages = await _range_events(req, *plan)
+    return _event_stream(messages, stream_format, stream)
+
+
+Events = AsyncIterator[Tuple[str, BaseModel]]
+
+
+def _simulation_plan(req: SimulateRequest) -> Tuple[PricingSimulationConfig, str, Optional[PrecisionTarget]]:
+    """
+    Validates a /simulate request for progressive execution.
+    """
+    _check_distribution(req, "json")
+    config = _build_config(req, req.price)
+    key, target = _simulation_key(req, config)
+    return config, key, target
+
+
+async def _simulation_events(
+    req: SimulateRequest,
+    config: PricingSimulationConfig,
+    key: str,
+    target: Optional[PrecisionTarget],
+    priority: int = 0,
+    limit_queue: bool = True,
+) -> Tuple[Optional[ScheduledStream], Events]:
+    """
+    Admits the simulation and returns its stream (None when cached) and
+    the (event, message) pairs: "progress" (SimulateProgress) per chunk,
+    then "result" (SimulateResponse).
+    """
+    # Same rule as /simulate: huge summary-only runs fold each chunk
+    # into a sketch and are admitted at their bounded memory cost
+    constant_memory = _constant_memory(req, config, target)
+    if constant_memory:
+        key = _constant_memory_key(req, config)
+
+    cached = await _cached_simulation(key, constant_memory)
+    stream = None
+    if cached is None:
+        cost = config.num_runs
+        if constant_memory:
+            fn, args = functools.partial(iter_simulation, constant_memory=True), (config, req.risk_levels)
+            cost = min(config.num_runs, CONSTANT_MEMORY_COST)
+        elif target is None:
+            fn, args = _pipelined(iter_simulation, config), (config, req.risk_levels)
+        else:
+            fn, args = _single, (run_adaptive_simulation, config, target, req.risk_levels)
+        stream = await scheduler.stream(cost, fn, *args, priority=priority, limit_queue=limit_queue)
+
+    async def messages():
+        if stream is None:
+            result = cached
+        else:
+            async for item in stream:
+                if isinstance(item, SimulationProgress):
+                    yield "progress", SimulateProgress(
+                        runs_completed=item.runs_completed,
+                        total_runs=item.total_runs,
+                        mean_profit=item.mean_profit,
+                        std_profit=item.std_profit,
+                        prob_loss=item.prob_loss,
+                        percentiles=item.profit_percentiles,
+                    )
+                else:
+                    result = item
+            await _cache_put(key, result, config)
+
+        yield "result", SimulateResponse(
+            **dict(_metrics(result.summary, target)),
+            **_distribution(req, result.sketch if constant_memory else result.outcomes.profit),
+        )
+
+    return stream, messages()
+
+
+def _range_plan(
+    req: SimulateRangeRequest,
+) -> Tuple[np.ndarray, PricingSimulationConfig, Optional[str], Optional[PrecisionTarget]]:
+    """
+    Validates a /simulate-range request for progressive execution
+    (key is None for the analytic engine).
+    """
+    prices = _price_grid(req)
+    config = _build_config(req, float(prices[0]))
+    if req.engine == "analytic":
+        return prices, config, None, None
+    key, target = _price_grid_key(req, config, prices)
+    return prices, config, key, target
+
+
+async def _range_events(
+    req: SimulateRangeRequest,
+    prices: np.ndarray,
+    config: PricingSimulationConfig,
+    key: Optional[str],
+    target: Optional[PrecisionTarget],
+    priority: int = 0,
+    limit_queue: bool = True,
+) -> Tuple[Optional[ScheduledStream], Events]:
+    """
+    Admits the grid and returns its stream (None when nothing needs to
+    be sampled) and the (event, message) pairs: "progress"
+    (SimulateRangeProgress) per block, then "result"
+    (SimulateRangeResponse).
+    """
+    if key is None:
+        return None, _result_only(_simulate_range_analytic(config, prices))
+
+    cached = await _cache_get(key)
+    if cached is not None:
+        return None, _result_only(_range_response(_price_points(prices, cached, target)))
+
+    if target is None:
+        fn, args = iter_price_grid, (config, prices, req.risk_levels, STREAM_GRID_BLOCK_CELLS)
+    else:
+        fn, args = _single, (_adaptive_grid_block, config, prices, target, req.risk_levels)
+    stream = await scheduler.stream(
+        len(prices) * config.num_runs, fn, *args, priority=priority, limit_queue=limit_queue
+    )
+
+    async def messages():
+        summaries: List[SimulationSummary] = []
+        curve: List[PricePoint] = []
+        async for block, block_summaries in stream:
+            points = _price_points(block, block_summaries, target)
+            summaries.extend(block_summaries)
+            curve.extend(points)
+            if target is None:
+                yield "progress", SimulateRangeProgress(
+                    prices_completed=len(curve),
+                    total_prices=len(prices),
+                    points=points,
+                )
+
+        await _cache_put(key, summaries)
+        yield "result", _range_response(curve)
+
+    return stream, messages()
+
+
+def _stream_format(format: Optional[str], accept: Optional[str]) -> str:
+    try:
+        return negotiate_stream(format, accept)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail={"message": str(e)})
+
+
+def _single(fn, *args) -> Iterator:
+    # One-step generator for work without intermediate results
+    yield fn(*args)
+
+
+def _adaptive_grid_block(config, prices, target, risk_levels):
+    return prices, run_adaptive_price_grid(config, prices, target, risk_levels)
+
+
+async def _result_only(response: BaseModel) -> Events:
+    yield "result", response
+
+
+def _event_stream(
+    messages: Events,
+    stream_format: str,
+    stream: Optional[ScheduledStream] = None,
+) -> StreamingResponse:
+    """
+    Frames (event, model) messages. Errors after the response has
+    started are reported as a final "error" message. The scheduled
+    stream is closed when the body ends, fails or the client leaves.
+    """
+
+    async def body():
+        try:
+            async for event, model in messages:
+                yield encode_event(event, model.model_dump_json(), stream_format)
+        except (ValueError, RuntimeError) as e:
+            yield encode_event("error", json.dumps({"message": str(e)}), stream_format)
+        finally:
+            if stream is not None:
+                stream.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache"},
+        # Also runs when the client disconnects before the body starts
+        background=BackgroundTask(stream.close) if stream is not None else None,
+    )
+
+
+# ===================================
+# /simulate-batch (many scenarios)
+# ===================================
+
+MAX_BATCH_SCENARIOS = 1000
+
+
+class BatchScenario(BaseModel):
+    # the /simulate inputs, without response options
+    price: float = Field(gt=0)
+
+    base_demand: float
+    price_elasticity: float
+    unit_cost: float
+    fixed_cost: float
+
+    demand_noise_distribution: Dist = "normal"
+    demand_noise_sigma: float = Field(gt=0)
+
+    elasticity_noise_distribution: Dist = "normal"
+    elasticity_noise_sigma: float = Field(gt=0)
+
+    # correlation of the two noises (numpy engine only)
+    noise_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
+    num_runs: int = Field(default=1000, ge=1)
+    random_seed: int = 0
+    engine: Engine = "python"
+    sampling: Sampling = "iid"
+    dtype: DType = "float64"
+
+
+class SimulateBatchRequest(BaseModel):
+    # validated one by one (see BatchScenario), so an invalid scenario
+    # gets its own error instead of failing the batch
+    scenarios: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_SCENARIOS)
+
+    # tail risk confidence levels, for every scenario
+    risk_levels: List[RiskLevel] = Field(default=[0.95, 0.99], min_length=1)
+
+
+class ScenarioError(BaseModel):
+    field: Optional[str] = None
+    message: str
+
+
+class ScenarioResult(BaseModel):
+    # exactly one of these is set
+    metrics: Optional[SimulateMetrics] = None
+    error: Optional[ScenarioError] = None
+
+
+class SimulateBatchResponse(BaseModel):
+    # in request order
+    results: List[ScenarioResult]
+    # distinct valid scenarios, and distinct noise draws among them
+    unique_scenarios: int
+    noise_groups: int
+
+
+@router.post("/simulate-batch", response_model=SimulateBatchResponse)
+async def simulate_batch(req: SimulateBatchRequest) -> SimulateBatchResponse:
+    """
+    Many /simulate evaluations in one request, summary metrics only.
+
+    Identical scenarios are validated and simulated once. Scenarios that
+    differ only in price, assumptions or costs share one noise draw (see
+    batch.run_scenario_batch). Uncached scenarios run as few scheduled
+    jobs as fit the admission budget (see _batch_jobs); a scenario over
+    the budget on its own gets an error of its own.
+    """
+    # Identical payloads are validated once
+    validated: Dict[str, Union[PricingSimulationConfig, ScenarioError]] = {}
+    outcomes: List[Union[PricingSimulationConfig, ScenarioError]] = []
+    for scenario in req.scenarios:
+        raw = json.dumps(scenario, sort_keys=True)
+        if raw not in validated:
+            validated[raw] = _scenario_config(scenario)
+        outcomes.append(validated[raw])
+
+    configs = list(dict.fromkeys(c for c in outcomes if isinstance(c, PricingSimulationConfig)))
+    keys = {c: config_key("scenario_summary", c, risk_levels=list(req.risk_levels)) for c in configs}
+
+    summaries: Dict[PricingSimulationConfig, SimulationSummary] = {}
+    for config in configs:
+        cached = await _cache_get(keys[config])
+        if cached is not None:
+            summaries[config] = cached
+
+    # A scenario over the admission budget on its own fails alone
+    errors: Dict[PricingSimulationConfig, ScenarioError] = {}
+    for config in configs:
+        if config not in summaries and config.num_runs > scheduler.max_inflight_cost:
+            too_large = SimulationTooLarge(config.num_runs, scheduler.max_inflight_cost)
+            errors[config] = ScenarioError(field="num_runs", message=str(too_large))
+
+    missing = [c for c in configs if c not in summaries and c not in errors]
+    for job in _batch_jobs(missing, scheduler.max_inflight_cost):
+        try:
+            computed = await scheduler.run(
+                sum(c.num_runs for c in job),
+                run_scenario_batch,
+                job,
+                req.risk_levels,
+            )
+        except SimulationTooLarge:
+            # Jobs fit the budget; handled by the app if the budget shrank
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e)})
+
+        for config, summary in zip(job, computed):
+            await _cache_put(keys[config], summary)
+            summaries[config] = summary
+
+    return SimulateBatchResponse(
+        results=[
+            ScenarioResult(error=outcome)
+            if isinstance(outcome, ScenarioError)
+            else ScenarioResult(error=errors[outcome])
+            if outcome in errors
+            else ScenarioResult(metrics=_metrics(summaries[outcome], None))
+            for outcome in outcomes
+        ],
+        unique_scenarios=len(configs),
+        noise_groups=len({noise_key(c) for c in configs}),
+    )
+
+
+def _batch_jobs(
+    configs: List[PricingSimulationConfig],
+    max_cost: int,
+) -> List[List[PricingSimulationConfig]]:
+    """
+    Splits configs (each at most max_cost runs) into jobs of at most
+    max_cost total runs, in order of noise_key groups, so scenarios
+    sharing a noise draw mostly share a job.
+    """
+    groups: Dict[Tuple, List[PricingSimulationConfig]] = {}
+    for config in configs:
+        groups.setdefault(noise_key(config), []).append(config)
+
+    jobs: List[List[PricingSimulationConfig]] = []
+    cost = 0
+    for config in (c for group in groups.values() for c in group):
+        if not jobs or cost + config.num_runs > max_cost:
+            jobs.append([])
+            cost = 0
+        jobs[-1].append(config)
+        cost += config.num_runs
+    return jobs
+
+
+def _scenario_config(scenario: Dict[str, Any]) -> Union[PricingSimulationConfig, ScenarioError]:
+    try:
+        parsed = BatchScenario.model_validate(scenario)
+    except ValidationError as e:
+        error = e.errors()[0]
+        return ScenarioError(
+            field=".".join(str(part) for part in error["loc"]) or None,
+            message=error["msg"],
+        )
+
+    try:
+        return PricingSimulationConfig.from_request(_config_payload(parsed, parsed.price))
+    except ConfigValidationError as e:
+        return ScenarioError(field=e.field, message=str(e))
+
+
+# =========================================
+# /simulate-horizon (multi-period dynamics)
+# =========================================
+
+class SimulateHorizonRequest(BaseModel):
+    # decision: move the price from previous_price (default: unchanged)
+    price: float = Field(gt=0)
+    previous_price: Optional[float] = Field(default=None, gt=0)
+
+    # assumptions (per period)
+    base_demand: float
+    price_elasticity: float
+    unit_cost: float
+    fixed_cost: float
+
+    # uncertainty
+    demand_noise_distribution: Dist = "normal"
+    demand_noise_sigma: float = Field(gt=0)
+
+    elasticity_noise_distribution: Dist = "normal"
+    elasticity_noise_sigma: float = Field(gt=0)
+
+    # correlation of the two noises (numpy engine only)
+    noise_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
+    # dynamics (see horizon.HorizonAssumptions)
+    periods: int = Field(default=6, ge=1, le=MAX_HORIZON_PERIODS)
+    adoption_delay: float = Field(default=0.0, ge=0)
+    churn_sensitivity: float = Field(default=0.0, ge=0)
+    retention_lag: int = Field(default=1, ge=0)
+    cost_inflation: float = Field(default=0.0, gt=-1)
+    cost_volatility: float = Field(default=0.0, ge=0)
+    demand_volatility: float = Field(default=0.0, ge=0)
+    shock_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
+    # simulation
+    num_runs: int = Field(default=10_000, ge=1)
+    random_seed: int = 0
+    engine: Literal["numpy"] = "numpy"
+    sampling: Literal["iid", "antithetic", "lhs", "sobol"] = "iid"
+    dtype: DType = "float64"
+
+    percentiles: List[Annotated[int, Field(ge=0, le=100)]] = Field(default=[5, 50, 95], min_length=1)
+    risk_levels: List[RiskLevel] = Field(default=[0.95, 0.99], min_length=1)
+
+
+class HorizonPeriod(BaseModel):
+    period: int
+    mean_demand: float
+    mean_profit: float
+    mean_retention: float
+    # profit accumulated through the end of this period
+    cumulative_mean_profit: float
+    cumulative_prob_loss: float
+    cumulative_percentiles: Dict[int, float]
+
+
+class SimulateHorizonResponse(BaseModel):
+    periods: List[HorizonPeriod]
+    # distribution of profit over the whole horizon
+    total: SimulateMetrics
+
+
+@router.post("/simulate-horizon", response_model=SimulateHorizonResponse)
+async def simulate_horizon(req: SimulateHorizonRequest) -> SimulateHorizonResponse:
+    """
+    Multi-period simulation with adoption delay, lagged retention and
+    cost inflation. Summaries only; runs x periods is the job cost.
+    """
+    config = _build_config(req, req.price)
+    try:
+        horizon = HorizonAssumptions(
+            periods=req.periods,
+            previous_price=req.previous_price,
+            adoption_delay=req.adoption_delay,
+            churn_sensitivity=req.churn_sensitivity,
+            retention_lag=req.retention_lag,
+            cost_inflation=req.cost_inflation,
+            cost_volatility=req.cost_volatility,
+            demand_volatility=req.demand_volatility,
+            shock_correlation=req.shock_correlation,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"field": "horizon", "message": str(e)})
+
+    key = config_key(
+        "horizon_summary",
+        config,
+        horizon=dataclasses.asdict(horizon),
+        percentiles=list(req.percentiles),
+        risk_levels=list(req.risk_levels),
+    )
+    summary: Optional[HorizonSummary] = await _cache_get(key)
+    if summary is None:
+        try:
+            result = await scheduler.run(
+                config.num_runs * horizon.periods,
+                run_horizon,
+                config,
+                horizon,
+                req.percentiles,
+                req.risk_levels,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e)})
+        summary = result.summary
+        await _cache_put(key, summary)
+
+    return SimulateHorizonResponse(
+        periods=[
+            HorizonPeriod(
+                period=t,
+                mean_demand=summary.mean_demand[t],
+                mean_profit=summary.mean_profit[t],
+                mean_retention=summary.mean_retention[t],
+                cumulative_mean_profit=cumulative.mean_profit,
+                cumulative_prob_loss=cumulative.prob_loss,
+                cumulative_percentiles=cumulative.profit_percentiles,
+            )
+            for t, cumulative in enumerate(summary.cumulative)
+        ],
+        total=_metrics(summary.total, None),
+    )
+
+
+# ===============================
+# /compare (paired price deltas)
+# ===============================
+
+class CompareRequest(BaseModel):
+    # candidate prices, compared pairwise on shared noise draws
+    prices: List[Annotated[float, Field(gt=0)]] = Field(min_length=2, max_length=MAX_COMPARE_PRICES)
+
+    # assumptions
+    base_demand: float
+    price_elasticity: float
+    unit_cost: float
+    fixed_cost: float
+
+    # uncertainty
+    demand_noise_distribution: Dist = "normal"
+    demand_noise_sigma: float = Field(gt=0)
+
+    elasticity_noise_distribution: Dist = "normal"
+    elasticity_noise_sigma: float = Field(gt=0)
+
+    # correlation of the two noises (numpy engine only)
+    noise_correlation: float = Field(default=0.0, gt=-1, lt=1)
+
+    # simulation (shared by all prices)
+    num_runs: int = Field(default=1000, ge=1)
+    random_seed: int = 0
+    engine: Engine = "numpy"
+    sampling: Sampling = "iid"
+
+    percentiles: List[Annotated[int, Field(ge=0, le=100)]] = Field(default=[5, 50, 95], min_length=1)
+    risk_levels: List[RiskLevel] = Field(default=[0.95], min_length=1)
+
+
+class PriceSummary(BaseModel):
+    price: float
+    mean_profit: float
+    std_profit: float
+    prob_loss: float
+    tail_risk: List[TailRisk]
+
+
+class PairedDeltaModel(BaseModel):
+    price_a: float
+    price_b: float
+    mean_delta: float
+    delta_stderr: float
+    prob_a_beats_b: float
+    # percentile -> profit(a) - profit(b)
+    delta_percentiles: Dict[int, float]
+
+
+class CompareResponse(BaseModel):
+    prices: List[PriceSummary]
+    pairs: List[PairedDeltaModel]
+
+
+@router.post("/compare", response_model=CompareResponse)
+async def compare(req: CompareRequest) -> CompareResponse:
+    config = _build_config(req, req.prices[0])
+
+    key = paired_comparison_key(config, req.prices, req.percentiles, req.risk_levels)
+    comparison: Optional[PairedComparison] = await _cache_get(key)
+    if comparison is None:
+        # The price matrix plus the pairwise deltas, each prices or pairs x runs
+        count = len(req.prices)
+        comparison = await scheduler.run(
+            (count + count * (count - 1) // 2) * config.num_runs,
+            paired_comparison,
+            config,
+            req.prices,
+            req.percentiles,
+            req.risk_levels,
+        )
+        await _cache_put(key, comparison)
+
+    return CompareResponse(
+        prices=[
+            PriceSummary(
+                price=price,
+                mean_profit=summary.mean_profit,
+                std_profit=summary.std_profit,
+                prob_loss=summary.prob_loss,
+                tail_risk=_tail_risk(summary),
+            )
+            for price, summary in zip(comparison.prices, comparison.summaries)
+        ],
+        pairs=[
+            PairedDeltaModel(
+                price_a=pair.price_a,
+                price_b=pair.price_b,
+                mean_delta=pair.mean_delta,
+                delta_stderr=pair.delta_stderr,
+                prob_a_beats_b=pair.prob_a_beats_b,
+                delta_percentiles=pair.delta_percentiles,
+            )
+            for pair in comparison.pairs
+        ],
+    )
+
+
+# ===================================
+# /sensitivity/global (Sobol indices)
+# ===================================
+
+class GlobalSensitivityRequest(BaseModel):
+    # decision
+    price: float = Field(gt=0)
+
+    # assumptions
+    base_demand: float
+    price_elasticity: float
+    unit_cost: float
+    fixed_cost: float
+
+    # uncertain inputs: the two noises, plus optional relative cost noise
+    demand_noise_distribution: Dist = "normal"
+    demand_noise_sigma: float = Field(gt=0)
+
+    elasticity_noise_distribution: Dist = "normal"
+    elasticity_noise_sigma: float = Field(gt=0)
+
+    unit_cost_sigma: Optional[float] = Field(default=None, gt=0)
+    fixed_cost_sigma: Optional[float] = Field(default=None, gt=0)
+
+    # base sample size N; the design evaluates N x (inputs + 2) runs
+    num_runs: int = Field(default=10_000, ge=2)
+    random_seed: int = 0
+    engine: Literal["numpy"] = "numpy"
+    sampling: Literal["iid", "sobol"] = "sobol"
+
+
+class SobolIndex(BaseModel):
+    input: str
+    first_order: float
+    first_order_stderr: float
+    total: float
+    total_stderr: float
+
+
+class GlobalSensitivityResponse(BaseModel):
+    variance: float
+    num_samples: int
+    # share of variance explained only by interactions (1 - sum of first-order)
+    interaction: float
+    indices: List[SobolIndex]
+
+
+@router.post("/sensitivity/global", response_model=GlobalSensitivityResponse)
+async def global_sensitivity(req: GlobalSensitivityRequest) -> GlobalSensitivityResponse:
+    config = _build_config(req, req.price)
+    sigmas = {"unit_cost_sigma": req.unit_cost_sigma, "fixed_cost_sigma": req.fixed_cost_sigma}
+    num_inputs = 2 + sum(s is not None for s in sigmas.values())
+
+    key = config_key("sobol_indices", config, **sigmas)
+    indices: Optional[SobolIndices] = await _cache_get(key)
+    if indices is None:
+        try:
+            indices = await scheduler.run(
+                config.num_runs * (num_inputs + 2),
+                sobol_indices,
+                config,
+                req.unit_cost_sigma,
+                req.fixed_cost_sigma,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e)})
+        await _cache_put(key, indices)
+
+    return GlobalSensitivityResponse(
+        variance=indices.variance,
+        num_samples=indices.num_samples,
+        interaction=indices.interaction,
+        indices=[
+            SobolIndex(
+                input=name,
+                first_order=indices.first_order[name],
+                first_order_stderr=indices.first_order_stderr[name],
+                total=indices.total[name],
+                total_stderr=indices.total_stderr[name],
+            )
+            for name in indices.inputs
+        ],
+    )
+
+
+@router.get("/scheduler/stats")
+async def scheduler_stats():
+    """
+    Queue depth, in-flight cost and wait times of the simulation scheduler.
+    """
+    return scheduler.stats()
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Size, hit/miss counters and evictions of the result cache.
+    """
+    return cache.stats()
+
+
+@router.get("/pipeline/stats")
+async def pipeline_stats():
+    """
+    Memoized stage arrays, and hits/computations per stage.
+    """
+    return pipeline.stats()
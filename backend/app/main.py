@@ -1,11 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.api.jobs import jobs, router as jobs_router
+from app.api.scheduler import SchedulerBusy, SimulationTooLarge, scheduler
 from app.api.simulation import router as simulation_router
 from app.simulation.config import ConfigValidationError
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    jobs.shutdown()
+    scheduler.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +26,11 @@ app.add_middleware(
 )
 
 app.include_router(simulation_router)
+app.include_router(jobs_router)
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
 
 @app.exception_handler(ConfigValidationError)
 async def config_validation_handler(request: Request, exc: ConfigValidationError):
@@ -31,3 +46,36 @@ async def config_validation_handler(request: Request, exc: ConfigValidationError
             }
         },
     )
+
+
+@app.exception_handler(SchedulerBusy)
+async def scheduler_busy_handler(request: Request, exc: SchedulerBusy):
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "error": {
+                "code": "SCHEDULER_BUSY",
+                "message": str(exc),
+                "details": {
+                    "retry_after": exc.retry_after
+                },
+            }
+        },
+    )
+
+@app.exception_handler(SimulationTooLarge)
+async def simulation_too_large_handler(request: Request, exc: SimulationTooLarge):
+    return JSONResponse(
+        status_code=400,
+        content={
+            "error": {
+                "code": "SIMULATION_TOO_LARGE",
+                "message": str(exc),
+                "details": {
+                    "cost": exc.cost,
+                    "max_cost": exc.max_cost,
+                },
+            }
+        },
+    )
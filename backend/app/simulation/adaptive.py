@@ -0,0 +1,307 @@
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aggregate import (
+    DEFAULT_RISK_LEVELS,
+    SimulationSummary,
+    StreamingAggregator,
+    summarize_rows,
+)
+from .config import PricingSimulationConfig
+from .control_variate import ProfitControlVariate, adjust_summaries
+from .grid import GRID_BLOCK_CELLS
+from .model import OutcomeBatch, evaluate_pricing_causal_model_batch
+from .monte_carlo import evaluate_noise, num_chunks, sample_noise_chunk
+from .results import SimulationResult
+
+# Floors before any stopping check: the first batch's variance (0 for a
+# single run) says little about the spread, so a target is never judged
+# met on fewer runs or batches than these
+MIN_TARGET_RUNS = 30
+MIN_TARGET_BATCHES = 2
+
+
+@dataclass(frozen=True)
+class PrecisionTarget:
+    """
+    Stopping rule for adaptive sampling.
+
+    Sampling stops once every given target holds at `confidence`:
+    - mean_rel_half_width: CI half-width of mean profit / |mean profit|
+    - prob_loss_half_width: Wilson CI half-width of prob_loss (absolute,
+      since prob_loss is already on a [0, 1] scale)
+
+    Runs are drawn and checked in batches of batch_runs, from the
+    MIN_TARGET_BATCHES-th batch and MIN_TARGET_RUNS runs on.
+    """
+    mean_rel_half_width: Optional[float] = None
+    prob_loss_half_width: Optional[float] = None
+    confidence: float = 0.95
+    batch_runs: int = 1000
+
+    def __post_init__(self):
+        if self.mean_rel_half_width is None and self.prob_loss_half_width is None:
+            raise ValueError("At least one precision target is required")
+        if self.mean_rel_half_width is not None and self.mean_rel_half_width <= 0:
+            raise ValueError("mean_rel_half_width must be > 0")
+        if self.prob_loss_half_width is not None and self.prob_loss_half_width <= 0:
+            raise ValueError("prob_loss_half_width must be > 0")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be in (0, 1)")
+        if self.batch_runs < 1:
+            raise ValueError("batch_runs must be >= 1")
+
+    def is_met(self, num_runs, mean, variance, prob_loss) -> np.ndarray:
+        """
+        Elementwise: whether the targets hold for the given running
+        estimates; never on fewer than MIN_TARGET_RUNS runs.
+        """
+        mean_hw, prob_loss_hw = confidence_half_widths(
+            num_runs, variance, prob_loss, self.confidence
+        )
+        met = np.broadcast_to(np.asarray(num_runs) >= MIN_TARGET_RUNS, np.shape(mean)).copy()
+        if self.mean_rel_half_width is not None:
+            met &= mean_hw <= self.mean_rel_half_width * np.abs(mean)
+        if self.prob_loss_half_width is not None:
+            met &= prob_loss_hw <= self.prob_loss_half_width
+        return met
+
+
+@dataclass(frozen=True)
+class PrecisionReport:
+    num_runs: int
+    mean_half_width: float
+    # None when mean profit is exactly 0
+    mean_rel_half_width: Optional[float]
+    prob_loss_half_width: float
+    converged: bool
+
+
+def confidence_half_widths(
+    num_runs,
+    variance,
+    prob_loss,
+    confidence: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (mean profit, prob_loss) CI half-widths from n runs, the population
+    profit variance and the loss frequency. The mean uses the normal
+    approximation, prob_loss the Wilson score interval, which stays
+    honest when no (or only) losses have been observed yet.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    n = np.asarray(num_runs, dtype=np.float64)
+    p = np.asarray(prob_loss, dtype=np.float64)
+
+    # Population variance -> variance of the sample mean
+    mean_hw = z * np.sqrt(np.asarray(variance) / np.maximum(n - 1.0, 1.0))
+    prob_loss_hw = z / (1.0 + z * z / n) * np.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n))
+    return mean_hw, prob_loss_hw
+
+
+def precision_report(summary: SimulationSummary, target: PrecisionTarget) -> PrecisionReport:
+    mean_hw, prob_loss_hw = confidence_half_widths(
+        summary.num_runs,
+        summary.profit_variance,
+        summary.prob_loss,
+        target.confidence,
+    )
+    mean = summary.mean_profit
+
+    return PrecisionReport(
+        num_runs=summary.num_runs,
+        mean_half_width=float(mean_hw),
+        mean_rel_half_width=float(mean_hw / abs(mean)) if mean != 0 else None,
+        prob_loss_half_width=float(prob_loss_hw),
+        converged=bool(
+            target.is_met(summary.num_runs, mean, summary.profit_variance, summary.prob_loss)
+        ),
+    )
+
+
+class _NoiseBatches:
+    """
+    Validated noise of a numpy-engine config, cut into batches of
+    batch_runs along the chunk streams and drawn one chunk at a time,
+    only when first needed.
+    """
+
+    def __init__(self, config: PricingSimulationConfig, batch_runs: int):
+        if config.engine != "numpy":
+            raise ValueError("Adaptive sampling requires the numpy engine")
+
+        self.config = config
+        self.batch_runs = batch_runs
+        self._batches: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._next_chunk = 0
+
+    def get(self, index: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Batch `index`, or None once the run budget is spent.
+        """
+        while index >= len(self._batches) and self._next_chunk < num_chunks(self.config):
+            demand_noise, elasticity_noise = sample_noise_chunk(self.config, self._next_chunk)
+            self._next_chunk += 1
+            for start in range(0, len(demand_noise), self.batch_runs):
+                stop = start + self.batch_runs
+                self._batches.append((demand_noise[start:stop], elasticity_noise[start:stop]))
+
+        return self._batches[index] if index < len(self._batches) else None
+
+
+def run_adaptive_simulation(
+    config: PricingSimulationConfig,
+    target: PrecisionTarget,
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> SimulationResult:
+    """
+    Samples in batches until `target` is met or config.num_runs (the run
+    budget) is spent; summary.num_runs holds the runs actually used.
+
+    Draws are a prefix of those of run_simulation(config), so a run that
+    spends its whole budget reproduces the fixed-size simulation.
+    Numpy engine only.
+    """
+    noise = _NoiseBatches(config, target.batch_runs)
+    aggregator = StreamingAggregator(mode="exact", risk_levels=risk_levels)
+    control = ProfitControlVariate(config) if config.sampling == "control_variate" else None
+    batches: List[OutcomeBatch] = []
+
+    index = 0
+    while (drawn := noise.get(index)) is not None:
+        batch = evaluate_noise(config, *drawn)
+        aggregator.update(batch)
+        if control is not None:
+            control.update(batch.profit, *drawn)
+        batches.append(batch)
+        index += 1
+
+        # Stopping uses the plain profit variance, also under control variates
+        if index >= MIN_TARGET_BATCHES and target.is_met(
+            aggregator.count, aggregator.mean, aggregator.variance, aggregator.prob_loss
+        ):
+            break
+
+    summary = aggregator.summary()
+    if control is not None:
+        [summary] = adjust_summaries([summary], control)
+
+    return SimulationResult(
+        outcomes=OutcomeBatch.concatenate(batches),
+        summary=summary,
+    )
+
+
+def run_adaptive_price_grid(
+    config: PricingSimulationConfig,
+    prices: Sequence[float],
+    target: PrecisionTarget,
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> List[SimulationSummary]:
+    """
+    Adaptive sampling per price under common random numbers.
+
+    All prices share the noise batches of config (config.price is
+    ignored), but each price stops on its own as soon as its target is
+    met, so flat regions of the curve stop early. Each summary matches
+    run_adaptive_simulation at that price, up to float rounding.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+
+    if prices.ndim != 1 or len(prices) == 0:
+        raise ValueError("Prices must be a non-empty 1-D sequence")
+
+    noise = _NoiseBatches(config, target.batch_runs)
+
+    # Rows retain up to num_runs profits each; bound prices x runs held at once
+    rows_per_block = max(1, GRID_BLOCK_CELLS // config.num_runs)
+    summaries: List[SimulationSummary] = []
+
+    for start in range(0, len(prices), rows_per_block):
+        summaries.extend(
+            _adaptive_block(config, prices[start:start + rows_per_block], noise, target, risk_levels)
+        )
+
+    return summaries
+
+
+def _adaptive_block(
+    config: PricingSimulationConfig,
+    prices: np.ndarray,
+    noise: _NoiseBatches,
+    target: PrecisionTarget,
+    risk_levels: Sequence[float],
+) -> List[SimulationSummary]:
+    n = len(prices)
+    count = np.zeros(n)
+    mean = np.zeros(n)
+    m2 = np.zeros(n)
+    losses = np.zeros(n)
+    batches_used = np.zeros(n, dtype=np.int64)
+
+    # Sorted indices of prices still sampling, and per batch the
+    # (active indices, profit rows) it was evaluated for
+    active = np.arange(n)
+    blocks: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    index = 0
+    while len(active) and (drawn := noise.get(index)) is not None:
+        demand_noise, elasticity_noise = drawn
+        _, _, _, profit = evaluate_pricing_causal_model_batch(
+            price=prices[active][:, None],
+            base_demand=config.base_demand * demand_noise[None, :],
+            price_elasticity=config.price_elasticity * elasticity_noise[None, :],
+            unit_cost=config.unit_cost,
+            fixed_cost=config.fixed_cost,
+            dtype=config.dtype,
+        )
+        blocks.append((active, profit))
+        index += 1
+
+        if not np.all(np.isfinite(profit)):
+            raise ValueError("Non-finite profit detected")
+
+        # Chan et al. merge of the batch moments into the running ones
+        b = profit.shape[1]
+        batch_mean = profit.mean(axis=1, dtype=np.float64)
+        centered = profit - batch_mean[:, None]
+        batch_m2 = np.einsum("ij,ij->i", centered, centered)
+
+        c = count[active]
+        total = c + b
+        delta = batch_mean - mean[active]
+        m2[active] += batch_m2 + delta * delta * c * b / total
+        mean[active] += delta * b / total
+        count[active] = total
+        losses[active] += np.count_nonzero(profit < 0, axis=1)
+        batches_used[active] += 1
+
+        if index >= MIN_TARGET_BATCHES:
+            met = target.is_met(total, mean[active], m2[active] / total, losses[active] / total)
+            active = active[~met]
+
+    # Prices that used the same number of batches share a row length
+    summaries: List[Optional[SimulationSummary]] = [None] * n
+    for k in np.unique(batches_used):
+        rows = np.flatnonzero(batches_used == k)
+        profits = np.concatenate(
+            [block[np.searchsorted(act, rows)] for act, block in blocks[:k]],
+            axis=1,
+        )
+        group = summarize_rows(profits, risk_levels=risk_levels)
+
+        if config.sampling == "control_variate":
+            demand_noise = np.concatenate([noise.get(j)[0] for j in range(k)])
+            elasticity_noise = np.concatenate([noise.get(j)[1] for j in range(k)])
+            control = ProfitControlVariate(config, prices[rows]).update(
+                profits, demand_noise, elasticity_noise
+            )
+            group = adjust_summaries(group, control)
+
+        for i, summary in zip(rows, group):
+            summaries[i] = summary
+
+    return summaries
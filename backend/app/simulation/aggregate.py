@@ -1,8 +1,13 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Literal, Optional, Sequence, Tuple, Union
 import math
 
-from .model import PricingOutcome
+import numpy as np
+
+from .model import OutcomeBatch, PricingOutcome
+from .sketch import KLLSketch
+
+DEFAULT_RISK_LEVELS: Tuple[float, ...] = (0.95, 0.99)
 
 
 @dataclass(frozen=True)
@@ -11,43 +16,329 @@ class SimulationSummary:
     profit_variance: float
     profit_percentiles: Dict[int, float]
 
+    # risk metrics
+    std_profit: float
+    profit_skew: float
+    prob_loss: float
+    min_profit: float
+    max_profit: float
+
+    # Tail risk per confidence level, in profit terms (docs/contract.md, Risk Metrics):
+    # VaR_a is the (1 - a) profit quantile, CVaR_a the mean profit at or below it.
+    value_at_risk: Dict[float, float]
+    conditional_value_at_risk: Dict[float, float]
+
+    # runs aggregated (differs from config.num_runs under adaptive sampling)
+    num_runs: int
+
+
+def percentile_rank(p: float, n: int) -> int:
+    """
+    0-based rank of percentile p among n sorted values.
+    """
+    return int(math.floor((p / 100) * (n - 1)))
+
+
+def tail_rank(level: float, n: int) -> int:
+    """
+    0-based rank of the VaR quantile for confidence level `level`.
+    """
+    return percentile_rank((1.0 - level) * 100, n)
+
+
+def exact_percentiles(
+    values: np.ndarray,
+    percentiles: Sequence[int],
+) -> Dict[int, float]:
+    """
+    Exact percentiles by selection (np.partition) instead of a full sort.
+    """
+    n = len(values)
+    ranks = sorted({percentile_rank(p, n) for p in percentiles})
+    partitioned = np.partition(values, ranks)
+    return {p: float(partitioned[percentile_rank(p, n)]) for p in percentiles}
+
+
+def _validate_risk_levels(risk_levels: Sequence[float]) -> List[float]:
+    levels = [float(a) for a in risk_levels]
+    for a in levels:
+        if not 0.0 < a < 1.0:
+            raise ValueError("Risk levels must be in (0, 1)")
+    return levels
 
-def aggregate_outcomes(
-    outcomes: List[PricingOutcome],
-    percentiles: List[int] = [5, 50, 95],
-) -> SimulationSummary:
-    if not outcomes:
-        raise ValueError("No outcomes to aggregate")
 
-    profits = []
-    
-    for o in outcomes:
-        # Sanity checks per run
-        if o.demand < 0:
+class StreamingAggregator:
+    """
+    Streaming aggregation over chunks of outcomes.
+
+    Each chunk is reduced as it arrives (a few numpy reductions: mean,
+    centered second and third moments, loss count, min, max) and merged
+    into the running moments (Chan/Pebay); earlier chunks are never
+    revisited. Partial aggregators (other chunks, other workers) merge
+    exactly.
+
+    Percentiles, VaR and CVaR come from one of two modes:
+    - "sketch": a KLLSketch; bounded memory, rank error documented there.
+    - "exact": chunks are retained and one np.partition at summary time
+      selects every percentile and VaR rank; CVaR is the mean of the
+      partitioned prefix.
+    """
+
+    def __init__(
+        self,
+        percentiles: List[int] = [5, 50, 95],
+        mode: Literal["sketch", "exact"] = "sketch",
+        sketch_k: int = 200,
+        seed: int = 0,
+        risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    ):
+        if mode not in ("sketch", "exact"):
+            raise ValueError(f"Unsupported aggregation mode: {mode}")
+
+        self.percentiles = list(percentiles)
+        self.risk_levels = _validate_risk_levels(risk_levels)
+        self.mode = mode
+
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._losses = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+        self._sketch = KLLSketch(k=sketch_k, seed=seed) if mode == "sketch" else None
+        self._chunks: List[np.ndarray] = []
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        # Population variance, as in the summary
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def prob_loss(self) -> float:
+        return self._losses / self.count if self.count else 0.0
+
+    @property
+    def sketch(self) -> Optional[KLLSketch]:
+        # Profit sketch in "sketch" mode, None in "exact" mode
+        return self._sketch
+
+    def update(self, outcomes: OutcomeBatch) -> "StreamingAggregator":
+        if len(outcomes) == 0:
+            return self
+
+        # Sanity checks over the chunk
+        if np.any(outcomes.demand < 0):
             raise ValueError("Negative demand detected")
 
-        if not math.isfinite(o.profit):
+        profits = outcomes.profit
+
+        if not np.all(np.isfinite(profits)):
             raise ValueError("Non-finite profit detected")
 
-        profits.append(o.profit)
+        n = len(profits)
+        # float64 accumulators whatever the outcome dtype
+        mean = float(np.mean(profits, dtype=np.float64))
+        centered = profits.astype(np.float64, copy=False) - mean
+        sq = centered * centered
+        m2 = float(np.sum(sq))
+        m3 = float(np.dot(sq, centered))
+        self._combine(n, mean, m2, m3)
+
+        self._losses += int(np.count_nonzero(profits < 0))
+        self._min = min(self._min, float(np.min(profits)))
+        self._max = max(self._max, float(np.max(profits)))
+
+        if self._sketch is not None:
+            self._sketch.update(profits)
+        else:
+            self._chunks.append(profits)
+
+        return self
 
-    # Mean
-    mean = sum(profits) / len(profits)
+    def merge(self, other: "StreamingAggregator") -> "StreamingAggregator":
+        if other.mode != self.mode:
+            raise ValueError("Cannot merge aggregators with different modes")
 
-    # Variance (population variance for MC)
-    variance = sum((p - mean) ** 2 for p in profits) / len(profits)
+        if other.count == 0:
+            return self
 
-    # Percentiles
-    sorted_profits = sorted(profits)
-    n = len(sorted_profits)
+        self._combine(other.count, other._mean, other._m2, other._m3)
 
-    pct_values: Dict[int, float] = {}
-    for p in percentiles:
-        idx = int(math.floor((p / 100) * (n - 1)))
-        pct_values[p] = sorted_profits[idx]
+        self._losses += other._losses
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+        if self._sketch is not None:
+            self._sketch.merge(other._sketch)
+        else:
+            self._chunks.extend(other._chunks)
+
+        return self
+
+    def summary(self) -> SimulationSummary:
+        if self.count == 0:
+            raise ValueError("No outcomes to aggregate")
+
+        n = self.count
+
+        if self._sketch is not None:
+            pct_ranks = [percentile_rank(p, n) for p in self.percentiles]
+            pct_values = dict(zip(self.percentiles, self._sketch.quantiles(pct_ranks)))
+
+            var_values = self._sketch.quantiles(
+                [tail_rank(a, n) for a in self.risk_levels]
+            )
+            value_at_risk = dict(zip(self.risk_levels, var_values))
+            conditional_value_at_risk = {
+                a: self._sketch.tail_mean(v) for a, v in value_at_risk.items()
+            }
+        else:
+            profits = (
+                self._chunks[0]
+                if len(self._chunks) == 1
+                else np.concatenate(self._chunks)
+            )
+
+            # One selection for every percentile and VaR rank
+            ranks = sorted(
+                {percentile_rank(p, n) for p in self.percentiles}
+                | {tail_rank(a, n) for a in self.risk_levels}
+            )
+            partitioned = np.partition(profits, ranks)
+
+            pct_values = {
+                p: float(partitioned[percentile_rank(p, n)]) for p in self.percentiles
+            }
+            value_at_risk = {}
+            conditional_value_at_risk = {}
+            for a in self.risk_levels:
+                r = tail_rank(a, n)
+                value_at_risk[a] = float(partitioned[r])
+                conditional_value_at_risk[a] = float(np.mean(partitioned[: r + 1], dtype=np.float64))
+
+        # Population moments for MC
+        variance = self._m2 / n
+        skew = math.sqrt(n) * self._m3 / self._m2 ** 1.5 if self._m2 > 0 else 0.0
+
+        return SimulationSummary(
+            mean_profit=self._mean,
+            profit_variance=variance,
+            profit_percentiles=pct_values,
+            std_profit=math.sqrt(variance),
+            profit_skew=skew,
+            prob_loss=self._losses / n,
+            min_profit=self._min,
+            max_profit=self._max,
+            value_at_risk=value_at_risk,
+            conditional_value_at_risk=conditional_value_at_risk,
+            num_runs=n,
+        )
+
+    def _combine(self, n: int, mean: float, m2: float, m3: float) -> None:
+        n_a = self.count
+        total = n_a + n
+        delta = mean - self._mean
+
+        self._m3 += (
+            m3
+            + delta ** 3 * n_a * n * (n_a - n) / total ** 2
+            + 3.0 * delta * (n_a * m2 - n * self._m2) / total
+        )
+        self._m2 += m2 + delta * delta * n_a * n / total
+        self._mean += delta * n / total
+        self.count = total
+
+
+def summarize_rows(
+    profits: np.ndarray,
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> List[SimulationSummary]:
+    """
+    Summarizes each row of a (scenarios x runs) profit matrix.
+    Same definitions as aggregate_outcomes, computed along axis 1
+    for all rows at once.
+    """
+    profits = np.atleast_2d(profits)
+    levels = _validate_risk_levels(risk_levels)
+    rows, n = profits.shape
+
+    if n == 0:
+        raise ValueError("No outcomes to aggregate")
+
+    if not np.all(np.isfinite(profits)):
+        raise ValueError("Non-finite profit detected")
+
+    # float64 accumulators; deviations stay in the profit dtype, taken
+    # about the mean rounded to that dtype and corrected for the shift
+    mean = profits.mean(axis=1, dtype=np.float64)
+    rounded = mean.astype(profits.dtype)
+    centered = profits - rounded[:, None]
+    sq = centered * centered
+    s2 = sq.sum(axis=1, dtype=np.float64)
+    s3 = np.einsum("ij,ij->i", sq, centered, dtype=np.float64)
+    del centered, sq
+
+    shift = mean - rounded
+    m2 = s2 - n * shift ** 2
+    m3 = s3 - 3 * shift * s2 + 2 * n * shift ** 3
+
+    variance = m2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = np.where(m2 > 0, np.sqrt(n) * m3 / m2 ** 1.5, 0.0)
+
+    prob_loss = np.count_nonzero(profits < 0, axis=1) / n
+    mins = profits.min(axis=1)
+    maxs = profits.max(axis=1)
+
+    ranks = sorted(
+        {percentile_rank(p, n) for p in percentiles}
+        | {tail_rank(a, n) for a in levels}
+    )
+    partitioned = np.partition(profits, ranks, axis=1)
+    tail_means = {
+        a: partitioned[:, : tail_rank(a, n) + 1].mean(axis=1, dtype=np.float64) for a in levels
+    }
+
+    return [
+        SimulationSummary(
+            mean_profit=float(mean[i]),
+            profit_variance=float(variance[i]),
+            profit_percentiles={
+                p: float(partitioned[i, percentile_rank(p, n)]) for p in percentiles
+            },
+            std_profit=float(np.sqrt(variance[i])),
+            profit_skew=float(skew[i]),
+            prob_loss=float(prob_loss[i]),
+            min_profit=float(mins[i]),
+            max_profit=float(maxs[i]),
+            value_at_risk={a: float(partitioned[i, tail_rank(a, n)]) for a in levels},
+            conditional_value_at_risk={a: float(tail_means[a][i]) for a in levels},
+            num_runs=n,
+        )
+        for i in range(rows)
+    ]
+
+
+def aggregate_outcomes(
+    outcomes: Union[OutcomeBatch, Sequence[PricingOutcome]],
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> SimulationSummary:
+    if not isinstance(outcomes, OutcomeBatch):
+        outcomes = OutcomeBatch.from_outcomes(outcomes)
+
+    if len(outcomes) == 0:
+        raise ValueError("No outcomes to aggregate")
 
-    return SimulationSummary(
-        mean_profit=mean,
-        profit_variance=variance,
-        profit_percentiles=pct_values,
+    return (
+        StreamingAggregator(percentiles, mode="exact", risk_levels=risk_levels)
+        .update(outcomes)
+        .summary()
     )
@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+from .config import PricingSimulationConfig
+from .sampler import EPSILON
+
+# Gauss-Hermite nodes for expectations over a lognormal elasticity noise
+HERMITE_NODES = 96
+
+_GOLDEN = (math.sqrt(5.0) - 1.0) / 2.0
+
+
+@dataclass(frozen=True)
+class ProfitMoments:
+    prices: np.ndarray
+    mean_profit: np.ndarray
+    profit_variance: np.ndarray
+
+    @property
+    def std_profit(self) -> np.ndarray:
+        return np.sqrt(self.profit_variance)
+
+
+def analytic_profit_moments(
+    config: PricingSimulationConfig,
+    prices: Optional[Sequence[float]] = None,
+) -> ProfitMoments:
+    """
+    Exact mean and variance of profit under the simulated noise model.
+
+    With D = max(eps, demand noise) and E = max(eps, elasticity noise),
+    independent, and Q = Q0 * D * exp(-k * E * p):
+
+        E[profit]   = (p - c) * Q0 * E[D] * M_E(-k p) - F
+        Var[profit] = (p - c)^2 * Q0^2 * (E[D^2] M_E(-2 k p) - (E[D] M_E(-k p))^2)
+
+    where M_E(t) = E[exp(t E)]. Moments of D and M_E for normal noise
+    are closed-form (including the clipping at eps); for lognormal
+    demand noise too. M_E for lognormal elasticity noise has no closed
+    form and uses Gauss-Hermite quadrature (HERMITE_NODES points).
+
+    Evaluates config.price, or every price in `prices` at once.
+    """
+    _validate(config)
+
+    prices = np.atleast_1d(
+        np.asarray(config.price if prices is None else prices, dtype=np.float64)
+    )
+    if np.any(prices <= 0):
+        raise ValueError("Price must be > 0")
+
+    d1, d2 = noise_moments(
+        config.demand_noise_distribution,
+        config.demand_noise_sigma,
+    )
+
+    t = -config.price_elasticity * prices
+    m1 = _elasticity_noise_mgf(config.elasticity_noise_distribution, config.elasticity_noise_sigma, t)
+    m2 = _elasticity_noise_mgf(config.elasticity_noise_distribution, config.elasticity_noise_sigma, 2.0 * t)
+
+    margin = (prices - config.unit_cost) * config.base_demand
+    mean_profit = margin * d1 * m1 - config.fixed_cost
+    variance = margin ** 2 * (d2 * m2 - (d1 * m1) ** 2)
+
+    return ProfitMoments(
+        prices=prices,
+        mean_profit=mean_profit,
+        # Guard tiny negative values from cancellation
+        profit_variance=np.maximum(0.0, variance),
+    )
+
+
+def analytic_optimal_price(
+    config: PricingSimulationConfig,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    grid_points: int = 1025,
+    tol: float = 1e-10,
+) -> Tuple[float, float]:
+    """
+    Price maximizing exact expected profit within [min_price, max_price].
+
+    Defaults to the bracket (c, c + 10 / k] around the deterministic
+    optimum p* = c + 1/k. The bracket is scanned on a grid, then the best
+    cell is refined by golden-section search.
+    Returns (optimal_price, expected_profit).
+    """
+    _validate(config)
+
+    lo = min_price if min_price is not None else max(config.unit_cost, 0.0) + 1e-9
+    hi = max_price if max_price is not None else config.unit_cost + 10.0 / config.price_elasticity
+    if lo <= 0 or hi < lo:
+        raise ValueError("Invalid price bracket")
+
+    def expected_profit(prices) -> np.ndarray:
+        return analytic_profit_moments(config, prices).mean_profit
+
+    grid = np.linspace(lo, hi, grid_points)
+    values = expected_profit(grid)
+    i = int(np.argmax(values))
+
+    a = grid[max(i - 1, 0)]
+    b = grid[min(i + 1, grid_points - 1)]
+
+    # Golden-section refinement of the best grid cell
+    x1 = b - _GOLDEN * (b - a)
+    x2 = a + _GOLDEN * (b - a)
+    f1, f2 = expected_profit([x1, x2])
+    while b - a > tol * max(1.0, abs(b)):
+        if f1 < f2:
+            a, x1, f1 = x1, x2, f2
+            x2 = a + _GOLDEN * (b - a)
+            f2 = expected_profit([x2])[0]
+        else:
+            b, x2, f2 = x2, x1, f1
+            x1 = b - _GOLDEN * (b - a)
+            f1 = expected_profit([x1])[0]
+
+    price = (a + b) / 2.0
+    best = float(expected_profit([price])[0])
+
+    if values[i] > best:
+        return float(grid[i]), float(values[i])
+    return float(price), best
+
+
+def _validate(config: PricingSimulationConfig) -> None:
+    if config.noise_correlation != 0:
+        raise ValueError("Analytic moments assume independent demand and elasticity noise")
+
+    if config.base_demand < 0:
+        raise ValueError("Base demand must be >= 0")
+
+    if config.price_elasticity <= 0:
+        raise ValueError("Price elasticity must be > 0")
+
+    if config.unit_cost < 0:
+        raise ValueError("Unit cost must be >= 0")
+
+    if config.fixed_cost < 0:
+        raise ValueError("Fixed cost must be >= 0")
+
+
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+
+def _norm_cdf(x):
+    return 0.5 * _erfc(-np.asarray(x, dtype=np.float64) / math.sqrt(2.0))
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * np.asarray(x, dtype=np.float64) ** 2) / math.sqrt(2.0 * math.pi)
+
+
+def noise_moments(distribution: str, sigma: float) -> Tuple[float, float]:
+    """
+    (E[N], E[N^2]) of a clipped noise draw N = max(eps, X).
+    """
+    a = EPSILON
+
+    if distribution == "normal":
+        # X ~ N(1, sigma^2)
+        alpha = (a - 1.0) / sigma
+        below = float(_norm_cdf(alpha))
+        pdf = float(_norm_pdf(alpha))
+        m1 = a * below + (1.0 - below) + sigma * pdf
+        m2 = a * a * below + (1.0 + sigma ** 2) * (1.0 - below) + sigma * (1.0 + a) * pdf
+        return m1, m2
+
+    if distribution == "lognormal":
+        # X = exp(sigma Z); E[X^r; X > a] = exp(r^2 sigma^2 / 2) Phi(r sigma - ln(a) / sigma)
+        z = math.log(a) / sigma
+        below = float(_norm_cdf(z))
+        m1 = a * below + math.exp(sigma ** 2 / 2.0) * float(_norm_cdf(sigma - z))
+        m2 = a * a * below + math.exp(2.0 * sigma ** 2) * float(_norm_cdf(2.0 * sigma - z))
+        return m1, m2
+
+    raise ValueError(f"Unsupported distribution: {distribution}")
+
+
+def _elasticity_noise_mgf(distribution: str, sigma: float, t: np.ndarray) -> np.ndarray:
+    """
+    E[exp(t E)] of E = max(eps, X), elementwise over t.
+    """
+    a = EPSILON
+
+    if distribution == "normal":
+        # X ~ N(1, sigma^2)
+        below = np.exp(t * a) * _norm_cdf((a - 1.0) / sigma)
+        above = np.exp(t + 0.5 * sigma ** 2 * t ** 2) * _norm_cdf((1.0 + sigma ** 2 * t - a) / sigma)
+        return below + above
+
+    if distribution == "lognormal":
+        # X = exp(sigma * sqrt(2) * x) with Gauss-Hermite weights
+        x, w = np.polynomial.hermite.hermgauss(HERMITE_NODES)
+        e = np.maximum(a, np.exp(sigma * math.sqrt(2.0) * x))
+        return np.exp(np.outer(t, e)) @ w / math.sqrt(math.pi)
+
+    raise ValueError(f"Unsupported distribution: {distribution}")
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aggregate import DEFAULT_RISK_LEVELS, SimulationSummary, summarize_rows
+from .config import PricingSimulationConfig
+from .control_variate import ProfitControlVariate, adjust_summaries
+from .grid import GRID_BLOCK_CELLS
+from .model import evaluate_pricing_causal_model_batch
+from .monte_carlo import NOISE_FIELDS, sample_noise
+
+NoiseKey = Tuple
+
+
+def noise_key(config: PricingSimulationConfig) -> NoiseKey:
+    """
+    The config fields sample_noise depends on. Scenarios with equal keys
+    draw identical noise, whatever their price, assumptions and costs.
+    """
+    return tuple(getattr(config, field) for field in NOISE_FIELDS)
+
+
+def run_scenario_batch(
+    configs: Sequence[PricingSimulationConfig],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> List[SimulationSummary]:
+    """
+    Summaries of many scenarios, in input order.
+
+    Identical configs are evaluated once. The rest are grouped by
+    noise_key and each group's noise is sampled once. Groups with the
+    same num_runs and dtype are stacked into one (scenarios x runs)
+    matrix, each row reading its group's noise, and evaluated in blocks
+    of at most GRID_BLOCK_CELLS cells. Each summary equals run_simulation on that
+    config up to float rounding (control-variate mean included).
+    """
+    unique = list(dict.fromkeys(configs))
+
+    # (num_runs, dtype) -> indices into unique
+    stacks: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    for i, config in enumerate(unique):
+        stacks[config.num_runs, config.dtype].append(i)
+
+    summaries: List[Optional[SimulationSummary]] = [None] * len(unique)
+    for members in stacks.values():
+        stacked = _run_stack([unique[i] for i in members], risk_levels)
+        for i, summary in zip(members, stacked):
+            summaries[i] = summary
+
+    position = {config: i for i, config in enumerate(unique)}
+    return [summaries[position[config]] for config in configs]
+
+
+def _run_stack(
+    configs: List[PricingSimulationConfig],
+    risk_levels: Sequence[float],
+) -> List[SimulationSummary]:
+    # All configs share num_runs and dtype; one noise draw per group
+    groups: Dict[NoiseKey, int] = {}
+    noise: List[Tuple[np.ndarray, np.ndarray]] = []
+    rows = np.empty(len(configs), dtype=np.intp)
+
+    for i, config in enumerate(configs):
+        key = noise_key(config)
+        if key not in groups:
+            groups[key] = len(noise)
+            noise.append(sample_noise(config))
+        rows[i] = groups[key]
+
+    demand_noise = np.stack([d for d, _ in noise])
+    elasticity_noise = np.stack([e for _, e in noise])
+
+    params = np.array(
+        [
+            (c.price, c.base_demand, c.price_elasticity, c.unit_cost, c.fixed_cost)
+            for c in configs
+        ],
+        dtype=configs[0].dtype,
+    )
+
+    num_runs = configs[0].num_runs
+    rows_per_block = max(1, GRID_BLOCK_CELLS // num_runs)
+    summaries: List[SimulationSummary] = []
+
+    for start in range(0, len(configs), rows_per_block):
+        block = slice(start, start + rows_per_block)
+        price, base_demand, price_elasticity, unit_cost, fixed_cost = params[block].T[:, :, None]
+
+        _, _, _, profit = evaluate_pricing_causal_model_batch(
+            price=price,
+            base_demand=base_demand * demand_noise[rows[block]],
+            price_elasticity=price_elasticity * elasticity_noise[rows[block]],
+            unit_cost=unit_cost,
+            fixed_cost=fixed_cost,
+            dtype=configs[0].dtype,
+        )
+
+        block_summaries = summarize_rows(profit, risk_levels=risk_levels)
+
+        for k, config in enumerate(configs[block]):
+            if config.sampling == "control_variate":
+                group = rows[start + k]
+                control = ProfitControlVariate(config).update(
+                    profit[k], demand_noise[group], elasticity_noise[group]
+                )
+                [block_summaries[k]] = adjust_summaries([block_summaries[k]], control)
+
+        summaries.extend(block_summaries)
+
+    return summaries
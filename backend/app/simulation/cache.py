@@ -0,0 +1,299 @@
+import dataclasses
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .aggregate import DEFAULT_RISK_LEVELS, SimulationSummary
+from .compare import PairedComparison, compare_pricing_decisions, paired_comparison
+from .config import PricingSimulationConfig
+from .grid import run_price_grid
+from .results import SimulationResult, run_simulation
+from .sensitivity import sensitivity_analysis
+from .store import SimulationStore
+
+# Bump whenever a change alters the numbers produced for a given config,
+# so stale cached (or stored) results are never served.
+ENGINE_VERSION = "4"
+
+# Rough in-memory footprint of everything that is not an outcome array
+SUMMARY_BYTES = 1024
+
+
+def config_key(kind: str, config: PricingSimulationConfig, **extra: Any) -> str:
+    """
+    Canonical content hash of a simulation request.
+    Covers the operation kind, every config field, extra arguments
+    and ENGINE_VERSION.
+    """
+    document = {
+        "kind": kind,
+        "engine_version": ENGINE_VERSION,
+        "config": dataclasses.asdict(config),
+        "extra": {k: _canonical(v) for k, v in extra.items()},
+    }
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(
+            np.ascontiguousarray(value, dtype=np.float64).tobytes()
+        ).hexdigest()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+class SimulationCache:
+    """
+    Thread-safe LRU cache of simulation results under a byte budget.
+
+    Entry sizes are estimated from the outcome arrays they hold. With
+    summaries_only, SimulationResult entries are stored without their
+    outcomes; lookups that need outcomes then count as misses.
+
+    An optional SimulationStore acts as a persistent second tier for
+    SimulationResult entries: puts are written through, memory misses
+    are looked up on disk (outcomes come back memory-mapped).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        summaries_only: bool = False,
+        store: Optional[SimulationStore] = None,
+    ):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+
+        self.max_bytes = max_bytes
+        self.summaries_only = summaries_only
+        self.store = store
+
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, need_outcomes: bool = False) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and (not need_outcomes or _has_outcomes(value)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None and (not need_outcomes or _has_outcomes(value)):
+                self._put_memory(key, value)
+                with self._lock:
+                    self.store_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        config: Optional[PricingSimulationConfig] = None,
+    ) -> None:
+        """
+        Caches value; config (if given) is recorded with results written
+        through to the store.
+        """
+        if self.summaries_only:
+            value = _strip_outcomes(value)
+
+        if self.store is not None and isinstance(value, SimulationResult):
+            self.store.put(key, value, config)
+
+        self._put_memory(key, value)
+
+    def _put_memory(self, key: str, value: Any) -> None:
+        size = _estimate_bytes(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "summaries_only": self.summaries_only,
+                "hits": self.hits,
+                "misses": self.misses,
+                "store_hits": self.store_hits,
+                "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "store": self.store.stats() if self.store is not None else None,
+            }
+
+
+def _has_outcomes(value: Any) -> bool:
+    if isinstance(value, SimulationResult):
+        return value.outcomes is not None
+    if isinstance(value, dict):
+        return all(_has_outcomes(v) for v in value.values())
+    return True
+
+
+def _strip_outcomes(value: Any) -> Any:
+    if isinstance(value, SimulationResult):
+        return dataclasses.replace(value, outcomes=None)
+    if isinstance(value, dict):
+        return {k: _strip_outcomes(v) for k, v in value.items()}
+    return value
+
+
+def _estimate_bytes(value: Any) -> int:
+    if isinstance(value, SimulationResult):
+        outcomes = value.outcomes.nbytes if value.outcomes is not None else 0
+        return outcomes + SUMMARY_BYTES
+    if isinstance(value, dict):
+        return SUMMARY_BYTES + sum(_estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return SUMMARY_BYTES + sum(_estimate_bytes(v) for v in value)
+    return SUMMARY_BYTES
+
+
+# ======================================
+# Cached front ends of the core routines
+# ======================================
+
+def cached_run_simulation(
+    cache: SimulationCache,
+    config: PricingSimulationConfig,
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    need_outcomes: bool = True,
+) -> SimulationResult:
+    key = config_key("simulation", config, risk_levels=list(risk_levels))
+    result = cache.get(key, need_outcomes=need_outcomes)
+    if result is None:
+        result = run_simulation(config, risk_levels=risk_levels)
+        cache.put(key, result, config)
+    return result
+
+
+def cached_run_price_grid(
+    cache: SimulationCache,
+    config: PricingSimulationConfig,
+    prices: Sequence[float],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> List[SimulationSummary]:
+    key = price_grid_key(config, prices, risk_levels)
+    summaries = cache.get(key)
+    if summaries is None:
+        summaries = run_price_grid(config, prices, risk_levels=risk_levels)
+        cache.put(key, summaries)
+    return summaries
+
+
+def price_grid_key(
+    config: PricingSimulationConfig,
+    prices: Sequence[float],
+    risk_levels: Sequence[float],
+    **extra: Any,
+) -> str:
+    # config.price does not affect a grid run
+    config = dataclasses.replace(config, price=1.0)
+    return config_key(
+        "price_grid",
+        config,
+        prices=np.asarray(prices, dtype=np.float64),
+        risk_levels=list(risk_levels),
+        **extra,
+    )
+
+
+def cached_compare_pricing_decisions(
+    cache: SimulationCache,
+    base_config: PricingSimulationConfig,
+    prices: List[float],
+    need_outcomes: bool = False,
+) -> Dict[float, SimulationResult]:
+    key = config_key("compare", base_config, prices=list(prices))
+    results = cache.get(key, need_outcomes=need_outcomes)
+    if results is None:
+        results = compare_pricing_decisions(base_config, prices)
+        cache.put(key, results)
+    return results
+
+
+def cached_paired_comparison(
+    cache: SimulationCache,
+    base_config: PricingSimulationConfig,
+    prices: List[float],
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> PairedComparison:
+    key = paired_comparison_key(base_config, prices, percentiles, risk_levels)
+    comparison = cache.get(key)
+    if comparison is None:
+        comparison = paired_comparison(base_config, prices, percentiles, risk_levels)
+        cache.put(key, comparison)
+    return comparison
+
+
+def paired_comparison_key(
+    base_config: PricingSimulationConfig,
+    prices: Sequence[float],
+    percentiles: Sequence[int],
+    risk_levels: Sequence[float],
+) -> str:
+    # config.price does not affect a comparison
+    return config_key(
+        "paired_comparison",
+        dataclasses.replace(base_config, price=1.0),
+        prices=[float(p) for p in prices],
+        percentiles=list(percentiles),
+        risk_levels=list(risk_levels),
+    )
+
+
+def cached_sensitivity_analysis(
+    cache: SimulationCache,
+    base_config: PricingSimulationConfig,
+    perturbation: float = 0.1,
+) -> Dict[str, float]:
+    key = config_key("sensitivity", base_config, perturbation=perturbation)
+    impacts = cache.get(key)
+    if impacts is None:
+        impacts = sensitivity_analysis(base_config, perturbation)
+        cache.put(key, impacts)
+    return impacts
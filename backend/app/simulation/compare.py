@@ -1,7 +1,68 @@
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import List, Dict, Sequence, Tuple
 
+import numpy as np
+
+from .aggregate import (
+    DEFAULT_RISK_LEVELS,
+    SimulationSummary,
+    aggregate_outcomes,
+    percentile_rank,
+)
 from .config import PricingSimulationConfig
-from .results import SimulationResult, run_simulation
+from .control_variate import ProfitControlVariate, adjust_summaries
+from .grid import GRID_BLOCK_CELLS
+from .model import OutcomeBatch, evaluate_pricing_causal_model_batch
+from .monte_carlo import sample_noise
+from .results import SimulationResult
+
+
+@dataclass(frozen=True)
+class PairedDelta:
+    price_a: float
+    price_b: float
+
+    # Distribution of profit(a) - profit(b) over paired runs
+    mean_delta: float
+    delta_stderr: float
+    prob_a_beats_b: float
+    delta_percentiles: Dict[int, float]
+
+
+@dataclass(frozen=True)
+class PairedComparison:
+    prices: List[float]
+    summaries: List[SimulationSummary]
+    # One entry per pair (a, b) of prices with a listed before b
+    pairs: List[PairedDelta]
+
+
+def _evaluate_prices(
+    base_config: PricingSimulationConfig,
+    prices: Sequence[float],
+) -> Tuple[np.ndarray, Tuple[np.ndarray, ...], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Evaluates every price on one shared noise draw of base_config.
+    Returns (prices, (demand, revenue, total_cost, profit) as
+    (prices x runs) matrices, noise).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+
+    if prices.ndim != 1 or len(prices) == 0:
+        raise ValueError("Prices must be a non-empty 1-D sequence")
+
+    noise = sample_noise(base_config)
+    demand_noise, elasticity_noise = noise
+
+    columns = evaluate_pricing_causal_model_batch(
+        price=prices[:, None],
+        base_demand=base_config.base_demand * demand_noise[None, :],
+        price_elasticity=base_config.price_elasticity * elasticity_noise[None, :],
+        unit_cost=base_config.unit_cost,
+        fixed_cost=base_config.fixed_cost,
+        dtype=base_config.dtype,
+    )
+    return prices, columns, noise
 
 
 def compare_pricing_decisions(
@@ -10,25 +71,98 @@ def compare_pricing_decisions(
 ) -> Dict[float, SimulationResult]:
     """
     Compare multiple pricing decisions under identical uncertainty.
+
+    Noise is drawn once and all prices are evaluated against it as one
+    (prices x runs) matrix; each result equals run_simulation on
+    base_config with that price.
+    """
+    prices, (demand, revenue, total_cost, profit), noise = _evaluate_prices(base_config, prices)
+
+    outcomes = [
+        OutcomeBatch(demand=demand[i], revenue=revenue[i], total_cost=total_cost[i], profit=profit[i])
+        for i in range(len(prices))
+    ]
+    summaries = [aggregate_outcomes(batch) for batch in outcomes]
+
+    if base_config.sampling == "control_variate":
+        control = ProfitControlVariate(base_config, prices).update(profit, *noise)
+        summaries = adjust_summaries(summaries, control)
+
+    return {
+        float(price): SimulationResult(outcomes=batch, summary=summary)
+        for price, batch, summary in zip(prices, outcomes, summaries)
+    }
+
+
+def paired_comparison(
+    base_config: PricingSimulationConfig,
+    prices: List[float],
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    block_cells: int = GRID_BLOCK_CELLS,
+) -> PairedComparison:
+    """
+    Pairwise comparison of prices from paired samples.
+
+    Every price sees the same noise draws, so run r of price a and run
+    r of price b differ only by the decision. Statistics of the
+    per-run profit differences are much tighter than differences of
+    independent summaries (the shared noise cancels out).
+
+    Differences are computed in blocks of at most block_cells cells
+    (pairs x runs); the result does not depend on the block size.
     """
-    results: Dict[float, SimulationResult] = {}
-
-    for price in prices:
-        # Create a new config with only price changed
-        config = PricingSimulationConfig(
-            price=price,
-            base_demand=base_config.base_demand,
-            price_elasticity=base_config.price_elasticity,
-            unit_cost=base_config.unit_cost,
-            fixed_cost=base_config.fixed_cost,
-            demand_noise_distribution=base_config.demand_noise_distribution,
-            demand_noise_sigma=base_config.demand_noise_sigma,
-            elasticity_noise_distribution=base_config.elasticity_noise_distribution,
-            elasticity_noise_sigma=base_config.elasticity_noise_sigma,
-            num_runs=base_config.num_runs,
-            random_seed=base_config.random_seed,  # SAME seed
+    if block_cells < 1:
+        raise ValueError("block_cells must be >= 1")
+
+    prices, (demand, revenue, total_cost, profit), _ = _evaluate_prices(base_config, prices)
+
+    summaries = [
+        aggregate_outcomes(
+            OutcomeBatch(demand=demand[i], revenue=revenue[i], total_cost=total_cost[i], profit=profit[i]),
+            percentiles=percentiles,
+            risk_levels=risk_levels,
+        )
+        for i in range(len(prices))
+    ]
+
+    a, b = np.triu_indices(len(prices), k=1)
+    n = profit.shape[1]
+    ranks = sorted({percentile_rank(p, n) for p in percentiles})
+
+    # Pairs grow quadratically with the prices: the (pairs x runs) delta
+    # matrix is built at most block_cells cells at a time
+    pairs_per_block = max(1, block_cells // n)
+
+    pairs = []
+    for start in range(0, len(a), pairs_per_block):
+        block_a = a[start:start + pairs_per_block]
+        block_b = b[start:start + pairs_per_block]
+        deltas = profit[block_a] - profit[block_b]
+
+        mean = deltas.mean(axis=1)
+        stderr = (
+            deltas.std(axis=1, ddof=1) / np.sqrt(n) if n > 1 else np.zeros(len(block_a))
         )
+        wins = np.count_nonzero(deltas > 0, axis=1) / n
+        partitioned = np.partition(deltas, ranks, axis=1)
 
-        results[price] = run_simulation(config)
+        pairs.extend(
+            PairedDelta(
+                price_a=float(prices[block_a[k]]),
+                price_b=float(prices[block_b[k]]),
+                mean_delta=float(mean[k]),
+                delta_stderr=float(stderr[k]),
+                prob_a_beats_b=float(wins[k]),
+                delta_percentiles={
+                    p: float(partitioned[k, percentile_rank(p, n)]) for p in percentiles
+                },
+            )
+            for k in range(len(block_a))
+        )
 
-    return results
+    return PairedComparison(
+        prices=prices.tolist(),
+        summaries=summaries,
+        pairs=pairs,
+    )
@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 from typing import Literal
 
+# random_seed must fit a signed 64-bit integer: numpy-engine streams are
+# seeded with its two's complement (monte_carlo.seed_sequence)
+SEED_BITS = 64
+
 class ConfigValidationError(ValueError):
     def __init__(self, field: str, message: str):
         self.field = field
@@ -29,6 +33,14 @@ class PricingSimulationConfig:
     # simulation
     num_runs: int
     random_seed: int
+    engine: Literal["python", "numpy"] = "python"
+    sampling: Literal["iid", "antithetic", "lhs", "sobol", "control_variate"] = "iid"
+    # float32 halves memory traffic (numpy engine only); moments still
+    # accumulate in float64
+    dtype: Literal["float64", "float32"] = "float64"
+    # correlation of the demand and elasticity noise (Gaussian copula,
+    # numpy engine only); 0 keeps the independent draws
+    noise_correlation: float = 0.0
 
     @staticmethod
     def from_request(request: dict) -> "PricingSimulationConfig":
@@ -82,6 +94,8 @@ class PricingSimulationConfig:
             en = un["elasticity_noise"]
             elasticity_noise_distribution = en["distribution"]
             elasticity_noise_sigma = float(en["sigma"])
+
+            noise_correlation = float(un.get("correlation", 0.0))
         except KeyError as e:
             raise ConfigValidationError(
                 "uncertainty",
@@ -113,11 +127,17 @@ class PricingSimulationConfig:
                 "uncertainty.elasticity_noise.distribution",
                 "Unsupported distribution"
             )
+
+        if not -1.0 < noise_correlation < 1.0:
+            raise ConfigValidationError("uncertainty.correlation", "Must be in (-1, 1)")
         
         try:
             sim = request["simulation"]
             num_runs = int(sim["num_runs"])
             random_seed = int(sim["random_seed"])
+            engine = sim.get("engine", "python")
+            sampling = sim.get("sampling", "iid")
+            dtype = sim.get("dtype", "float64")
         except KeyError as e:
             raise ConfigValidationError(
                 "simulation",
@@ -132,6 +152,48 @@ class PricingSimulationConfig:
 
         if num_runs < 1:
             raise ConfigValidationError("simulation.num_runs", "Must be >= 1")
+
+        if not -(1 << (SEED_BITS - 1)) <= random_seed < 1 << (SEED_BITS - 1):
+            raise ConfigValidationError(
+                "simulation.random_seed",
+                "Must fit a signed 64-bit integer"
+            )
+
+        if engine not in ("python", "numpy"):
+            raise ConfigValidationError(
+                "simulation.engine",
+                "Unsupported engine"
+            )
+
+        if sampling not in ("iid", "antithetic", "lhs", "sobol", "control_variate"):
+            raise ConfigValidationError(
+                "simulation.sampling",
+                "Unsupported sampling method"
+            )
+
+        if sampling != "iid" and engine != "numpy":
+            raise ConfigValidationError(
+                "simulation.sampling",
+                "Requires the numpy engine"
+            )
+
+        if dtype not in ("float64", "float32"):
+            raise ConfigValidationError(
+                "simulation.dtype",
+                "Unsupported dtype"
+            )
+
+        if dtype != "float64" and engine != "numpy":
+            raise ConfigValidationError(
+                "simulation.dtype",
+                "Requires the numpy engine"
+            )
+
+        if noise_correlation != 0.0 and engine != "numpy":
+            raise ConfigValidationError(
+                "uncertainty.correlation",
+                "Requires the numpy engine"
+            )
         
         return PricingSimulationConfig(
             price=price,
@@ -145,4 +207,8 @@ class PricingSimulationConfig:
             elasticity_noise_sigma=elasticity_noise_sigma,
             num_runs=num_runs,
             random_seed=random_seed,
+            engine=engine,
+            sampling=sampling,
+            dtype=dtype,
+            noise_correlation=noise_correlation,
         )
@@ -0,0 +1,157 @@
+import dataclasses
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .aggregate import SimulationSummary
+from .analytic import noise_moments
+from .config import PricingSimulationConfig
+from .model import evaluate_pricing_causal_model_batch
+
+
+class ProfitControlVariate:
+    """
+    Control-variate estimator of mean profit, one row per price.
+
+    The control is the deterministic model (evaluate_from_config, all
+    noise at 1) expanded to first order in the noise draws:
+
+        X = profit_0 + g_d (D - 1) + g_e (E - 1)
+
+    where g_d, g_e are the partial derivatives of profit in the demand
+    and elasticity noise. E[X] is known exactly from the clipped noise
+    means, so
+
+        mean(Y) - beta (mean(X) - E[X]),   beta = Cov(X, Y) / Var(X)
+
+    estimates E[profit] with variance reduced by a factor (1 - rho^2).
+    Moments are accumulated per chunk and merge exactly.
+    """
+
+    def __init__(
+        self,
+        config: PricingSimulationConfig,
+        prices: Optional[Sequence[float]] = None,
+    ):
+        prices = np.atleast_1d(
+            np.asarray(config.price if prices is None else prices, dtype=np.float64)
+        )
+
+        demand, _, _, profit = evaluate_pricing_causal_model_batch(
+            price=prices,
+            base_demand=config.base_demand,
+            price_elasticity=config.price_elasticity,
+            unit_cost=config.unit_cost,
+            fixed_cost=config.fixed_cost,
+        )
+        margin = (prices - config.unit_cost) * demand
+
+        self._profit = profit
+        self._grad_demand = margin
+        self._grad_elasticity = -margin * config.price_elasticity * prices
+
+        demand_mean, _ = noise_moments(config.demand_noise_distribution, config.demand_noise_sigma)
+        elasticity_mean, _ = noise_moments(
+            config.elasticity_noise_distribution, config.elasticity_noise_sigma
+        )
+        self.control_mean = (
+            profit
+            + self._grad_demand * (demand_mean - 1.0)
+            + self._grad_elasticity * (elasticity_mean - 1.0)
+        )
+
+        rows = len(prices)
+        self.count = 0
+        self._mean_x = np.zeros(rows)
+        self._mean_y = np.zeros(rows)
+        self._cxx = np.zeros(rows)
+        self._cxy = np.zeros(rows)
+        self._cyy = np.zeros(rows)
+
+    def update(
+        self,
+        profits: np.ndarray,
+        demand_noise: np.ndarray,
+        elasticity_noise: np.ndarray,
+    ) -> "ProfitControlVariate":
+        """
+        profits: (prices x runs), or 1-D for a single price, evaluated
+        on the given noise draws.
+        """
+        profits = np.atleast_2d(profits)
+        n = profits.shape[1]
+        if n == 0:
+            return self
+
+        x = (
+            self._profit[:, None]
+            + self._grad_demand[:, None] * (demand_noise[None, :] - 1.0)
+            + self._grad_elasticity[:, None] * (elasticity_noise[None, :] - 1.0)
+        )
+
+        mean_x = x.mean(axis=1)
+        mean_y = profits.mean(axis=1, dtype=np.float64)
+        dx = x - mean_x[:, None]
+        dy = profits - mean_y[:, None]
+
+        self._combine(
+            n,
+            mean_x,
+            mean_y,
+            np.einsum("ij,ij->i", dx, dx),
+            np.einsum("ij,ij->i", dx, dy),
+            np.einsum("ij,ij->i", dy, dy),
+        )
+        return self
+
+    def merge(self, other: "ProfitControlVariate") -> "ProfitControlVariate":
+        if other.count:
+            self._combine(other.count, other._mean_x, other._mean_y, other._cxx, other._cxy, other._cyy)
+        return self
+
+    def means(self) -> np.ndarray:
+        """
+        Control-variate estimates of mean profit per price.
+        """
+        if self.count == 0:
+            raise ValueError("No outcomes to aggregate")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = np.where(self._cxx > 0, self._cxy / self._cxx, 0.0)
+        return self._mean_y - beta * (self._mean_x - self.control_mean)
+
+    def variance_reduction(self) -> np.ndarray:
+        """
+        rho^2 per price: the fraction of the mean's variance removed.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = self._cxx * self._cyy
+            return np.where(denom > 0, self._cxy ** 2 / denom, 0.0)
+
+    def _combine(self, n, mean_x, mean_y, cxx, cxy, cyy) -> None:
+        n_a = self.count
+        total = n_a + n
+        dx = mean_x - self._mean_x
+        dy = mean_y - self._mean_y
+        w = n_a * n / total
+
+        self._cxx = self._cxx + cxx + dx * dx * w
+        self._cxy = self._cxy + cxy + dx * dy * w
+        self._cyy = self._cyy + cyy + dy * dy * w
+        self._mean_x = self._mean_x + dx * n / total
+        self._mean_y = self._mean_y + dy * n / total
+        self.count = total
+
+
+def adjust_summaries(
+    summaries: Sequence[SimulationSummary],
+    control: ProfitControlVariate,
+) -> List[SimulationSummary]:
+    """
+    Replaces mean_profit with the control-variate estimate. The other
+    fields describe the profit distribution and are left unchanged.
+    """
+    return [
+        dataclasses.replace(summary, mean_profit=float(mean))
+        for summary, mean in zip(summaries, control.means())
+    ]
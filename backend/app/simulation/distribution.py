@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .aggregate import percentile_rank
+from .sketch import KLLSketch
+
+# Raw profit samples, or a sketch of them when outcomes were streamed
+Source = Union[np.ndarray, KLLSketch]
+
+
+@dataclass(frozen=True)
+class Histogram:
+    edges: np.ndarray  # bins + 1 edges
+    counts: np.ndarray  # per bin; the last bin is closed on the right
+    underflow: int  # values below edges[0]
+    overflow: int  # values above edges[-1]
+
+
+@dataclass(frozen=True)
+class QuantileGrid:
+    levels: np.ndarray  # probabilities in [0, 1]
+    values: np.ndarray
+
+
+@dataclass(frozen=True)
+class ECDF:
+    values: np.ndarray  # evenly spaced between min and max profit
+    probabilities: np.ndarray  # fraction of samples <= each value
+
+
+def profit_histogram(
+    source: Source,
+    bins: int = 50,
+    range: Optional[Tuple[float, float]] = None,
+) -> Histogram:
+    """
+    Fixed-bin histogram over `range` (default: min to max profit).
+    From a sketch, counts are derived from its CDF and carry the
+    sketch's rank error.
+    """
+    if bins < 1:
+        raise ValueError("bins must be >= 1")
+
+    lo, hi = range if range is not None else _value_range(source)
+    if not hi > lo:
+        # Degenerate distribution: one bin around the single value
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = np.linspace(lo, hi, bins + 1)
+
+    if isinstance(source, KLLSketch):
+        n = source.n
+        below = np.concatenate([[_count_below(source, lo)], source.cdf(edges[1:]) * n])
+        counts = np.rint(np.diff(below)).astype(np.int64)
+        underflow = int(round(below[0]))
+        overflow = n - underflow - int(counts.sum())
+        return Histogram(edges=edges, counts=counts, underflow=underflow, overflow=max(0, overflow))
+
+    values = np.asarray(source, dtype=np.float64)
+    counts, _ = np.histogram(values, bins=edges)
+    return Histogram(
+        edges=edges,
+        counts=counts.astype(np.int64),
+        underflow=int(np.count_nonzero(values < lo)),
+        overflow=int(np.count_nonzero(values > hi)),
+    )
+
+
+def quantile_grid(source: Source, points: int = 101) -> QuantileGrid:
+    """
+    Profit quantiles at `points` evenly spaced probabilities from 0 to 1,
+    with the same rank convention as the summary percentiles.
+    """
+    if points < 2:
+        raise ValueError("points must be >= 2")
+
+    n = _count(source)
+    levels = np.linspace(0.0, 1.0, points)
+    ranks = [percentile_rank(100.0 * level, n) for level in levels]
+
+    if isinstance(source, KLLSketch):
+        values = np.asarray(source.quantiles(ranks))
+    else:
+        partitioned = np.partition(np.asarray(source, dtype=np.float64), sorted(set(ranks)))
+        values = partitioned[ranks]
+
+    return QuantileGrid(levels=levels, values=values)
+
+
+def ecdf(source: Source, points: int = 200) -> ECDF:
+    """
+    Empirical CDF downsampled to `points` evenly spaced profit values.
+    """
+    if points < 2:
+        raise ValueError("points must be >= 2")
+
+    lo, hi = _value_range(source)
+    grid = np.linspace(lo, hi, points)
+
+    if isinstance(source, KLLSketch):
+        return ECDF(values=grid, probabilities=source.cdf(grid))
+
+    values = np.asarray(source, dtype=np.float64)
+    # Index of the first grid point >= each value; counts per grid point
+    # then accumulate to #(values <= grid point)
+    slots = np.searchsorted(grid, values, side="left")
+    counts = np.bincount(slots, minlength=points + 1)[:points]
+    return ECDF(values=grid, probabilities=np.cumsum(counts) / len(values))
+
+
+def _count(source: Source) -> int:
+    n = source.n if isinstance(source, KLLSketch) else len(source)
+    if n == 0:
+        raise ValueError("No outcomes to summarize")
+    return n
+
+
+def _value_range(source: Source) -> Tuple[float, float]:
+    n = _count(source)
+    if isinstance(source, KLLSketch):
+        lo, hi = source.quantiles([0, n - 1])
+        return lo, hi
+    values = np.asarray(source, dtype=np.float64)
+    return float(values.min()), float(values.max())
+
+
+def _count_below(sketch: KLLSketch, value: float) -> float:
+    # cdf counts values <= x; approximate values < lo by the next float down
+    return float(sketch.cdf([np.nextafter(value, -np.inf)])[0] * sketch.n)
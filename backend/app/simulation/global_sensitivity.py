@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional
+import math
+
+import numpy as np
+
+from .config import PricingSimulationConfig
+from .model import evaluate_pricing_causal_model_batch
+from .monte_carlo import seed_sequence
+from .qmc import MAX_SOBOL_DIMS, norm_ppf, sobol_points
+from .sampler import ArraySampler, enforce_valid_samples
+
+Input = Literal["demand_noise", "elasticity_noise", "unit_cost", "fixed_cost"]
+
+
+@dataclass(frozen=True)
+class SobolIndices:
+    inputs: List[str]
+    # Var(profit) over the design
+    variance: float
+    first_order: Dict[str, float]
+    first_order_stderr: Dict[str, float]
+    total: Dict[str, float]
+    total_stderr: Dict[str, float]
+    num_samples: int
+
+    @property
+    def interaction(self) -> float:
+        """
+        Share of variance explained only by interactions (1 - sum S_i).
+        """
+        return 1.0 - sum(self.first_order.values())
+
+
+def sobol_indices(
+    config: PricingSimulationConfig,
+    unit_cost_sigma: Optional[float] = None,
+    fixed_cost_sigma: Optional[float] = None,
+) -> SobolIndices:
+    """
+    First-order and total Sobol indices of profit at config.price.
+
+    Uncertain inputs are the demand and elasticity noise of config, plus
+    optionally unit and fixed cost, each scaled by max(eps, 1 + sigma Z).
+    config.num_runs is the base sample size N.
+
+    Saltelli design: two independent N x d input matrices A and B, and
+    for each input i the matrix AB_i (A with column i taken from B). All
+    N * (d + 2) rows are evaluated in one batched model call, then
+
+        S_i  = mean(f(B) * (f(AB_i) - f(A))) / V         (Saltelli 2010)
+        ST_i = mean((f(A) - f(AB_i))^2) / (2 V)          (Jansen)
+
+    with V the variance of f over A and B. A and B are drawn from a
+    scrambled Sobol sequence when config.sampling is "sobol" (up to
+    MAX_SOBOL_DIMS / 2 inputs), otherwise i.i.d. Standard errors are
+    the Monte Carlo errors of the two means, V held fixed.
+    """
+    if config.noise_correlation != 0:
+        raise ValueError("Sobol indices require independent inputs (noise_correlation = 0)")
+    if unit_cost_sigma is not None and unit_cost_sigma <= 0:
+        raise ValueError("unit_cost_sigma must be > 0")
+    if fixed_cost_sigma is not None and fixed_cost_sigma <= 0:
+        raise ValueError("fixed_cost_sigma must be > 0")
+
+    sigmas: Dict[str, float] = {
+        "demand_noise": config.demand_noise_sigma,
+        "elasticity_noise": config.elasticity_noise_sigma,
+    }
+    if unit_cost_sigma is not None:
+        sigmas["unit_cost"] = unit_cost_sigma
+    if fixed_cost_sigma is not None:
+        sigmas["fixed_cost"] = fixed_cost_sigma
+
+    inputs = list(sigmas)
+    d = len(inputs)
+    n = config.num_runs
+
+    rng = np.random.default_rng(seed_sequence(config.random_seed))
+    if config.sampling == "sobol":
+        if 2 * d > MAX_SOBOL_DIMS:
+            raise ValueError(f"Sobol designs support up to {MAX_SOBOL_DIMS // 2} inputs")
+        z = norm_ppf(sobol_points(n, 2 * d, rng))
+    else:
+        z = rng.standard_normal((2 * d, n))
+    a, b = z[:d], z[d:]
+
+    # Design: blocks A, B, AB_1 .. AB_d, each (d x N)
+    design = np.empty((d + 2, d, n))
+    design[0] = a
+    design[1] = b
+    for i in range(d):
+        design[2 + i] = a
+        design[2 + i, i] = b[i]
+
+    f = _evaluate(config, inputs, sigmas, design.transpose(1, 0, 2).reshape(d, -1))
+    f = f.reshape(d + 2, n)
+    f_a, f_b, f_ab = f[0], f[1], f[2:]
+
+    variance = float(np.var(np.concatenate([f_a, f_b])))
+    if variance == 0:
+        raise ValueError("Profit has zero variance; indices are undefined")
+
+    first_terms = f_b[None, :] * (f_ab - f_a[None, :])
+    total_terms = 0.5 * (f_a[None, :] - f_ab) ** 2
+
+    first = first_terms.mean(axis=1) / variance
+    total = total_terms.mean(axis=1) / variance
+    first_se = first_terms.std(axis=1) / math.sqrt(n) / variance
+    total_se = total_terms.std(axis=1) / math.sqrt(n) / variance
+
+    return SobolIndices(
+        inputs=inputs,
+        variance=variance,
+        first_order=dict(zip(inputs, first.tolist())),
+        first_order_stderr=dict(zip(inputs, first_se.tolist())),
+        total=dict(zip(inputs, total.tolist())),
+        total_stderr=dict(zip(inputs, total_se.tolist())),
+        num_samples=n,
+    )
+
+
+def _evaluate(
+    config: PricingSimulationConfig,
+    inputs: List[str],
+    sigmas: Dict[str, float],
+    z: np.ndarray,
+) -> np.ndarray:
+    """
+    Profit for every column of standard normal inputs z (d x rows).
+    """
+    rows = dict(zip(inputs, z))
+
+    demand_noise = enforce_valid_samples(
+        ArraySampler.transform(config.demand_noise_distribution, sigmas["demand_noise"], rows["demand_noise"])
+    )
+    elasticity_noise = enforce_valid_samples(
+        ArraySampler.transform(
+            config.elasticity_noise_distribution, sigmas["elasticity_noise"], rows["elasticity_noise"]
+        )
+    )
+
+    unit_cost = config.unit_cost
+    if "unit_cost" in rows:
+        unit_cost = unit_cost * enforce_valid_samples(1.0 + sigmas["unit_cost"] * rows["unit_cost"])
+
+    fixed_cost = config.fixed_cost
+    if "fixed_cost" in rows:
+        fixed_cost = fixed_cost * enforce_valid_samples(1.0 + sigmas["fixed_cost"] * rows["fixed_cost"])
+
+    _, _, _, profit = evaluate_pricing_causal_model_batch(
+        price=config.price,
+        base_demand=config.base_demand * demand_noise,
+        price_elasticity=config.price_elasticity * elasticity_noise,
+        unit_cost=unit_cost,
+        fixed_cost=fixed_cost,
+    )
+    return profit
@@ -0,0 +1,77 @@
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .aggregate import DEFAULT_RISK_LEVELS, SimulationSummary, summarize_rows
+from .config import PricingSimulationConfig
+from .control_variate import ProfitControlVariate, adjust_summaries
+from .model import evaluate_pricing_causal_model_batch
+from .monte_carlo import sample_noise
+
+# Upper bound on prices x runs evaluated at once; bounds peak memory
+GRID_BLOCK_CELLS = 1 << 20
+
+
+def run_price_grid(
+    config: PricingSimulationConfig,
+    prices: Sequence[float],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> List[SimulationSummary]:
+    """
+    Evaluates many prices under common random numbers.
+
+    Noise is sampled once for config (config.price is ignored) and every
+    price is evaluated against the same draws as a (prices x runs)
+    broadcast, in blocks of at most GRID_BLOCK_CELLS cells. Each summary
+    equals run_simulation on config with that price, up to float rounding
+    (including the control-variate mean for sampling="control_variate").
+    """
+    summaries: List[SimulationSummary] = []
+    for _, block_summaries in iter_price_grid(config, prices, risk_levels):
+        summaries.extend(block_summaries)
+    return summaries
+
+
+def iter_price_grid(
+    config: PricingSimulationConfig,
+    prices: Sequence[float],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    block_cells: int = GRID_BLOCK_CELLS,
+) -> Iterator[Tuple[np.ndarray, List[SimulationSummary]]]:
+    """
+    run_price_grid one block at a time: yields (block prices, summaries)
+    in price order as each block of at most block_cells cells completes.
+    Summaries do not depend on the block size.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+
+    if prices.ndim != 1 or len(prices) == 0:
+        raise ValueError("Prices must be a non-empty 1-D sequence")
+    if block_cells < 1:
+        raise ValueError("block_cells must be >= 1")
+
+    demand_noise, elasticity_noise = sample_noise(config)
+    base_demand = config.base_demand * demand_noise
+    price_elasticity = config.price_elasticity * elasticity_noise
+
+    rows_per_block = max(1, block_cells // config.num_runs)
+
+    for start in range(0, len(prices), rows_per_block):
+        block = prices[start:start + rows_per_block]
+
+        _, _, _, profit = evaluate_pricing_causal_model_batch(
+            price=block[:, None],
+            base_demand=base_demand[None, :],
+            price_elasticity=price_elasticity[None, :],
+            unit_cost=config.unit_cost,
+            fixed_cost=config.fixed_cost,
+            dtype=config.dtype,
+        )
+
+        block_summaries = summarize_rows(profit, risk_levels=risk_levels)
+
+        if config.sampling == "control_variate":
+            control = ProfitControlVariate(config, block).update(profit, demand_noise, elasticity_noise)
+            block_summaries = adjust_summaries(block_summaries, control)
+
+        yield block, block_summaries
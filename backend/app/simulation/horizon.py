@@ -0,0 +1,261 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .aggregate import DEFAULT_RISK_LEVELS, SimulationSummary, summarize_rows
+from .config import PricingSimulationConfig
+from .model import evaluate_pricing_causal_model_batch
+from .monte_carlo import sample_noise, seed_sequence
+from .sampler import correlation_factor
+
+MAX_HORIZON_PERIODS = 120
+
+# Per-period shock streams: grandchildren (0, k) of seed_sequence(random_seed),
+# disjoint from every chunk stream (i,) used for the per-run noise
+_DEMAND_SHOCK_STREAM = (0, 1)
+_COST_SHOCK_STREAM = (0, 2)
+
+
+@dataclass(frozen=True)
+class HorizonAssumptions:
+    """
+    Dynamics of a multi-period simulation (a period is typically a month).
+
+    The decision moves the price from previous_price (None: unchanged)
+    to config.price at the start of period 0.
+    - Adoption delay: demand follows the change gradually. The price
+      customers respond to in period t moves from previous_price to
+      config.price by a share 1 - exp(-(t + 1) / adoption_delay)
+      (at once when adoption_delay is 0). Revenue is always at config.price.
+    - Lagged retention: from period retention_lag on, a relative price
+      increase x loses churn_sensitivity * x of the remaining customers
+      every period, scaled by the run's elasticity noise. Price cuts
+      cause no extra churn.
+    - Cost inflation: unit cost grows by cost_inflation per period, times
+      a lognormal random walk of per-period volatility cost_volatility.
+    - demand_volatility: lognormal per-period market shocks to demand
+      (median 1), independent across periods.
+    - shock_correlation: correlation of each period's market shock with
+      that period's cost random-walk step (e.g. inflation moving with
+      the market).
+    """
+    periods: int = 6
+    previous_price: Optional[float] = None
+    adoption_delay: float = 0.0
+    churn_sensitivity: float = 0.0
+    retention_lag: int = 1
+    cost_inflation: float = 0.0
+    cost_volatility: float = 0.0
+    demand_volatility: float = 0.0
+    shock_correlation: float = 0.0
+
+    def __post_init__(self):
+        if not 1 <= self.periods <= MAX_HORIZON_PERIODS:
+            raise ValueError(f"periods must be in [1, {MAX_HORIZON_PERIODS}]")
+        if self.previous_price is not None and self.previous_price <= 0:
+            raise ValueError("previous_price must be > 0")
+        if self.adoption_delay < 0:
+            raise ValueError("adoption_delay must be >= 0")
+        if self.churn_sensitivity < 0:
+            raise ValueError("churn_sensitivity must be >= 0")
+        if self.retention_lag < 0:
+            raise ValueError("retention_lag must be >= 0")
+        if self.cost_inflation <= -1:
+            raise ValueError("cost_inflation must be > -1")
+        if self.cost_volatility < 0:
+            raise ValueError("cost_volatility must be >= 0")
+        if self.demand_volatility < 0:
+            raise ValueError("demand_volatility must be >= 0")
+        if not -1.0 < self.shock_correlation < 1.0:
+            raise ValueError("shock_correlation must be in (-1, 1)")
+
+
+@dataclass(frozen=True, eq=False)
+class HorizonOutcomes:
+    """
+    (runs x periods) outcome tensor: one C-contiguous array per
+    OutcomeBatch column, in the simulation dtype, plus the share of
+    customers retained at the start of each period.
+    """
+    demand: np.ndarray
+    revenue: np.ndarray
+    total_cost: np.ndarray
+    profit: np.ndarray
+    retention: np.ndarray
+
+    @property
+    def num_runs(self) -> int:
+        return self.profit.shape[0]
+
+    @property
+    def periods(self) -> int:
+        return self.profit.shape[1]
+
+    def cumulative_profit(self) -> np.ndarray:
+        """
+        Profit accumulated through the end of each period (float64).
+        """
+        return np.cumsum(self.profit, axis=1, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class HorizonSummary:
+    # per period, means over runs
+    mean_demand: List[float]
+    mean_profit: List[float]
+    mean_retention: List[float]
+    # distribution of cumulative profit through the end of each period
+    cumulative: List[SimulationSummary]
+
+    @property
+    def total(self) -> SimulationSummary:
+        """
+        Distribution of profit over the whole horizon.
+        """
+        return self.cumulative[-1]
+
+
+@dataclass(frozen=True)
+class HorizonResult:
+    outcomes: HorizonOutcomes
+    summary: HorizonSummary
+
+
+def simulate_horizon(
+    config: PricingSimulationConfig,
+    horizon: HorizonAssumptions,
+) -> HorizonOutcomes:
+    """
+    Time-stepped counterpart of run_monte_carlo (numpy engine only).
+
+    Each run keeps the demand and elasticity noise run_monte_carlo draws
+    for config, so a one-period horizon without dynamics reproduces it.
+    Every quantity is a (runs x periods) array built from per-run columns
+    and per-period rows; the only sequential steps (retention, the cost
+    random walk) are cumulative products/sums along the period axis.
+    """
+    if config.engine != "numpy":
+        raise ValueError("The horizon model requires the numpy engine")
+    if config.sampling == "control_variate":
+        raise ValueError("The horizon model does not support control_variate sampling")
+
+    dtype = config.dtype
+    n, periods = config.num_runs, horizon.periods
+    t = np.arange(periods, dtype=dtype)[None, :]
+
+    demand_noise, elasticity_noise = sample_noise(config)
+    base_demand = (config.base_demand * demand_noise)[:, None]
+    price_elasticity = (config.price_elasticity * elasticity_noise)[:, None]
+
+    previous_price = horizon.previous_price or config.price
+    change = config.price / previous_price - 1.0
+
+    # Lagged retention: churn from the price change starts at retention_lag
+    # and removes customers from the following period on
+    retention = np.ones((n, periods), dtype=dtype)
+    if change > 0 and horizon.churn_sensitivity > 0 and horizon.retention_lag < periods - 1:
+        churn = np.minimum(1.0, horizon.churn_sensitivity * change * elasticity_noise)
+        kept = np.broadcast_to((1.0 - churn)[:, None], (n, periods - 1 - horizon.retention_lag))
+        np.cumprod(kept, axis=1, out=retention[:, horizon.retention_lag + 1:])
+
+    # Demand responds to the effective price, anchored at config.price:
+    # d(p_t) = d(price) * exp(elasticity * (price - p_t))
+    effective_demand = base_demand * retention
+    if change != 0 and horizon.adoption_delay > 0:
+        pending = np.exp(-(t + 1.0) / horizon.adoption_delay)
+        effective_demand *= np.exp(price_elasticity * ((config.price - previous_price) * pending))
+
+    market_shocks, cost_shocks = _period_shocks(config, horizon)
+
+    if market_shocks is not None:
+        effective_demand *= np.exp(horizon.demand_volatility * market_shocks)
+
+    unit_cost = config.unit_cost * (1.0 + horizon.cost_inflation) ** t
+    if cost_shocks is not None:
+        # Random walk starting at 1 in period 0; shock t is the step into period t
+        walk = np.zeros((n, periods), dtype=dtype)
+        np.cumsum(cost_shocks[:, 1:], axis=1, out=walk[:, 1:])
+        unit_cost = unit_cost * np.exp(horizon.cost_volatility * walk)
+
+    demand, revenue, total_cost, profit = evaluate_pricing_causal_model_batch(
+        price=config.price,
+        base_demand=effective_demand,
+        price_elasticity=price_elasticity,
+        unit_cost=unit_cost,
+        fixed_cost=config.fixed_cost,
+        dtype=dtype,
+    )
+
+    return HorizonOutcomes(
+        demand=demand,
+        revenue=revenue,
+        total_cost=np.ascontiguousarray(np.broadcast_to(total_cost, (n, periods))),
+        profit=np.ascontiguousarray(np.broadcast_to(profit, (n, periods))),
+        retention=retention,
+    )
+
+
+def summarize_horizon(
+    outcomes: HorizonOutcomes,
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> HorizonSummary:
+    """
+    Per-period means, and the full summary (percentiles, tail risk) of
+    cumulative profit through each period.
+    """
+    cumulative = np.ascontiguousarray(outcomes.cumulative_profit().T)
+
+    return HorizonSummary(
+        mean_demand=outcomes.demand.mean(axis=0, dtype=np.float64).tolist(),
+        mean_profit=outcomes.profit.mean(axis=0, dtype=np.float64).tolist(),
+        mean_retention=outcomes.retention.mean(axis=0, dtype=np.float64).tolist(),
+        cumulative=summarize_rows(cumulative, percentiles=percentiles, risk_levels=risk_levels),
+    )
+
+
+def run_horizon(
+    config: PricingSimulationConfig,
+    horizon: HorizonAssumptions,
+    percentiles: List[int] = [5, 50, 95],
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+) -> HorizonResult:
+    outcomes = simulate_horizon(config, horizon)
+    return HorizonResult(
+        outcomes=outcomes,
+        summary=summarize_horizon(outcomes, percentiles, risk_levels),
+    )
+
+
+def _period_shocks(config: PricingSimulationConfig, horizon: HorizonAssumptions):
+    """
+    (runs x periods) standard normal market and cost shocks, or None
+    when unused. Each comes from its own stream, so enabling one leaves
+    the other's draws unchanged; with a shock_correlation the pair is
+    correlated as one (2 x runs * periods) block through its Cholesky factor.
+    """
+    shape = (config.num_runs, horizon.periods)
+    market = _shocks(config, _DEMAND_SHOCK_STREAM, shape) if horizon.demand_volatility > 0 else None
+    cost = (
+        _shocks(config, _COST_SHOCK_STREAM, shape)
+        if horizon.cost_volatility > 0 and horizon.periods > 1
+        else None
+    )
+
+    if market is not None and cost is not None and horizon.shock_correlation != 0:
+        rho = horizon.shock_correlation
+        factor = correlation_factor(((1.0, rho), (rho, 1.0)))
+        market, cost = factor @ np.stack([market, cost]).reshape(2, -1)
+        market, cost = market.reshape(shape), cost.reshape(shape)
+
+    # Drawn in float64 and rounded, like the per-run noise
+    return tuple(
+        None if z is None else z.astype(config.dtype, copy=False)
+        for z in (market, cost)
+    )
+
+
+def _shocks(config: PricingSimulationConfig, stream, shape) -> np.ndarray:
+    seed = seed_sequence(config.random_seed, spawn_key=stream)
+    return np.random.default_rng(seed).standard_normal(shape)
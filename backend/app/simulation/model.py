@@ -1,7 +1,10 @@
 from dataclasses import dataclass
+from typing import Iterator, Sequence, Tuple
 from .config import PricingSimulationConfig
 import math
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class PricingOutcome:
@@ -10,6 +13,83 @@ class PricingOutcome:
     total_cost: float
     profit: float
 
+
+# OutcomeBatch columns, in storage order
+OUTCOME_COLUMNS = ("demand", "revenue", "total_cost", "profit")
+
+
+@dataclass(frozen=True, eq=False)
+class OutcomeBatch:
+    """
+    Columnar (struct-of-arrays) outcomes of many runs.
+    One contiguous float64 (or float32, see config.dtype) array per
+    PricingOutcome field. Rows are materialized as PricingOutcome only
+    on access.
+    """
+    demand: np.ndarray
+    revenue: np.ndarray
+    total_cost: np.ndarray
+    profit: np.ndarray
+
+    def __post_init__(self):
+        n = None
+        for name in OUTCOME_COLUMNS:
+            column = getattr(self, name)
+            dtype = np.float32 if getattr(column, "dtype", None) == np.float32 else np.float64
+            # np.require keeps subclasses such as np.memmap (no copy)
+            column = np.require(column, dtype=dtype, requirements="C")
+            if column.ndim != 1:
+                raise ValueError(f"{name} must be one-dimensional")
+            if n is not None and len(column) != n:
+                raise ValueError("Outcome columns must have equal length")
+            n = len(column)
+            object.__setattr__(self, name, column)
+
+    @staticmethod
+    def from_outcomes(outcomes: Sequence[PricingOutcome]) -> "OutcomeBatch":
+        return OutcomeBatch(
+            demand=np.array([o.demand for o in outcomes], dtype=np.float64),
+            revenue=np.array([o.revenue for o in outcomes], dtype=np.float64),
+            total_cost=np.array([o.total_cost for o in outcomes], dtype=np.float64),
+            profit=np.array([o.profit for o in outcomes], dtype=np.float64),
+        )
+
+    @staticmethod
+    def concatenate(batches: Sequence["OutcomeBatch"]) -> "OutcomeBatch":
+        if len(batches) == 1:
+            return batches[0]
+        return OutcomeBatch(
+            demand=np.concatenate([b.demand for b in batches]),
+            revenue=np.concatenate([b.revenue for b in batches]),
+            total_cost=np.concatenate([b.total_cost for b in batches]),
+            profit=np.concatenate([b.profit for b in batches]),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.demand.nbytes
+            + self.revenue.nbytes
+            + self.total_cost.nbytes
+            + self.profit.nbytes
+        )
+
+    def __len__(self) -> int:
+        return len(self.profit)
+
+    def __getitem__(self, index: int) -> PricingOutcome:
+        return PricingOutcome(
+            demand=float(self.demand[index]),
+            revenue=float(self.revenue[index]),
+            total_cost=float(self.total_cost[index]),
+            profit=float(self.profit[index]),
+        )
+
+    def __iter__(self) -> Iterator[PricingOutcome]:
+        for i in range(len(self)):
+            yield self[i]
+
+
 @dataclass(frozen=True)
 class PricingDecision:
     price: float
@@ -80,6 +160,90 @@ def evaluate_pricing_causal_model(
         profit=profit,
     )
 
+def evaluate_pricing_causal_model_batch(
+    price,
+    base_demand,
+    price_elasticity,
+    unit_cost,
+    fixed_cost,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized counterpart of evaluate_pricing_causal_model.
+    Inputs are scalars or arrays that broadcast against each other;
+    returns (demand, revenue, total_cost, profit) arrays.
+    Same validation as the scalar model, applied to every element.
+    All arithmetic is done in `dtype` (float64 or float32).
+
+    Composed of the stage functions below, which pipeline.py also
+    evaluates one at a time.
+    """
+    demand = demand_batch(price, base_demand, price_elasticity, dtype)
+    revenue = revenue_batch(price, demand)
+    total_cost = total_cost_batch(demand, unit_cost, fixed_cost)
+    profit = profit_batch(revenue, total_cost)
+
+    return demand, revenue, total_cost, profit
+
+def demand_batch(
+    price,
+    base_demand,
+    price_elasticity,
+    dtype=np.float64,
+) -> np.ndarray:
+    price = np.asarray(price, dtype=dtype)
+    base_demand = np.asarray(base_demand, dtype=dtype)
+    price_elasticity = np.asarray(price_elasticity, dtype=dtype)
+
+    if np.any(price <= 0):
+        raise ValueError("Price must be > 0")
+
+    if np.any(base_demand < 0):
+        raise ValueError("Base demand must be >= 0")
+
+    if np.any(price_elasticity <= 0):
+        raise ValueError("Price elasticity must be > 0")
+
+    # 1. Demand
+    demand = base_demand * np.exp(-price_elasticity * price)
+
+    if not np.all(np.isfinite(demand)):
+        raise ValueError("Non-finite demand computed")
+    return np.maximum(0.0, demand)
+
+def revenue_batch(price, demand: np.ndarray) -> np.ndarray:
+    # 2. Revenue, in the dtype of demand
+    revenue = np.asarray(price, dtype=demand.dtype) * demand
+
+    if not np.all(np.isfinite(revenue)):
+        raise ValueError("Non-finite revenue computed")
+    return revenue
+
+def total_cost_batch(demand: np.ndarray, unit_cost, fixed_cost) -> np.ndarray:
+    unit_cost = np.asarray(unit_cost, dtype=demand.dtype)
+    fixed_cost = np.asarray(fixed_cost, dtype=demand.dtype)
+
+    if np.any(unit_cost < 0):
+        raise ValueError("Unit cost must be >= 0")
+
+    if np.any(fixed_cost < 0):
+        raise ValueError("Fixed cost must be >= 0")
+
+    # 3. Cost
+    total_cost = fixed_cost + unit_cost * demand
+
+    if not np.all(np.isfinite(total_cost)):
+        raise ValueError("Non-finite total cost computed")
+    return total_cost
+
+def profit_batch(revenue: np.ndarray, total_cost: np.ndarray) -> np.ndarray:
+    # 4. Profit
+    profit = revenue - total_cost
+
+    if not np.all(np.isfinite(profit)):
+        raise ValueError("Non-finite profit computed")
+    return profit
+
 def evaluate_from_config(
     config: PricingSimulationConfig,
 ) -> PricingOutcome:
@@ -1,19 +1,264 @@
 import random
-from typing import List
+from typing import Literal, Tuple
 
-from .config import PricingSimulationConfig
+import numpy as np
+
+from .config import SEED_BITS, PricingSimulationConfig
 from .model import (
     PricingDecision,
     PricingParameters,
-    PricingOutcome,
+    OutcomeBatch,
     evaluate_pricing_causal_model,
+    evaluate_pricing_causal_model_batch,
+)
+from .sampler import (
+    ArraySampler,
+    DistributionSampler,
+    MultivariateSampler,
+    enforce_valid_sample,
+    enforce_valid_samples,
+)
+
+Engine = Literal["python", "numpy"]
+
+# Runs per independent numpy noise stream. Fixed, never derived from the
+# number of workers, so a seed yields the same draws however runs are split.
+STREAM_CHUNK_RUNS = 1 << 16
+
+# The config fields sample_noise depends on; price, assumptions and
+# costs never affect the draws
+NOISE_FIELDS = (
+    "engine",
+    "sampling",
+    "dtype",
+    "num_runs",
+    "random_seed",
+    "demand_noise_distribution",
+    "demand_noise_sigma",
+    "elasticity_noise_distribution",
+    "elasticity_noise_sigma",
+    "noise_correlation",
 )
-from .sampler import DistributionSampler, enforce_valid_sample
 
 
 def run_monte_carlo(
     config: PricingSimulationConfig,
-) -> List[PricingOutcome]:
+) -> OutcomeBatch:
+    """
+    Runs the Monte Carlo simulation with the engine selected in config.
+
+    - "python": seeded random.Random, one scalar evaluation per run.
+      Kept for backward reproducibility of existing seeds.
+    - "numpy": all noise drawn as arrays from numpy.random.Generator,
+      the model evaluated as whole-array expressions. Supports the
+      variance-reduction sampling methods (config.sampling).
+    """
+    if config.engine == "python":
+        _require_python_compatible(config)
+        return _run_python(config)
+
+    if config.engine == "numpy":
+        return evaluate_noise(config, *sample_noise(config))
+
+    raise ValueError(f"Unsupported engine: {config.engine}")
+
+
+def num_chunks(config: PricingSimulationConfig) -> int:
+    return -(-config.num_runs // STREAM_CHUNK_RUNS)
+
+
+def chunk_runs(config: PricingSimulationConfig, index: int) -> int:
+    start = index * STREAM_CHUNK_RUNS
+    return max(0, min(STREAM_CHUNK_RUNS, config.num_runs - start))
+
+
+def run_monte_carlo_chunk(
+    config: PricingSimulationConfig,
+    index: int,
+) -> OutcomeBatch:
+    """
+    Runs chunk `index` of a numpy-engine simulation: runs
+    [index * STREAM_CHUNK_RUNS, ...) of run_monte_carlo(config).
+    Chunks are independent and can be computed in any process.
+    """
+    return evaluate_noise(config, *sample_noise_chunk(config, index))
+
+
+def seed_sequence(random_seed: int, spawn_key: Tuple[int, ...] = ()) -> np.random.SeedSequence:
+    """
+    The numpy SeedSequence of a random_seed.
+
+    Seeds enter as their 64-bit two's complement, which leaves
+    non-negative seeds unchanged and keeps -s and s apart (SeedSequence
+    itself only takes non-negative entropy).
+    """
+    if not -(1 << (SEED_BITS - 1)) <= random_seed < 1 << (SEED_BITS - 1):
+        raise ValueError("random_seed must fit a signed 64-bit integer")
+    return np.random.SeedSequence(random_seed & ((1 << SEED_BITS) - 1), spawn_key=spawn_key)
+
+
+def sample_noise_chunk(
+    config: PricingSimulationConfig,
+    index: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the validated noise of one chunk (numpy engine only).
+
+    Chunk i uses child i of seed_sequence(random_seed), i.e. the stream
+    seed_sequence(random_seed).spawn(n)[i] for any n > i. Stratified
+    methods (lhs, sobol) stratify each chunk on its own.
+
+    With a noise_correlation, both noises come from one correlated
+    block (noise_sampler); otherwise each is drawn on its own.
+
+    Draws are always made in float64; with dtype="float32" they are
+    rounded afterwards, so both precisions simulate the same scenarios.
+    """
+    if config.engine != "numpy":
+        raise ValueError("Chunked sampling requires the numpy engine")
+
+    size = chunk_runs(config, index)
+    if size == 0:
+        raise ValueError(f"Chunk {index} out of range")
+
+    seed = seed_sequence(config.random_seed, spawn_key=(index,))
+    sampler = ArraySampler(np.random.default_rng(seed))
+
+    if config.noise_correlation != 0:
+        # "control_variate" uses plain draws
+        method = "iid" if config.sampling == "control_variate" else config.sampling
+        demand_noise, elasticity_noise = noise_sampler(config).sample(sampler, method, size)
+        return _validated(config, demand_noise, elasticity_noise)
+
+    if config.sampling in ("antithetic", "lhs", "sobol"):
+        z = sampler.standard_normals(config.sampling, 2, size)
+        demand_noise = sampler.transform(config.demand_noise_distribution, config.demand_noise_sigma, z[0])
+        elasticity_noise = sampler.transform(
+            config.elasticity_noise_distribution, config.elasticity_noise_sigma, z[1]
+        )
+        return _validated(config, demand_noise, elasticity_noise)
+
+    # "iid" and "control_variate" use plain draws
+    demand_noise = sampler.sample(
+        config.demand_noise_distribution,
+        config.demand_noise_sigma,
+        size,
+    )
+    elasticity_noise = sampler.sample(
+        config.elasticity_noise_distribution,
+        config.elasticity_noise_sigma,
+        size,
+    )
+
+    return _validated(config, demand_noise, elasticity_noise)
+
+
+def noise_sampler(config: PricingSimulationConfig) -> MultivariateSampler:
+    """
+    Joint sampler of (demand_noise, elasticity_noise) for config.
+    """
+    rho = config.noise_correlation
+    return MultivariateSampler(
+        (config.demand_noise_distribution, config.elasticity_noise_distribution),
+        (config.demand_noise_sigma, config.elasticity_noise_sigma),
+        ((1.0, rho), (rho, 1.0)),
+    )
+
+
+def _validated(
+    config: PricingSimulationConfig,
+    demand_noise: np.ndarray,
+    elasticity_noise: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Enforce validity, then round to the simulation dtype
+    return (
+        enforce_valid_samples(demand_noise).astype(config.dtype, copy=False),
+        enforce_valid_samples(elasticity_noise).astype(config.dtype, copy=False),
+    )
+
+
+def sample_noise(
+    config: PricingSimulationConfig,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the validated (demand_noise, elasticity_noise) arrays for all runs.
+
+    The draws are exactly the ones run_monte_carlo uses for the same config,
+    so any vectorized evaluation over them (price grids, comparisons,
+    sensitivities) reproduces the per-config simulation under common
+    random numbers.
+    """
+    if config.engine == "python":
+        _require_python_compatible(config)
+        rng = random.Random(config.random_seed)
+        sampler = DistributionSampler(rng)
+
+        demand_noise = np.empty(config.num_runs)
+        elasticity_noise = np.empty(config.num_runs)
+
+        # Same interleaved draw order as the scalar loop
+        for i in range(config.num_runs):
+            demand_noise[i] = sampler.sample(
+                config.demand_noise_distribution,
+                config.demand_noise_sigma,
+            )
+            elasticity_noise[i] = sampler.sample(
+                config.elasticity_noise_distribution,
+                config.elasticity_noise_sigma,
+            )
+
+        # Enforce validity
+        return enforce_valid_samples(demand_noise), enforce_valid_samples(elasticity_noise)
+
+    if config.engine == "numpy":
+        chunks = [sample_noise_chunk(config, i) for i in range(num_chunks(config))]
+        if len(chunks) == 1:
+            return chunks[0]
+        return (
+            np.concatenate([d for d, _ in chunks]),
+            np.concatenate([e for _, e in chunks]),
+        )
+
+    raise ValueError(f"Unsupported engine: {config.engine}")
+
+
+def evaluate_noise(
+    config: PricingSimulationConfig,
+    demand_noise: np.ndarray,
+    elasticity_noise: np.ndarray,
+) -> OutcomeBatch:
+    """
+    Evaluates the model for config over already sampled noise arrays.
+    """
+    demand, revenue, total_cost, profit = evaluate_pricing_causal_model_batch(
+        price=config.price,
+        base_demand=config.base_demand * demand_noise,
+        price_elasticity=config.price_elasticity * elasticity_noise,
+        unit_cost=config.unit_cost,
+        fixed_cost=config.fixed_cost,
+        dtype=config.dtype,
+    )
+
+    return OutcomeBatch(
+        demand=demand,
+        revenue=revenue,
+        total_cost=total_cost,
+        profit=profit,
+    )
+
+
+def _require_python_compatible(config: PricingSimulationConfig) -> None:
+    if config.sampling != "iid":
+        raise ValueError(f"Sampling method {config.sampling!r} requires the numpy engine")
+    if config.dtype != "float64":
+        raise ValueError(f"dtype {config.dtype!r} requires the numpy engine")
+    if config.noise_correlation != 0:
+        raise ValueError("Correlated noise requires the numpy engine")
+
+
+def _run_python(
+    config: PricingSimulationConfig,
+) -> OutcomeBatch:
     # One RNG for full reproducibility
     rng = random.Random(config.random_seed)
     sampler = DistributionSampler(rng)
@@ -21,9 +266,12 @@ def run_monte_carlo(
     # Decision is fixed across runs
     decision = PricingDecision(price=config.price)
 
-    outcomes: List[PricingOutcome] = []
+    demand = np.empty(config.num_runs)
+    revenue = np.empty(config.num_runs)
+    total_cost = np.empty(config.num_runs)
+    profit = np.empty(config.num_runs)
 
-    for _ in range(config.num_runs):
+    for i in range(config.num_runs):
         # Sample uncertainty
         demand_noise = sampler.sample(
             config.demand_noise_distribution,
@@ -47,6 +295,14 @@ def run_monte_carlo(
         )
 
         outcome = evaluate_pricing_causal_model(decision, params)
-        outcomes.append(outcome)
+        demand[i] = outcome.demand
+        revenue[i] = outcome.revenue
+        total_cost[i] = outcome.total_cost
+        profit[i] = outcome.profit
 
-    return outcomes
+    return OutcomeBatch(
+        demand=demand,
+        revenue=revenue,
+        total_cost=total_cost,
+        profit=profit,
+    )
@@ -0,0 +1,122 @@
+import numpy as np
+
+# Joe-Kuo (new-joe-kuo-6.21201) primitive polynomials and initial
+# direction numbers (s, a, m_1..m_s) for dimensions 2..8; dimension 1
+# is the van der Corput sequence (all m_k = 1).
+_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+)
+
+MAX_SOBOL_DIMS = len(_JOE_KUO) + 1
+
+BITS = 32
+
+
+def _direction_numbers(dim: int) -> np.ndarray:
+    """
+    The BITS direction numbers v_k = m_k * 2^(BITS - k) of one dimension.
+    """
+    if dim == 0:
+        m = [1] * BITS
+    else:
+        s, a, m_init = _JOE_KUO[dim - 1]
+        m = list(m_init)
+        for k in range(s, BITS):
+            value = m[k - s] ^ (m[k - s] << s)
+            for j in range(1, s):
+                if (a >> (s - 1 - j)) & 1:
+                    value ^= m[k - j] << j
+            m.append(value)
+
+    return np.array([m[k] << (BITS - 1 - k) for k in range(BITS)], dtype=np.uint64)
+
+
+_DIRECTIONS = np.stack([_direction_numbers(d) for d in range(MAX_SOBOL_DIMS)])
+
+
+def sobol_points(n: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    First n points of a scrambled Sobol sequence, shape (dims, n), in (0, 1).
+
+    Each dimension is randomized by a linear matrix scramble (a random
+    lower-triangular binary matrix applied to its generator matrix)
+    followed by a random digital shift, which keeps the net structure
+    while making every point uniformly distributed.
+    """
+    if not 1 <= dims <= MAX_SOBOL_DIMS:
+        raise ValueError(f"Sobol sampling supports 1..{MAX_SOBOL_DIMS} dimensions")
+    if n >= 1 << BITS:
+        raise ValueError("Too many Sobol points")
+
+    # Row r of L (as an integer whose bit BITS-1 is the leading digit):
+    # unit diagonal, random bits in the more significant positions
+    diagonal = np.uint64(1) << np.arange(BITS - 1, -1, -1, dtype=np.uint64)
+    above = rng.integers(0, 1 << BITS, size=(dims, BITS), dtype=np.uint64)
+    above &= ~(diagonal - np.uint64(1)) & ~diagonal & np.uint64((1 << BITS) - 1)
+    rows = above | diagonal
+
+    # Scrambled direction numbers: bit r of L v is parity(row_r & v)
+    v = _DIRECTIONS[:dims]
+    parity = np.bitwise_count(rows[:, :, None] & v[:, None, :]) & 1
+    scrambled = (parity.astype(np.uint64) * diagonal[None, :, None]).sum(axis=1, dtype=np.uint64)
+
+    shift = rng.integers(0, 1 << BITS, size=dims, dtype=np.uint64)
+
+    index = np.arange(n, dtype=np.uint64)
+    points = np.repeat(shift[:, None], n, axis=1)
+    for k in range(max(1, int(n - 1).bit_length())):
+        bit = (index >> np.uint64(k)) & np.uint64(1)
+        points ^= bit[None, :] * scrambled[:, k:k + 1]
+
+    return (points.astype(np.float64) + 0.5) / float(1 << BITS)
+
+
+# Acklam's rational approximation of the standard normal quantile
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+_P_LOW = 0.02425
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    """
+    Standard normal quantile function, elementwise on (0, 1).
+    Relative error below 1.2e-9 (Acklam).
+    """
+    u = np.asarray(u, dtype=np.float64)
+    if np.any((u <= 0) | (u >= 1)):
+        raise ValueError("Quantile levels must be in (0, 1)")
+
+    z = np.empty_like(u)
+
+    low = u < _P_LOW
+    high = u > 1.0 - _P_LOW
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    z[mid] = (
+        (((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q
+        / (((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1.0)
+    )
+
+    for mask, sign, p in ((low, 1.0, u[low]), (high, -1.0, 1.0 - u[high])):
+        q = np.sqrt(-2.0 * np.log(p))
+        z[mask] = sign * (
+            (((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5])
+            / ((((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0)
+        )
+
+    return z
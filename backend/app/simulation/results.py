@@ -1,32 +1,364 @@
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
 
 from .config import PricingSimulationConfig
-from .model import PricingOutcome
-from .monte_carlo import run_monte_carlo
-from .aggregate import aggregate_outcomes, SimulationSummary
+from .control_variate import ProfitControlVariate, adjust_summaries
+from .model import OUTCOME_COLUMNS, OutcomeBatch
+from .monte_carlo import (
+    STREAM_CHUNK_RUNS,
+    evaluate_noise,
+    num_chunks,
+    run_monte_carlo,
+    sample_noise_chunk,
+)
+from .aggregate import (
+    DEFAULT_RISK_LEVELS,
+    StreamingAggregator,
+    aggregate_outcomes,
+    SimulationSummary,
+    percentile_rank,
+)
+from .pipeline import SimulationPipeline
+from .sketch import KLLSketch
+
+Shard = Tuple[OutcomeBatch, StreamingAggregator, Optional[ProfitControlVariate]]
 
 
 @dataclass(frozen=True)
 class SimulationResult:
-    outcomes: List[PricingOutcome]
+    # None when outcomes were dropped (e.g. summary-only caching)
+    outcomes: Optional[OutcomeBatch]
     summary: SimulationSummary
+    # Profit sketch of a constant-memory run (see run_simulation)
+    sketch: Optional[KLLSketch] = None
+
+
+@dataclass(frozen=True)
+class SimulationProgress:
+    runs_completed: int
+    total_runs: int
+
+    # over the runs completed so far
+    mean_profit: float
+    std_profit: float
+    prob_loss: float
+    # approximate (KLL sketch); the final summary is exact
+    profit_percentiles: Dict[int, float]
 
 
 def run_simulation(
     config: PricingSimulationConfig,
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    workers: Optional[int] = None,
+    constant_memory: bool = False,
+    spill_dir: Optional[str] = None,
+    pipeline: Optional[SimulationPipeline] = None,
 ) -> SimulationResult:
     """
     High-level orchestration for a single pricing simulation.
-    Runs Monte Carlo and aggregates results.
+    Runs Monte Carlo and aggregates results, including tail risk
+    (VaR/CVaR) at the given confidence levels.
+
+    With the numpy engine, runs are processed as independent seeded
+    chunks (see monte_carlo.STREAM_CHUNK_RUNS) whose partial summaries
+    are merged in chunk order. `workers` > 1 computes the chunks in a
+    ProcessPoolExecutor; results are bit-identical for any worker count.
+    With sampling="control_variate", mean_profit is the control-variate
+    estimate (see control_variate.ProfitControlVariate).
+
+    constant_memory=True folds each chunk into a sketch-mode aggregator
+    and drops it, so peak memory does not grow with num_runs. Moments,
+    loss probability, min and max are exact; percentiles, VaR and CVaR
+    come from a KLLSketch (returned as result.sketch) with its rank
+    error. Outcomes are not kept unless spill_dir is given: each chunk
+    is then written into <spill_dir>/<column>.npy, and result.outcomes
+    memory-maps those files read-only.
+
+    With a pipeline, chunk outcomes come from its memoized stages (see
+    pipeline.SimulationPipeline), so a config differing from a recent
+    one only downstream (e.g. in costs) recomputes only those stages.
+    Results are unchanged; numpy engine, in-process only.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    if pipeline is not None:
+        _check_pipeline(config, workers, constant_memory)
+
+    if constant_memory:
+        return _run_constant_memory(config, risk_levels, workers, spill_dir)
+    if spill_dir is not None:
+        raise ValueError("spill_dir requires constant_memory=True")
+
+    if config.engine != "numpy":
+        if workers is not None and workers > 1:
+            raise ValueError("Parallel execution requires the numpy engine")
+        return _run_serial(config, risk_levels)
+
+    chunks = range(num_chunks(config))
+    tasks = [(config, i, tuple(risk_levels)) for i in chunks]
+
+    if workers is None or workers == 1:
+        partials = [_run_shard(task, pipeline) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_shard, tasks))
+
+    aggregator = StreamingAggregator(mode="exact", risk_levels=risk_levels)
+    for _, partial, _ in partials:
+        aggregator.merge(partial)
+
+    return _combine_shards(config, partials, aggregator)
+
+
+def iter_simulation(
+    config: PricingSimulationConfig,
+    risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    percentiles: Sequence[int] = (5, 50, 95),
+    pipeline: Optional[SimulationPipeline] = None,
+    constant_memory: bool = False,
+) -> Iterator[Union[SimulationProgress, SimulationResult]]:
+    """
+    run_simulation one chunk at a time.
+
+    Yields a SimulationProgress after every chunk, then the
+    SimulationResult, identical to run_simulation(config, risk_levels,
+    constant_memory=constant_memory). Closing the generator stops the
+    computation after the current chunk. The python engine has no
+    chunks and yields only the result.
+
+    constant_memory=True folds each chunk into the sketch-mode summary
+    and drops it, so memory does not grow with num_runs; the result has
+    no outcomes, and its sketch.
     """
+    if pipeline is not None:
+        _check_pipeline(config, None, constant_memory)
+
+    if constant_memory:
+        yield from _iter_constant_memory(config, risk_levels, percentiles)
+        return
+
+    if config.engine != "numpy":
+        yield _run_serial(config, risk_levels)
+        return
+
+    aggregator = StreamingAggregator(mode="exact", risk_levels=risk_levels)
+    sketch = KLLSketch()
+    shards: List[Shard] = []
+
+    for i in range(num_chunks(config)):
+        shard = _run_shard((config, i, tuple(risk_levels)), pipeline)
+        shards.append(shard)
+
+        outcomes, partial, _ = shard
+        aggregator.merge(partial)
+        sketch.update(outcomes.profit)
+        yield _progress(config, aggregator, sketch, percentiles)
+
+    yield _combine_shards(config, shards, aggregator)
+
+
+def _iter_constant_memory(
+    config: PricingSimulationConfig,
+    risk_levels: Sequence[float],
+    percentiles: Sequence[int],
+) -> Iterator[Union[SimulationProgress, SimulationResult]]:
+    if config.engine != "numpy":
+        raise ValueError("Constant-memory execution requires the numpy engine")
+
+    aggregator = StreamingAggregator(mode="sketch", risk_levels=risk_levels)
+    control = ProfitControlVariate(config) if config.sampling == "control_variate" else None
+
+    for i in range(num_chunks(config)):
+        partial, partial_control = _run_constant_shard((config, i, tuple(risk_levels), None))
+        aggregator.merge(partial)
+        if control is not None:
+            control.merge(partial_control)
+        yield _progress(config, aggregator, aggregator.sketch, percentiles)
+
+    yield _constant_memory_result(aggregator, control, None)
+
+
+def _progress(
+    config: PricingSimulationConfig,
+    aggregator: StreamingAggregator,
+    sketch: KLLSketch,
+    percentiles: Sequence[int],
+) -> SimulationProgress:
+    n = aggregator.count
+    values = sketch.quantiles([percentile_rank(p, n) for p in percentiles])
+    return SimulationProgress(
+        runs_completed=n,
+        total_runs=config.num_runs,
+        mean_profit=aggregator.mean,
+        std_profit=aggregator.variance ** 0.5,
+        prob_loss=aggregator.prob_loss,
+        profit_percentiles=dict(zip(percentiles, values)),
+    )
+
+
+def _combine_shards(
+    config: PricingSimulationConfig,
+    shards: List[Shard],
+    aggregator: StreamingAggregator,
+) -> SimulationResult:
+    # aggregator has merged every shard's partial, in chunk order
+    outcomes = OutcomeBatch.concatenate([batch for batch, _, _ in shards])
+
+    if len(outcomes) == 0:
+        raise RuntimeError("Simulation produced no outcomes")
+
+    summary = aggregator.summary()
+
+    if config.sampling == "control_variate":
+        control = ProfitControlVariate(config)
+        for _, _, partial_control in shards:
+            control.merge(partial_control)
+        [summary] = adjust_summaries([summary], control)
+
+    return SimulationResult(
+        outcomes=outcomes,
+        summary=summary,
+    )
+
+
+def _run_constant_memory(
+    config: PricingSimulationConfig,
+    risk_levels: Sequence[float],
+    workers: Optional[int],
+    spill_dir: Optional[str],
+) -> SimulationResult:
+    if config.engine != "numpy":
+        raise ValueError("Constant-memory execution requires the numpy engine")
+
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+        # Preallocated so shards in any process write their own slice
+        for column in OUTCOME_COLUMNS:
+            np.lib.format.open_memmap(
+                os.path.join(spill_dir, f"{column}.npy"),
+                mode="w+",
+                dtype=np.float64,
+                shape=(config.num_runs,),
+            ).flush()
+
+    tasks = ((config, i, tuple(risk_levels), spill_dir) for i in range(num_chunks(config)))
+
+    aggregator = StreamingAggregator(mode="sketch", risk_levels=risk_levels)
+    control = ProfitControlVariate(config) if config.sampling == "control_variate" else None
+
+    def fold(partials):
+        # Partials arrive in chunk order and are merged as they come
+        for partial, partial_control in partials:
+            aggregator.merge(partial)
+            if control is not None:
+                control.merge(partial_control)
+
+    if workers is None or workers == 1:
+        fold(map(_run_constant_shard, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fold(pool.map(_run_constant_shard, tasks))
+
+    outcomes = None
+    if spill_dir is not None:
+        outcomes = OutcomeBatch(**{
+            column: np.load(os.path.join(spill_dir, f"{column}.npy"), mmap_mode="r")
+            for column in OUTCOME_COLUMNS
+        })
+
+    return _constant_memory_result(aggregator, control, outcomes)
+
+
+def _constant_memory_result(
+    aggregator: StreamingAggregator,
+    control: Optional[ProfitControlVariate],
+    outcomes: Optional[OutcomeBatch],
+) -> SimulationResult:
+    # aggregator (sketch mode) and control have merged every chunk, in order
+    summary = aggregator.summary()
+    if control is not None:
+        [summary] = adjust_summaries([summary], control)
+
+    return SimulationResult(outcomes=outcomes, summary=summary, sketch=aggregator.sketch)
+
+
+def _run_constant_shard(
+    task: Tuple[PricingSimulationConfig, int, Tuple[float, ...], Optional[str]],
+) -> Tuple[StreamingAggregator, Optional[ProfitControlVariate]]:
+    # Like _run_shard, but only the sketch-mode summary state leaves the shard
+    config, index, risk_levels, spill_dir = task
+
+    demand_noise, elasticity_noise = sample_noise_chunk(config, index)
+    outcomes = evaluate_noise(config, demand_noise, elasticity_noise)
+    partial = StreamingAggregator(mode="sketch", seed=index, risk_levels=risk_levels)
+    partial.update(outcomes)
+
+    if spill_dir is not None:
+        start = index * STREAM_CHUNK_RUNS
+        for column in OUTCOME_COLUMNS:
+            target = np.load(os.path.join(spill_dir, f"{column}.npy"), mmap_mode="r+")
+            target[start:start + len(outcomes)] = getattr(outcomes, column)
+            target.flush()
+            del target
+
+    control = None
+    if config.sampling == "control_variate":
+        control = ProfitControlVariate(config).update(outcomes.profit, demand_noise, elasticity_noise)
+
+    return partial, control
+
+
+def _run_serial(
+    config: PricingSimulationConfig,
+    risk_levels: Sequence[float],
+) -> SimulationResult:
     outcomes = run_monte_carlo(config)
 
-    if not outcomes:
+    if len(outcomes) == 0:
         raise RuntimeError("Simulation produced no outcomes")
 
-    summary = aggregate_outcomes(outcomes)
+    summary = aggregate_outcomes(outcomes, risk_levels=risk_levels)
     return SimulationResult(
         outcomes=outcomes,
         summary=summary,
-    )
\ No newline at end of file
+    )
+
+
+def _check_pipeline(
+    config: PricingSimulationConfig,
+    workers: Optional[int],
+    constant_memory: bool,
+) -> None:
+    if config.engine != "numpy":
+        raise ValueError("A pipeline requires the numpy engine")
+    if workers is not None and workers > 1:
+        raise ValueError("A pipeline requires in-process execution (workers=1)")
+    if constant_memory:
+        raise ValueError("A pipeline cannot be used in constant-memory mode")
+
+
+def _run_shard(
+    task: Tuple[PricingSimulationConfig, int, Tuple[float, ...]],
+    pipeline: Optional[SimulationPipeline] = None,
+) -> Shard:
+    # Module-level so it can be pickled into worker processes
+    config, index, risk_levels = task
+
+    if pipeline is not None:
+        outcomes, (demand_noise, elasticity_noise) = pipeline.evaluate_part(config, index)
+    else:
+        demand_noise, elasticity_noise = sample_noise_chunk(config, index)
+        outcomes = evaluate_noise(config, demand_noise, elasticity_noise)
+    partial = StreamingAggregator(mode="exact", risk_levels=risk_levels)
+    partial.update(outcomes)
+
+    control = None
+    if config.sampling == "control_variate":
+        control = ProfitControlVariate(config).update(outcomes.profit, demand_noise, elasticity_noise)
+
+    return outcomes, partial, control
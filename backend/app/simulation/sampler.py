@@ -1,5 +1,11 @@
+import functools
 import math
 import random
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .qmc import norm_ppf, sobol_points
 
 
 class DistributionSampler:
@@ -15,11 +21,165 @@ class DistributionSampler:
             return self._rng.lognormvariate(0.0, sigma)
 
         raise ValueError(f"Unsupported distribution: {distribution}")
-    
-        
+
+
+class ArraySampler:
+    """
+    Batched counterpart of DistributionSampler.
+    Draws whole arrays of noise from a numpy Generator.
+    """
+
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def sample(self, distribution: str, sigma: float, size: int) -> np.ndarray:
+        if distribution == "normal":
+            return self._rng.normal(1.0, sigma, size)
+
+        if distribution == "lognormal":
+            # mean = 0 ensures median = 1.0
+            return self._rng.lognormal(0.0, sigma, size)
+
+        raise ValueError(f"Unsupported distribution: {distribution}")
+
+    def standard_normals(self, method: str, dims: int, size: int) -> np.ndarray:
+        """
+        (dims, size) standard normal draws for a sampling method:
+
+        - "iid": plain independent draws
+        - "antithetic": pairs (z, -z), interleaved so any prefix is balanced
+        - "lhs": Latin hypercube, one draw per 1/size stratum in each dimension
+        - "sobol": scrambled Sobol points mapped through the normal quantile
+        """
+        if method == "iid":
+            return self._rng.standard_normal((dims, size))
+
+        if method == "antithetic":
+            half = self._rng.standard_normal((dims, (size + 1) // 2))
+            z = np.empty((dims, size))
+            z[:, 0::2] = half
+            z[:, 1::2] = -half[:, : size // 2]
+            return z
+
+        if method == "lhs":
+            strata = np.stack([self._rng.permutation(size) for _ in range(dims)])
+            return norm_ppf((strata + self._rng.random((dims, size))) / size)
+
+        if method == "sobol":
+            return norm_ppf(sobol_points(size, dims, self._rng))
+
+        raise ValueError(f"Unsupported sampling method: {method}")
+
+    @staticmethod
+    def transform(distribution: str, sigma: float, z: np.ndarray) -> np.ndarray:
+        """
+        Maps standard normal draws to the noise distribution used by sample().
+        """
+        if distribution == "normal":
+            return 1.0 + sigma * z
+
+        if distribution == "lognormal":
+            return np.exp(sigma * z)
+
+        raise ValueError(f"Unsupported distribution: {distribution}")
+
+
+Correlation = Tuple[Tuple[float, ...], ...]
+
+
+@functools.lru_cache(maxsize=256)
+def correlation_factor(correlation: Correlation) -> np.ndarray:
+    """
+    Lower Cholesky factor L (L @ L.T == correlation) of a correlation
+    matrix, after checking it is square, symmetric, unit-diagonal and
+    positive definite. Cached per matrix, so every config (and every
+    chunk) sharing a correlation factorizes it once. Read-only.
+    """
+    matrix = np.array(correlation, dtype=np.float64)
+
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] or len(matrix) == 0:
+        raise ValueError("Correlation matrix must be square")
+
+    if not np.all(np.isfinite(matrix)):
+        raise ValueError("Correlation matrix must be finite")
+
+    if not np.array_equal(matrix, matrix.T):
+        raise ValueError("Correlation matrix must be symmetric")
+
+    if not np.all(np.diag(matrix) == 1.0):
+        raise ValueError("Correlation matrix must have a unit diagonal")
+
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix must be positive definite")
+
+    factor.setflags(write=False)
+    return factor
+
+
+class MultivariateSampler:
+    """
+    Correlated noise for several factors through a Gaussian copula.
+
+    Each factor has a marginal (distribution, sigma) as in ArraySampler,
+    and their latent standard normals have the given correlation. Draws
+    are whole (factors x size) blocks: independent normals Z from any
+    sampling method, one product L @ Z with the cached Cholesky factor,
+    then each row mapped to its marginal. For lognormal marginals the
+    correlation is that of log-noise, not of the noise itself.
+    """
+
+    def __init__(
+        self,
+        distributions: Sequence[str],
+        sigmas: Sequence[float],
+        correlation,
+    ):
+        if len(distributions) != len(sigmas):
+            raise ValueError("One sigma per distribution is required")
+
+        self.distributions = tuple(distributions)
+        self.sigmas = tuple(float(s) for s in sigmas)
+        self.factor = correlation_factor(
+            tuple(tuple(float(v) for v in row) for row in correlation)
+        )
+
+        if len(self.factor) != len(self.distributions):
+            raise ValueError("Correlation matrix must have one row per factor")
+
+    @property
+    def dims(self) -> int:
+        return len(self.distributions)
+
+    def sample(self, sampler: ArraySampler, method: str, size: int) -> np.ndarray:
+        """
+        (factors, size) correlated noise, from sampler.standard_normals(method).
+        """
+        return self.transform(sampler.standard_normals(method, self.dims, size))
+
+    def transform(self, z: np.ndarray) -> np.ndarray:
+        """
+        Maps independent standard normals (factors x size) to correlated noise.
+        """
+        noise = self.factor @ z
+        for i, (distribution, sigma) in enumerate(zip(self.distributions, self.sigmas)):
+            noise[i] = ArraySampler.transform(distribution, sigma, noise[i])
+        return noise
+
+
+EPSILON = 1e-8
+
+
 def enforce_valid_sample(value: float) -> float:
     if math.isnan(value) or math.isinf(value):
         raise ValueError("Invalid sampled value")
-    
-    EPSILON = 1e-8
+
     return max(EPSILON, value)
+
+
+def enforce_valid_samples(values: np.ndarray) -> np.ndarray:
+    if not np.all(np.isfinite(values)):
+        raise ValueError("Invalid sampled value")
+
+    return np.maximum(EPSILON, values)
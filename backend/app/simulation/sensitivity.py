@@ -1,62 +1,142 @@
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+import math
+
+import numpy as np
 
 from .config import PricingSimulationConfig
-from .results import run_simulation
+from .control_variate import ProfitControlVariate
+from .monte_carlo import evaluate_noise, sample_noise
+from .pipeline import SimulationPipeline, num_parts
+
+ASSUMPTIONS = ("base_demand", "price_elasticity", "unit_cost", "fixed_cost")
+
+
+@dataclass(frozen=True)
+class AssumptionSensitivity:
+    # d E[profit] / d assumption
+    derivative: float
+    derivative_stderr: float
+
+    # local elasticity: % change in E[profit] per % change in the assumption
+    elasticity: float
+    elasticity_stderr: float
+
+
+def local_sensitivities(
+    config: PricingSimulationConfig,
+) -> Dict[str, AssumptionSensitivity]:
+    """
+    Pathwise derivatives of mean profit for every assumption, from one
+    sampled batch.
+
+    Per run, profit = (p - c) * Q0 * D * exp(-k * E * p) - F is smooth in
+    the assumptions (noise D, E does not depend on them), so
+
+        d/dQ0 = (p - c) * D * exp(-k E p)    d/dk = -(p - c) * demand * E * p
+        d/dc  = -demand                      d/dF = -1
+
+    and the derivative of the mean is the mean of these. Standard errors
+    are the Monte Carlo ones; elasticity errors use the delta method on
+    the ratio with mean profit.
+    """
+    demand_noise, elasticity_noise = sample_noise(config)
+    outcomes = evaluate_noise(config, demand_noise, elasticity_noise)
+
+    profit = outcomes.profit
+    margin = config.price - config.unit_cost
+
+    # Demand per unit of base demand: D * exp(-k * E * p)
+    unit_demand = demand_noise * np.exp(-config.price_elasticity * elasticity_noise * config.price)
+
+    gradients = {
+        "base_demand": margin * unit_demand,
+        "price_elasticity": -margin * outcomes.demand * elasticity_noise * config.price,
+        "unit_cost": -outcomes.demand,
+        "fixed_cost": np.full_like(profit, -1.0),
+    }
+
+    return {
+        name: _sensitivity(gradients[name], profit, getattr(config, name))
+        for name in ASSUMPTIONS
+    }
+
+
+def _sensitivity(
+    gradient: np.ndarray,
+    profit: np.ndarray,
+    value: float,
+) -> AssumptionSensitivity:
+    n = len(profit)
+    mean_g = float(np.mean(gradient))
+    mean_y = float(np.mean(profit))
+    var_g = float(np.var(gradient))
+    var_y = float(np.var(profit))
+    cov = float(np.mean((gradient - mean_g) * (profit - mean_y)))
+
+    derivative_stderr = math.sqrt(var_g / n)
+
+    if mean_y == 0:
+        return AssumptionSensitivity(mean_g, derivative_stderr, math.nan, math.nan)
+
+    # elasticity = value * mean(g) / mean(y); delta method for the ratio
+    elasticity = value * mean_g / mean_y
+    ratio_var = (
+        var_g / mean_y ** 2
+        - 2.0 * mean_g * cov / mean_y ** 3
+        + mean_g ** 2 * var_y / mean_y ** 4
+    ) / n
+
+    return AssumptionSensitivity(
+        derivative=mean_g,
+        derivative_stderr=derivative_stderr,
+        elasticity=elasticity,
+        elasticity_stderr=abs(value) * math.sqrt(max(0.0, ratio_var)),
+    )
 
 
 def sensitivity_analysis(
     base_config: PricingSimulationConfig,
     perturbation: float = 0.1,  # 10% change
+    pipeline: Optional[SimulationPipeline] = None,
 ) -> Dict[str, float]:
     """
     Measures sensitivity of mean profit to each key assumption.
     Returns absolute change in mean profit.
+
+    Finite differences under common random numbers: noise is sampled
+    once and the base and every perturbed config are evaluated on the
+    same draws, which is what separate runs with the same seed produced.
+    Each mean is the one run_simulation reports, so under
+    sampling="control_variate" it is the control-variate estimate.
+    Evaluation goes through a SimulationPipeline (a fresh one unless
+    given), so the unit_cost and fixed_cost legs reuse the base demand
+    and revenue and only recompute costs and profit.
     """
+    if pipeline is None:
+        pipeline = SimulationPipeline()
 
-    base_result = run_simulation(base_config)
-    base_profit = base_result.summary.mean_profit
+    base_profit = _mean_profit(base_config, pipeline)
 
     impacts: Dict[str, float] = {}
 
-    # Helper to clone config with modifications
-    def modified_config(**changes):
-        data = base_config.__dict__.copy()
-        data.update(changes)
-        return PricingSimulationConfig(**data)
-
-    # Base demand sensitivity
-    cfg = modified_config(
-        base_demand=base_config.base_demand * (1 + perturbation)
-    )
-    impacts["base_demand"] = (
-        run_simulation(cfg).summary.mean_profit - base_profit
-    )
+    for name in ASSUMPTIONS:
+        cfg = replace(base_config, **{name: getattr(base_config, name) * (1 + perturbation)})
+        impacts[name] = _mean_profit(cfg, pipeline) - base_profit
 
-    # Price elasticity sensitivity
-    cfg = modified_config(
-        price_elasticity=base_config.price_elasticity * (1 + perturbation)
-    )
-    impacts["price_elasticity"] = (
-        run_simulation(cfg).summary.mean_profit - base_profit
-    )
+    return impacts
 
-    # Unit cost sensitivity
-    cfg = modified_config(
-        unit_cost=base_config.unit_cost * (1 + perturbation)
-    )
-    impacts["unit_cost"] = (
-        run_simulation(cfg).summary.mean_profit - base_profit
-    )
 
-    # Fixed cost sensitivity
-    cfg = modified_config(
-        fixed_cost=base_config.fixed_cost * (1 + perturbation)
-    )
-    impacts["fixed_cost"] = (
-        run_simulation(cfg).summary.mean_profit - base_profit
-    )
+def _mean_profit(config: PricingSimulationConfig, pipeline: SimulationPipeline) -> float:
+    if config.sampling != "control_variate":
+        return float(np.mean(pipeline.evaluate(config).profit))
 
-    return impacts
+    # Per part, merged in order, as run_simulation accumulates its chunks
+    control = ProfitControlVariate(config)
+    for part in range(num_parts(config)):
+        outcomes, (demand_noise, elasticity_noise) = pipeline.evaluate_part(config, part)
+        control.merge(ProfitControlVariate(config).update(outcomes.profit, demand_noise, elasticity_noise))
+    return float(control.means()[0])
 
 def rank_assumptions_by_impact(
     base_config: PricingSimulationConfig,
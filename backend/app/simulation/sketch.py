@@ -0,0 +1,152 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (Karnin-Lang-Liberty).
+
+    Values are kept in a stack of compactors. Level h holds items of
+    weight 2**h; when a level overflows it is sorted and every second
+    item (random offset) is promoted to the next level. Memory is
+    O(k log(n / k)) regardless of how many values are streamed in.
+
+    Error bound: the normalized rank error of any quantile query is
+    below rank_error(k) with ~99% confidence. For the default k = 200
+    that is about 1.3% of n, i.e. the returned 5th percentile lies
+    between the true 3.7th and 6.3th percentiles.
+
+    Sketches built on different chunks or workers can be merged; the
+    bound holds for the merged sketch of the combined stream.
+    """
+
+    CAPACITY_DECAY = 2.0 / 3.0
+    MIN_CAPACITY = 2
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        if k < 8:
+            raise ValueError("k must be >= 8")
+
+        self.k = k
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+        self._levels: List[np.ndarray] = [np.empty(0)]
+
+    @staticmethod
+    def rank_error(k: int) -> float:
+        """
+        Normalized rank error bound (~99% confidence) for sketch size k.
+        Empirical constant from the KLL reference implementation.
+        """
+        return 2.296 / k ** 0.9723
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self.n += values.size
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, rank: float) -> float:
+        """
+        Returns the value at the given 0-based rank (0 <= rank <= n - 1),
+        matching sorted(values)[int(rank)] up to the sketch error.
+        """
+        return self.quantiles([rank])[0]
+
+    def quantiles(self, ranks: Sequence[float]) -> List[float]:
+        if self.n == 0:
+            raise ValueError("Empty sketch")
+
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        idx = np.searchsorted(cumulative, np.asarray(ranks, dtype=np.float64), side="right")
+        idx = np.minimum(idx, len(items) - 1)
+        return [float(v) for v in items[idx]]
+
+    def cdf(self, values: Sequence[float]) -> np.ndarray:
+        """
+        Approximate fraction of streamed values <= each of the given values.
+        """
+        if self.n == 0:
+            raise ValueError("Empty sketch")
+
+        items, weights = self._weighted_items()
+        cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+        idx = np.searchsorted(items, np.asarray(values, dtype=np.float64), side="right")
+        return cumulative[idx] / self.n
+
+    def tail_mean(self, threshold: float) -> float:
+        """
+        Approximate mean of the streamed values <= threshold.
+        """
+        if self.n == 0:
+            raise ValueError("Empty sketch")
+
+        items, weights = self._weighted_items()
+        mask = items <= threshold
+        if not np.any(mask):
+            return float(threshold)
+        return float(np.sum(items[mask] * weights[mask]) / np.sum(weights[mask]))
+
+    @property
+    def num_retained(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(self.MIN_CAPACITY, int(np.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+
+    def _compress(self) -> None:
+        while True:
+            level = self._first_overflowing_level()
+            if level is None:
+                return
+
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+
+            items = np.sort(self._levels[level])
+
+            # Odd item out stays behind at this level
+            keep = items[:0]
+            if len(items) % 2 == 1:
+                keep, items = items[:1], items[1:]
+
+            offset = int(self._rng.integers(2))
+            self._levels[level] = keep
+            self._levels[level + 1] = np.concatenate(
+                [self._levels[level + 1], items[offset::2]]
+            )
+
+    def _first_overflowing_level(self) -> Optional[int]:
+        # Lazy compaction: only compact while the sketch as a whole is over budget
+        total_capacity = sum(self._capacity(h) for h in range(len(self._levels)))
+        if self.num_retained <= total_capacity:
+            return None
+
+        for h, items in enumerate(self._levels):
+            if len(items) > self._capacity(h):
+                return h
+        return None
+
+    def _weighted_items(self):
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
@@ -0,0 +1,223 @@
+import contextlib
+import dataclasses
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .aggregate import DEFAULT_RISK_LEVELS, SimulationSummary, aggregate_outcomes
+from .config import PricingSimulationConfig
+from .model import OUTCOME_COLUMNS, OutcomeBatch
+from .results import SimulationResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    config_json TEXT,
+    summary_json TEXT NOT NULL,
+    num_runs INTEGER NOT NULL,
+    has_outcomes INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class SimulationStore:
+    """
+    Persistent local store of simulation results.
+
+    Layout under `root`:
+    - index.sqlite3: one row per result (key, config, summary, size, times)
+    - <key[:2]>/<key>/<column>.npy: raw outcome columns (config.dtype)
+
+    Reads memory-map the columns, so large results are re-aggregated
+    without deserialization. When the stored bytes exceed max_bytes,
+    the least recently accessed results are deleted.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 10 * 1024 ** 3):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+
+        self.root = root
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(root, "index.sqlite3")
+        self._lock = threading.Lock()
+
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def put(
+        self,
+        key: str,
+        result: SimulationResult,
+        config: Optional[PricingSimulationConfig] = None,
+    ) -> None:
+        outcomes = result.outcomes
+        size = 0
+
+        if outcomes is not None:
+            # Write into a temp dir first so readers never see partial files
+            tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+            try:
+                for column in OUTCOME_COLUMNS:
+                    np.save(os.path.join(tmp, f"{column}.npy"), getattr(outcomes, column))
+                    size += os.path.getsize(os.path.join(tmp, f"{column}.npy"))
+
+                target = self._result_dir(key)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.rmtree(target, ignore_errors=True)
+                os.replace(tmp, target)
+            except BaseException:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(dataclasses.asdict(config)) if config is not None else None,
+                    json.dumps(summary_to_dict(result.summary)),
+                    len(outcomes) if outcomes is not None else 0,
+                    int(outcomes is not None),
+                    size,
+                    now,
+                    now,
+                ),
+            )
+
+        self.gc()
+
+    def get(self, key: str) -> Optional[SimulationResult]:
+        """
+        Returns the stored result with memory-mapped (read-only) outcomes,
+        or None if the key is unknown.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary_json, has_outcomes FROM results WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        summary_json, has_outcomes = row
+        outcomes = self.load_outcomes(key) if has_outcomes else None
+
+        return SimulationResult(
+            outcomes=outcomes,
+            summary=summary_from_dict(json.loads(summary_json)),
+        )
+
+    def load_outcomes(self, key: str) -> Optional[OutcomeBatch]:
+        directory = self._result_dir(key)
+        try:
+            columns = {
+                column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode="r")
+                for column in OUTCOME_COLUMNS
+            }
+        except FileNotFoundError:
+            return None
+        return OutcomeBatch(**columns)
+
+    def reaggregate(
+        self,
+        key: str,
+        percentiles: List[int] = [5, 50, 95],
+        risk_levels: Sequence[float] = DEFAULT_RISK_LEVELS,
+    ) -> Optional[SimulationSummary]:
+        """
+        Recomputes a summary (e.g. other percentiles or risk levels)
+        straight from the memory-mapped outcome columns.
+        """
+        outcomes = self.load_outcomes(key)
+        if outcomes is None:
+            return None
+        return aggregate_outcomes(outcomes, percentiles=percentiles, risk_levels=risk_levels)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        shutil.rmtree(self._result_dir(key), ignore_errors=True)
+
+    def gc(self) -> int:
+        """
+        Deletes least recently accessed results until the stored bytes fit
+        max_bytes. Returns the number of results removed.
+        """
+        removed: List[str] = []
+
+        with self._lock, self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            rows = conn.execute(
+                "SELECT key, bytes FROM results ORDER BY accessed_at ASC"
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                removed.append(key)
+                total -= size
+
+            conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in removed])
+
+        for key in removed:
+            shutil.rmtree(self._result_dir(key), ignore_errors=True)
+
+        return len(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM results"
+            ).fetchone()
+        return {
+            "root": self.root,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._index_path, timeout=30)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def _result_dir(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+
+def summary_to_dict(summary: SimulationSummary) -> Dict[str, Any]:
+    data = dataclasses.asdict(summary)
+    # JSON object keys must be strings; keep numeric keys as pairs instead
+    for name in ("profit_percentiles", "value_at_risk", "conditional_value_at_risk"):
+        data[name] = [[k, v] for k, v in data[name].items()]
+    return data
+
+
+def summary_from_dict(data: Dict[str, Any]) -> SimulationSummary:
+    data = dict(data)
+    for name in ("profit_percentiles", "value_at_risk", "conditional_value_at_risk"):
+        data[name] = {k: v for k, v in data[name]}
+    return SimulationSummary(**data)
@@ -0,0 +1,111 @@
+"""
+Variance per unit of CPU time of the sampling methods.
+
+Each method is replicated over independent seeds; the spread of the
+estimates across replications gives the estimator variance. Efficiency
+is relative to the scalar python-engine i.i.d. sampler:
+
+    efficiency = (var_ref * time_ref) / (var * time)
+
+i.e. how many times less CPU a method needs for the same precision.
+
+Run from backend/:
+
+    python -m benchmarks.sampling [--runs 4000] [--replications 200]
+"""
+import argparse
+import dataclasses
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.results import run_simulation
+
+METHODS: List[Tuple[str, str]] = [
+    ("python", "iid"),
+    ("numpy", "iid"),
+    ("numpy", "antithetic"),
+    ("numpy", "lhs"),
+    ("numpy", "sobol"),
+    ("numpy", "control_variate"),
+]
+
+STATISTICS: Dict[str, Callable] = {
+    "mean": lambda s: s.mean_profit,
+    "p5": lambda s: s.profit_percentiles[5],
+    "prob_loss": lambda s: s.prob_loss,
+}
+
+
+def base_config(runs: int) -> PricingSimulationConfig:
+    return PricingSimulationConfig(
+        price=10.0,
+        base_demand=500.0,
+        price_elasticity=0.2,
+        unit_cost=5.0,
+        fixed_cost=300.0,
+        demand_noise_distribution="lognormal",
+        demand_noise_sigma=0.3,
+        elasticity_noise_distribution="normal",
+        elasticity_noise_sigma=0.1,
+        num_runs=runs,
+        random_seed=0,
+    )
+
+
+def measure(config: PricingSimulationConfig, replications: int) -> Tuple[float, Dict[str, float]]:
+    estimates: Dict[str, List[float]] = {name: [] for name in STATISTICS}
+    cpu = 0.0
+
+    for seed in range(replications):
+        replica = dataclasses.replace(config, random_seed=seed)
+        started = time.process_time()
+        summary = run_simulation(replica).summary
+        cpu += time.process_time() - started
+
+        for name, statistic in STATISTICS.items():
+            estimates[name].append(statistic(summary))
+
+    variances = {name: float(np.var(values, ddof=1)) for name, values in estimates.items()}
+    return cpu / replications, variances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=4000)
+    parser.add_argument("--replications", type=int, default=200)
+    args = parser.parse_args()
+
+    config = base_config(args.runs)
+    rows = []
+    for engine, sampling in METHODS:
+        seconds, variances = measure(
+            dataclasses.replace(config, engine=engine, sampling=sampling),
+            args.replications,
+        )
+        rows.append((f"{engine}/{sampling}", seconds, variances))
+
+    _, ref_seconds, ref_variances = rows[0]
+
+    header = f"{'method':<24}{'ms/sim':>10}"
+    for name in STATISTICS:
+        header += f"{'var ' + name:>15}{'eff ' + name:>15}"
+    print(f"runs={args.runs} replications={args.replications}")
+    print(header)
+
+    for label, seconds, variances in rows:
+        line = f"{label:<24}{seconds * 1e3:>10.2f}"
+        for name in STATISTICS:
+            variance = variances[name]
+            efficiency = (
+                ref_variances[name] * ref_seconds / (variance * seconds)
+                if variance > 0 else float("inf")
+            )
+            line += f"{variance:>15.4g}{efficiency:>15.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
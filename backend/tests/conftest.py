@@ -0,0 +1,49 @@
+import pytest
+
+from app.simulation.cache import SimulationCache
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.pipeline import SimulationPipeline
+
+# Shared scenario for engine tests; a module adjusts it with a
+# module-level CONFIG dict (e.g. its run count and seed)
+BASE_CONFIG = dict(
+    price=10.0,
+    base_demand=500.0,
+    price_elasticity=0.2,
+    unit_cost=5.0,
+    fixed_cost=300.0,
+    demand_noise_distribution="lognormal",
+    demand_noise_sigma=0.3,
+    elasticity_noise_distribution="normal",
+    elasticity_noise_sigma=0.1,
+    num_runs=2000,
+    random_seed=3,
+    engine="numpy",
+)
+
+
+@pytest.fixture
+def make_config(request):
+    """
+    Factory of PricingSimulationConfig: BASE_CONFIG, then the test
+    module's CONFIG, then keyword overrides.
+    """
+    defaults = {**BASE_CONFIG, **getattr(request.module, "CONFIG", {})}
+
+    def make(**overrides) -> PricingSimulationConfig:
+        return PricingSimulationConfig(**{**defaults, **overrides})
+
+    return make
+
+
+@pytest.fixture
+def isolated_api(monkeypatch):
+    """
+    Fresh result cache and stage pipeline for the API handlers, so tests
+    neither see nor leave each other's cached results.
+    """
+    import app.api.simulation as api
+
+    monkeypatch.setattr(api, "cache", SimulationCache())
+    monkeypatch.setattr(api, "pipeline", SimulationPipeline())
+    return api
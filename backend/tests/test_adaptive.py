@@ -0,0 +1,132 @@
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from app.simulation.adaptive import (
+    MIN_TARGET_RUNS,
+    PrecisionTarget,
+    confidence_half_widths,
+    precision_report,
+    run_adaptive_price_grid,
+    run_adaptive_simulation,
+)
+from app.simulation.results import run_simulation
+
+
+CONFIG = dict(
+    num_runs=100_000,
+    random_seed=5,
+)
+
+
+def test_stops_once_target_is_met(make_config):
+    config = make_config()
+    target = PrecisionTarget(mean_rel_half_width=0.02, batch_runs=500)
+
+    result = run_adaptive_simulation(config, target)
+    report = precision_report(result.summary, target)
+
+    assert result.summary.num_runs < config.num_runs
+    assert result.summary.num_runs % 500 == 0
+    assert report.converged
+    assert report.mean_rel_half_width <= 0.02
+
+    # One batch fewer would not have been enough
+    shorter = dataclasses.replace(result.summary, num_runs=result.summary.num_runs - 500)
+    assert not precision_report(shorter, target).converged
+
+
+def test_draws_are_a_prefix_of_the_fixed_run(make_config):
+    config = make_config(num_runs=70_000)
+    target = PrecisionTarget(mean_rel_half_width=0.01)
+
+    adaptive = run_adaptive_simulation(config, target)
+    full = run_simulation(config)
+
+    n = adaptive.summary.num_runs
+    np.testing.assert_array_equal(adaptive.outcomes.profit, full.outcomes.profit[:n])
+
+
+def test_unreachable_target_spends_budget_and_matches_fixed_run(make_config):
+    config = make_config(num_runs=3000)
+    target = PrecisionTarget(prob_loss_half_width=1e-6)
+
+    result = run_adaptive_simulation(config, target)
+    expected = run_simulation(config).summary
+
+    assert result.summary.num_runs == 3000
+    assert not precision_report(result.summary, target).converged
+    assert math.isclose(result.summary.mean_profit, expected.mean_profit, rel_tol=1e-12)
+    assert result.summary.prob_loss == expected.prob_loss
+    assert result.summary.value_at_risk == expected.value_at_risk
+
+
+def test_grid_stops_per_price_and_matches_single_price_runs(make_config):
+    config = make_config(num_runs=50_000)
+    target = PrecisionTarget(mean_rel_half_width=0.01, prob_loss_half_width=0.01)
+    prices = [6.0, 10.0, 20.0, 30.0]
+
+    summaries = run_adaptive_price_grid(config, prices, target)
+
+    runs = [s.num_runs for s in summaries]
+    assert len(set(runs)) > 1
+    for price, summary in zip(prices, summaries):
+        expected = run_adaptive_simulation(dataclasses.replace(config, price=price), target).summary
+        assert summary.num_runs == expected.num_runs
+        assert math.isclose(summary.mean_profit, expected.mean_profit, rel_tol=1e-9)
+        assert summary.prob_loss == expected.prob_loss
+
+
+def test_grid_blocks_do_not_change_results(monkeypatch, make_config):
+    from app.simulation import adaptive
+
+    config = make_config(num_runs=20_000)
+    target = PrecisionTarget(mean_rel_half_width=0.01)
+    prices = np.linspace(6.0, 30.0, 9)
+
+    whole = run_adaptive_price_grid(config, prices, target)
+    monkeypatch.setattr(adaptive, "GRID_BLOCK_CELLS", config.num_runs * 2)
+    blocked = run_adaptive_price_grid(config, prices, target)
+
+    assert [s.num_runs for s in whole] == [s.num_runs for s in blocked]
+    for a, b in zip(whole, blocked):
+        assert math.isclose(a.mean_profit, b.mean_profit, rel_tol=1e-12)
+        assert a.value_at_risk == b.value_at_risk
+
+
+def test_single_run_batches_do_not_stop_on_zero_variance(make_config):
+    # After one run the sample variance is 0 and any target looks met
+    config = make_config()
+    target = PrecisionTarget(mean_rel_half_width=0.5, batch_runs=1)
+
+    result = run_adaptive_simulation(config, target)
+    assert result.summary.num_runs >= MIN_TARGET_RUNS
+    assert precision_report(result.summary, target).converged
+
+    [summary] = run_adaptive_price_grid(config, [config.price], target)
+    assert summary.num_runs == result.summary.num_runs
+
+    # Two batches are required even when one is large enough
+    assert run_adaptive_simulation(config, dataclasses.replace(target, batch_runs=5000)).summary.num_runs == 10_000
+
+    first = dataclasses.replace(result.summary, num_runs=1, profit_variance=0.0)
+    assert not precision_report(first, target).converged
+
+
+def test_wilson_half_width_is_positive_without_losses():
+    _, prob_loss_hw = confidence_half_widths(1000, 1.0, 0.0, 0.95)
+
+    assert prob_loss_hw > 0
+
+
+def test_invalid_targets_fail(make_config):
+    with pytest.raises(ValueError):
+        PrecisionTarget()
+
+    with pytest.raises(ValueError):
+        PrecisionTarget(mean_rel_half_width=0.01, confidence=1.0)
+
+    with pytest.raises(ValueError):
+        run_adaptive_simulation(make_config(engine="python"), PrecisionTarget(mean_rel_half_width=0.01))
@@ -0,0 +1,162 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.simulation.aggregate import StreamingAggregator, aggregate_outcomes
+from app.simulation.model import OutcomeBatch
+from app.simulation.sketch import KLLSketch
+
+
+def make_batch(profits) -> OutcomeBatch:
+    profits = np.asarray(profits, dtype=np.float64)
+    return OutcomeBatch(
+        demand=np.ones_like(profits),
+        revenue=profits + 1.0,
+        total_cost=np.ones_like(profits),
+        profit=profits,
+    )
+
+
+def reference_percentile(values, p):
+    ordered = sorted(values)
+    return ordered[int(math.floor((p / 100) * (len(ordered) - 1)))]
+
+
+def test_aggregate_outcomes_matches_reference_definitions():
+    profits = np.random.default_rng(0).normal(100.0, 25.0, 1001)
+
+    summary = aggregate_outcomes(make_batch(profits), percentiles=[1, 5, 50, 95, 99])
+
+    assert math.isclose(summary.mean_profit, float(np.mean(profits)))
+    assert math.isclose(summary.profit_variance, float(np.var(profits)))
+    for p in (1, 5, 50, 95, 99):
+        assert summary.profit_percentiles[p] == reference_percentile(profits, p)
+
+
+def test_chunked_exact_aggregation_matches_single_pass():
+    profits = np.random.default_rng(1).lognormal(3.0, 0.5, 10_000)
+
+    agg = StreamingAggregator(mode="exact")
+    for chunk in np.array_split(profits, 7):
+        agg.update(make_batch(chunk))
+
+    summary = agg.summary()
+    expected = aggregate_outcomes(make_batch(profits))
+
+    assert agg.count == len(profits)
+    assert math.isclose(summary.mean_profit, expected.mean_profit, rel_tol=1e-12)
+    assert math.isclose(summary.profit_variance, expected.profit_variance, rel_tol=1e-9)
+    assert summary.profit_percentiles == expected.profit_percentiles
+
+
+def test_merged_partial_aggregators_match_whole_stream():
+    profits = np.random.default_rng(2).normal(0.0, 1.0, 20_000)
+    halves = np.array_split(profits, 2)
+
+    left = StreamingAggregator(mode="exact").update(make_batch(halves[0]))
+    right = StreamingAggregator(mode="exact").update(make_batch(halves[1]))
+    merged = left.merge(right).summary()
+
+    assert math.isclose(merged.mean_profit, float(np.mean(profits)), abs_tol=1e-12)
+    assert math.isclose(merged.profit_variance, float(np.var(profits)), rel_tol=1e-9)
+
+
+def test_sketch_percentiles_within_documented_rank_error():
+    profits = np.random.default_rng(3).normal(50.0, 10.0, 200_000)
+    percentiles = [1, 5, 25, 50, 75, 95, 99]
+
+    agg = StreamingAggregator(percentiles, mode="sketch")
+    for chunk in np.array_split(profits, 50):
+        agg.update(make_batch(chunk))
+
+    summary = agg.summary()
+    ordered = np.sort(profits)
+    bound = KLLSketch.rank_error(200)
+
+    for p in percentiles:
+        rank = np.searchsorted(ordered, summary.profit_percentiles[p]) / len(profits)
+        assert abs(rank - p / 100) <= bound
+
+
+def test_sketch_memory_is_bounded():
+    sketch = KLLSketch(k=200)
+    rng = np.random.default_rng(4)
+
+    for _ in range(100):
+        sketch.update(rng.random(10_000))
+
+    assert sketch.n == 1_000_000
+    assert sketch.num_retained < 2_000
+
+
+def test_merged_sketches_within_rank_error():
+    rng = np.random.default_rng(5)
+    parts = [rng.exponential(1.0, 30_000) for _ in range(4)]
+
+    merged = KLLSketch(k=200)
+    for part in parts:
+        sketch = KLLSketch(k=200)
+        sketch.update(part)
+        merged.merge(sketch)
+
+    ordered = np.sort(np.concatenate(parts))
+    median = merged.quantile(0.5 * (len(ordered) - 1))
+    rank = np.searchsorted(ordered, median) / len(ordered)
+
+    assert merged.n == len(ordered)
+    assert abs(rank - 0.5) <= KLLSketch.rank_error(200)
+
+
+def test_aggregation_sanity_checks():
+    with pytest.raises(ValueError):
+        aggregate_outcomes(make_batch([]))
+
+    with pytest.raises(ValueError):
+        aggregate_outcomes(make_batch([1.0, float("nan")]))
+
+
+def test_risk_metrics_match_reference_definitions():
+    profits = np.random.default_rng(6).normal(10.0, 20.0, 5001)
+
+    summary = aggregate_outcomes(make_batch(profits), risk_levels=[0.9, 0.95])
+
+    centered = profits - profits.mean()
+    expected_skew = np.mean(centered ** 3) / np.mean(centered ** 2) ** 1.5
+
+    assert math.isclose(summary.std_profit, float(np.std(profits)))
+    assert math.isclose(summary.profit_skew, float(expected_skew), rel_tol=1e-9)
+    assert summary.prob_loss == float(np.mean(profits < 0))
+    assert summary.min_profit == float(profits.min())
+    assert summary.max_profit == float(profits.max())
+
+    for level in (0.9, 0.95):
+        var = reference_percentile(profits, (1 - level) * 100)
+        assert summary.value_at_risk[level] == var
+        assert math.isclose(
+            summary.conditional_value_at_risk[level],
+            float(np.mean(profits[profits <= var])),
+        )
+
+
+def test_merged_moments_match_whole_stream():
+    profits = np.random.default_rng(7).gamma(2.0, 3.0, 9_000)
+
+    agg = StreamingAggregator(mode="sketch")
+    for chunk in np.array_split(profits, [10, 4000, 4001]):
+        agg.merge(StreamingAggregator(mode="sketch").update(make_batch(chunk)))
+
+    summary = agg.summary()
+    expected = aggregate_outcomes(make_batch(profits))
+
+    assert math.isclose(summary.mean_profit, expected.mean_profit, rel_tol=1e-12)
+    assert math.isclose(summary.profit_variance, expected.profit_variance, rel_tol=1e-9)
+    assert math.isclose(summary.profit_skew, expected.profit_skew, rel_tol=1e-9)
+    assert summary.prob_loss == expected.prob_loss
+    assert summary.min_profit == expected.min_profit
+    assert summary.max_profit == expected.max_profit
+
+
+def test_invalid_risk_level_fails():
+    with pytest.raises(ValueError):
+        aggregate_outcomes(make_batch([1.0, 2.0]), risk_levels=[1.5])
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.simulation.analytic import analytic_optimal_price, analytic_profit_moments
+from app.simulation.monte_carlo import run_monte_carlo
+
+
+CONFIG = dict(
+    price=9.0,
+    fixed_cost=100.0,
+    demand_noise_distribution="normal",
+    elasticity_noise_sigma=0.2,
+    num_runs=400_000,
+    random_seed=9,
+)
+
+
+@pytest.mark.parametrize("demand_dist", ["normal", "lognormal"])
+@pytest.mark.parametrize("elasticity_dist", ["normal", "lognormal"])
+def test_moments_match_monte_carlo(demand_dist, elasticity_dist, make_config):
+    # Large demand sigma exercises the clipping at eps for normal noise
+    config = make_config(
+        demand_noise_distribution=demand_dist,
+        demand_noise_sigma=0.8,
+        elasticity_noise_distribution=elasticity_dist,
+        elasticity_noise_sigma=0.4,
+    )
+
+    moments = analytic_profit_moments(config)
+    profits = run_monte_carlo(config).profit
+    stderr = profits.std() / math.sqrt(len(profits))
+
+    assert abs(moments.mean_profit[0] - profits.mean()) < 4 * stderr
+    assert math.isclose(moments.std_profit[0], profits.std(), rel_tol=0.02)
+
+
+def test_moments_are_vectorized_over_prices(make_config):
+    config = make_config()
+    prices = [6.0, 9.0, 12.0]
+
+    moments = analytic_profit_moments(config, prices)
+
+    for i, price in enumerate(prices):
+        single = analytic_profit_moments(make_config(price=price))
+        assert math.isclose(moments.mean_profit[i], single.mean_profit[0])
+        assert math.isclose(moments.profit_variance[i], single.profit_variance[0])
+
+
+def test_untruncated_normal_optimum_matches_first_order_condition(make_config):
+    # Small sigma: clipping is negligible, E[profit] ~ (p-c) exp(-kp + s^2 k^2 p^2 / 2)
+    config = make_config(elasticity_noise_sigma=0.1)
+    k, c, s = config.price_elasticity, config.unit_cost, config.elasticity_noise_sigma
+
+    a = s ** 2 * k ** 2
+    b = -(k + s ** 2 * k ** 2 * c)
+    c0 = k * c + 1
+    expected = (-b - math.sqrt(b * b - 4 * a * c0)) / (2 * a)
+
+    price, _ = analytic_optimal_price(config)
+
+    assert math.isclose(price, expected, rel_tol=1e-6)
+
+
+def test_optimum_respects_bracket(make_config):
+    config = make_config()
+
+    price, profit = analytic_optimal_price(config, min_price=12.0, max_price=15.0)
+
+    assert price == pytest.approx(12.0, abs=1e-6)
+    assert profit == pytest.approx(analytic_profit_moments(config, [12.0]).mean_profit[0])
+
+
+def test_invalid_inputs_fail(make_config):
+    with pytest.raises(ValueError):
+        analytic_profit_moments(make_config(price_elasticity=-1.0))
+
+    with pytest.raises(ValueError):
+        analytic_profit_moments(make_config(), [0.0])
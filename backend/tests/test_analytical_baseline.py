@@ -1,5 +1,8 @@
 import math
 
+from app.simulation.analytic import analytic_optimal_price
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.monte_carlo import run_monte_carlo
 from app.simulation.model import (
     PricingDecision,
     PricingParameters,
@@ -105,3 +108,49 @@ def test_analytical_price_is_positive():
 
     assert optimal_price > 0
     assert math.isfinite(optimal_price)
+
+
+def test_numpy_engine_mean_profit_peaks_at_analytical_price():
+    unit_cost, elasticity = 5.0, 0.2
+    optimal_price = compute_analytical_optimal_price(unit_cost, elasticity)
+
+    def mean_profit(price: float) -> float:
+        config = PricingSimulationConfig(
+            price=price,
+            base_demand=500.0,
+            price_elasticity=elasticity,
+            unit_cost=unit_cost,
+            fixed_cost=100.0,
+            demand_noise_distribution="lognormal",
+            demand_noise_sigma=0.2,
+            elasticity_noise_distribution="normal",
+            elasticity_noise_sigma=0.01,
+            num_runs=5000,
+            random_seed=3,
+            engine="numpy",
+        )
+        return float(run_monte_carlo(config).profit.mean())
+
+    # Common random numbers (same seed) make the comparison sharp
+    assert mean_profit(optimal_price) > mean_profit(optimal_price - 1.0)
+    assert mean_profit(optimal_price) > mean_profit(optimal_price + 1.0)
+
+
+def test_analytic_engine_optimum_matches_closed_form_for_small_noise():
+    config = PricingSimulationConfig(
+        price=1.0,
+        base_demand=500.0,
+        price_elasticity=0.2,
+        unit_cost=5.0,
+        fixed_cost=100.0,
+        demand_noise_distribution="lognormal",
+        demand_noise_sigma=0.3,
+        elasticity_noise_distribution="normal",
+        elasticity_noise_sigma=1e-6,
+        num_runs=1,
+        random_seed=0,
+    )
+
+    price, _ = analytic_optimal_price(config)
+
+    assert math.isclose(price, compute_analytical_optimal_price(5.0, 0.2), rel_tol=1e-6)
@@ -0,0 +1,402 @@
+import asyncio
+import io
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api.encoding import decode_raw
+from app.api.scheduler import SimulationTooLarge
+from app.api.simulation import (
+    BatchScenario,
+    CompareRequest,
+    GlobalSensitivityRequest,
+    PrecisionRequest,
+    SimulateBatchRequest,
+    SimulateHorizonRequest,
+    SimulateRangeRequest,
+    SimulateRequest,
+    compare,
+    global_sensitivity,
+    pipeline_stats,
+    simulate,
+    simulate_batch,
+    simulate_horizon,
+    simulate_range,
+    simulate_range_stream,
+    simulate_stream,
+)
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.monte_carlo import run_monte_carlo
+
+pytestmark = pytest.mark.usefixtures("isolated_api")
+
+BASE = dict(
+    base_demand=500.0,
+    price_elasticity=0.2,
+    unit_cost=5.0,
+    fixed_cost=100.0,
+    demand_noise_sigma=0.2,
+    elasticity_noise_sigma=0.05,
+    random_seed=11,
+)
+
+
+def test_simulate_reports_summary_metrics():
+    resp = asyncio.run(simulate(SimulateRequest(price=10.0, num_runs=400, **BASE)))
+
+    assert len(resp.profits) == 400
+    assert resp.prob_loss == sum(p < 0 for p in resp.profits) / 400
+    assert resp.min_profit == min(resp.profits)
+    assert resp.max_profit == max(resp.profits)
+    assert [t.level for t in resp.tail_risk] == [0.95, 0.99]
+    for t in resp.tail_risk:
+        assert t.conditional_value_at_risk <= t.value_at_risk
+
+
+def test_simulate_defaults_to_the_legacy_python_engine():
+    # Existing clients keep their numbers for a given seed
+    resp = asyncio.run(simulate(SimulateRequest(price=10.0, num_runs=300, **BASE)))
+
+    config = PricingSimulationConfig(
+        price=10.0,
+        demand_noise_distribution="normal",
+        elasticity_noise_distribution="normal",
+        num_runs=300,
+        **BASE,
+    )
+    assert config.engine == "python"
+    assert resp.profits == run_monte_carlo(config).profit.tolist()
+
+    for model in (SimulateRequest, SimulateRangeRequest, BatchScenario):
+        assert model.model_fields["engine"].default == "python"
+
+
+def test_simulate_range_returns_curve_with_optimum():
+    resp = asyncio.run(
+        simulate_range(
+            SimulateRangeRequest(min_price=6.0, max_price=14.0, step=1.0, num_runs=200, **BASE)
+        )
+    )
+
+    assert [p.price for p in resp.curve] == [float(p) for p in range(6, 15)]
+    assert resp.max_mean_profit == max(p.mean_profit for p in resp.curve)
+    assert 9.0 <= resp.optimal_price <= 11.0
+
+
+def test_simulate_range_analytic_engine():
+    resp = asyncio.run(
+        simulate_range(
+            SimulateRangeRequest(min_price=6.0, max_price=14.0, step=1.0, engine="analytic", **BASE)
+        )
+    )
+
+    assert len(resp.curve) == 9
+    assert all(p.prob_loss is None for p in resp.curve)
+    assert resp.max_mean_profit >= max(p.mean_profit for p in resp.curve)
+    assert 9.0 <= resp.optimal_price <= 11.0
+
+
+def test_noise_correlation_is_applied_and_rejected_by_the_analytic_engine():
+    independent = asyncio.run(simulate(SimulateRequest(price=10.0, num_runs=2000, engine="numpy", **BASE)))
+    correlated = asyncio.run(
+        simulate(SimulateRequest(price=10.0, num_runs=2000, engine="numpy", noise_correlation=0.8, **BASE))
+    )
+    assert correlated.std_profit != independent.std_profit
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            simulate_range(
+                SimulateRangeRequest(
+                    min_price=6.0, max_price=14.0, step=1.0, engine="analytic", noise_correlation=0.5, **BASE
+                )
+            )
+        )
+    assert exc.value.status_code == 400
+
+
+def test_simulate_with_precision_target_reports_runs_used():
+    precision = PrecisionRequest(mean_rel_half_width=0.01, batch_runs=500, max_runs=50_000)
+    resp = asyncio.run(simulate(SimulateRequest(price=10.0, engine="numpy", precision=precision, **BASE)))
+
+    assert resp.precision.converged
+    assert resp.precision.num_runs == len(resp.profits) < 50_000
+    assert resp.precision.mean_rel_half_width <= 0.01
+
+    # Single-run batches would judge the target on zero variance
+    with pytest.raises(ValidationError):
+        PrecisionRequest(mean_rel_half_width=0.01, batch_runs=1)
+
+
+def test_simulate_range_with_precision_target_stops_per_price():
+    precision = PrecisionRequest(prob_loss_half_width=0.01, max_runs=20_000)
+    resp = asyncio.run(
+        simulate_range(
+            SimulateRangeRequest(
+                min_price=5.5, max_price=14.0, step=0.5, engine="numpy", precision=precision, **BASE
+            )
+        )
+    )
+
+    runs = [p.precision.num_runs for p in resp.curve]
+    assert min(runs) < max(runs)
+    assert all(p.precision.converged or p.precision.num_runs == 20_000 for p in resp.curve)
+
+
+def test_global_sensitivity_endpoint():
+    resp = asyncio.run(
+        global_sensitivity(
+            GlobalSensitivityRequest(price=10.0, num_runs=4096, fixed_cost_sigma=0.5, **BASE)
+        )
+    )
+
+    assert [i.input for i in resp.indices] == ["demand_noise", "elasticity_noise", "fixed_cost"]
+    assert resp.num_samples == 4096
+    for index in resp.indices:
+        assert -0.05 <= index.first_order <= index.total + 0.05
+
+
+def test_compare_endpoint_returns_pairs():
+    resp = asyncio.run(compare(CompareRequest(prices=[8.0, 10.0, 12.0], num_runs=500, **BASE)))
+
+    assert [p.price for p in resp.prices] == [8.0, 10.0, 12.0]
+    assert len(resp.pairs) == 3
+    for pair in resp.pairs:
+        assert 0.0 <= pair.prob_a_beats_b <= 1.0
+        assert set(pair.delta_percentiles) == {5, 50, 95}
+
+
+def test_simulate_binary_formats_carry_the_json_samples():
+    req = SimulateRequest(price=10.0, num_runs=400, **BASE)
+    expected = asyncio.run(simulate(req))
+
+    resp = asyncio.run(simulate(req, format="f64"))
+    metrics = json.loads(resp.headers["X-Risklens-Metrics"])
+
+    assert resp.media_type == "application/x-risklens-f64"
+    assert decode_raw(bytes(resp.body)).tolist() == expected.profits
+    assert metrics["mean_profit"] == expected.mean_profit
+
+    resp = asyncio.run(simulate(req, accept="application/x-npy"))
+    assert np.load(io.BytesIO(bytes(resp.body))).tolist() == expected.profits
+
+
+def test_simulate_rejects_unsupported_accept():
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(simulate(SimulateRequest(price=10.0, num_runs=10, **BASE), accept="text/csv"))
+
+    assert e.value.status_code == 406
+
+
+@pytest.mark.parametrize("distribution", ["histogram", "quantiles", "ecdf"])
+def test_simulate_distribution_modes_replace_samples(distribution):
+    resp = asyncio.run(
+        simulate(SimulateRequest(price=10.0, num_runs=5000, distribution=distribution, bins=20, points=11, **BASE))
+    )
+
+    assert resp.profits is None
+    if distribution == "histogram":
+        assert sum(resp.histogram.counts) == 5000
+        assert len(resp.histogram.edges) == 21
+    elif distribution == "quantiles":
+        assert resp.quantiles.values[0] == resp.min_profit
+        assert resp.quantiles.values[-1] == resp.max_profit
+    else:
+        assert len(resp.ecdf.values) == 11
+        assert resp.ecdf.probabilities[-1] == 1.0
+
+
+def read_stream(response) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_simulate_stream_ends_with_the_simulate_result():
+    req = SimulateRequest(
+        price=10.0, num_runs=150_000, engine="numpy", distribution="quantiles", **BASE
+    )
+
+    response = asyncio.run(simulate_stream(req))
+    assert response.media_type == "application/x-ndjson"
+    messages = [json.loads(line) for line in read_stream(response).splitlines()]
+
+    assert [m["event"] for m in messages] == ["progress"] * 3 + ["result"]
+    assert [m["data"]["runs_completed"] for m in messages[:-1]] == [65536, 131072, 150_000]
+    assert messages[-1]["data"] == asyncio.run(simulate(req)).model_dump()
+
+
+def test_simulate_range_stream_sends_price_points_as_they_complete():
+    req = SimulateRangeRequest(
+        min_price=6.0, max_price=14.0, step=0.5, num_runs=20_000, **BASE
+    )
+
+    response = asyncio.run(simulate_range_stream(req, format="sse"))
+    assert response.media_type == "text/event-stream"
+    frames = read_stream(response).decode().strip().split("\n\n")
+    events = [frame.split("\n") for frame in frames]
+
+    assert all(event.startswith("event: ") and data.startswith("data: ") for event, data in events)
+    progress = [json.loads(data[6:]) for event, data in events[:-1]]
+    assert len(progress) == 6
+    assert progress[-1]["prices_completed"] == progress[-1]["total_prices"] == 17
+
+    result = json.loads(events[-1][1][6:])
+    assert events[-1][0] == "event: result"
+    assert result == asyncio.run(simulate_range(req)).model_dump()
+    assert [p for m in progress for p in m["points"]] == result["curve"]
+
+
+def test_simulate_batch_dedupes_and_reports_errors_per_scenario():
+    scenario = dict(price=10.0, num_runs=300, **BASE)
+    scenarios = [
+        scenario,
+        dict(scenario, price=12.0),
+        dict(scenario, demand_noise_sigma=-1.0),
+        dict(scenario, random_seed=12),
+        scenario,
+    ]
+
+    resp = asyncio.run(simulate_batch(SimulateBatchRequest(scenarios=scenarios)))
+
+    assert resp.unique_scenarios == 3
+    assert resp.noise_groups == 2
+    assert [r.error is None for r in resp.results] == [True, True, False, True, True]
+    assert resp.results[2].error.field == "demand_noise_sigma"
+    assert resp.results[0] == resp.results[4]
+
+    single = asyncio.run(simulate(SimulateRequest(**dict(scenario, price=12.0))))
+    assert resp.results[1].metrics.mean_profit == pytest.approx(single.mean_profit, rel=1e-12)
+    assert resp.results[1].metrics.prob_loss == single.prob_loss
+
+
+def test_simulate_batch_splits_jobs_to_fit_the_admission_budget(isolated_api, monkeypatch):
+    scenario = dict(price=10.0, num_runs=300, **BASE)
+    scenarios = [
+        scenario,
+        dict(scenario, price=12.0),
+        dict(scenario, random_seed=12),
+        dict(scenario, num_runs=1000),
+    ]
+    expected = asyncio.run(simulate_batch(SimulateBatchRequest(scenarios=scenarios[:3])))
+    isolated_api.cache.clear()
+
+    # 900 uncached runs in total, at most 700 admitted at once
+    monkeypatch.setattr(isolated_api.scheduler, "max_inflight_cost", 700)
+    admitted = isolated_api.scheduler.stats()["admitted"]
+    resp = asyncio.run(simulate_batch(SimulateBatchRequest(scenarios=scenarios)))
+
+    assert isolated_api.scheduler.stats()["admitted"] == admitted + 2
+    assert resp.results[:3] == expected.results
+    assert resp.results[3].error.field == "num_runs"
+    assert "exceeds the limit of 700" in resp.results[3].error.message
+
+
+def test_constant_memory_runs_are_admitted_past_the_inflight_budget(isolated_api, monkeypatch):
+    monkeypatch.setattr(isolated_api, "MAX_RETAINED_RUNS", 1000)
+    monkeypatch.setattr(isolated_api.scheduler, "max_inflight_cost", 100_000)
+    req = SimulateRequest(price=10.0, num_runs=200_000, engine="numpy", distribution="quantiles", **BASE)
+
+    # Charged one chunk, not 200k runs
+    resp = asyncio.run(simulate(req))
+    assert resp.profits is None
+    assert resp.quantiles.values[0] <= resp.mean_profit <= resp.quantiles.values[-1]
+
+    with pytest.raises(SimulationTooLarge):
+        asyncio.run(simulate(req.model_copy(update={"distribution": "samples"})))
+
+
+def test_simulate_stream_of_a_large_summary_runs_in_constant_memory(isolated_api, monkeypatch):
+    monkeypatch.setattr(isolated_api, "MAX_RETAINED_RUNS", 1000)
+    monkeypatch.setattr(isolated_api.scheduler, "max_inflight_cost", 100_000)
+    req = SimulateRequest(price=10.0, num_runs=150_000, engine="numpy", distribution="quantiles", **BASE)
+
+    # Admitted at one chunk's cost, and no outcomes are kept
+    messages = [json.loads(line) for line in read_stream(asyncio.run(simulate_stream(req))).splitlines()]
+    assert [m["event"] for m in messages] == ["progress"] * 3 + ["result"]
+    assert messages[-1]["data"] == asyncio.run(simulate(req)).model_dump()
+
+    config = isolated_api._simulation_plan(req)[0]
+    cached = isolated_api.cache.get(isolated_api._constant_memory_key(req, config))
+    assert cached.outcomes is None and cached.sketch is not None
+
+
+def test_simulate_horizon_reports_periods_and_cumulative_profit():
+    req = SimulateHorizonRequest(
+        price=11.0,
+        previous_price=10.0,
+        periods=6,
+        adoption_delay=1.0,
+        churn_sensitivity=0.2,
+        num_runs=500,
+        **BASE,
+    )
+    resp = asyncio.run(simulate_horizon(req))
+
+    assert [p.period for p in resp.periods] == list(range(6))
+    assert resp.periods[0].mean_retention == 1.0
+    assert resp.periods[-1].mean_retention < 1.0
+    assert resp.periods[-1].cumulative_mean_profit == pytest.approx(
+        sum(p.mean_profit for p in resp.periods), rel=1e-9
+    )
+    assert resp.total.mean_profit == resp.periods[-1].cumulative_mean_profit
+    assert set(resp.periods[0].cumulative_percentiles) == {5, 50, 95}
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(simulate_horizon(req.model_copy(update={"sampling": "iid", "demand_noise_sigma": -1.0})))
+    assert exc.value.status_code == 400
+
+
+def test_simulate_cost_changes_reuse_memoized_demand():
+    req = SimulateRequest(price=10.0, num_runs=400, engine="numpy", **BASE)
+    first = asyncio.run(simulate(req))
+    cheaper = asyncio.run(simulate(req.model_copy(update={"unit_cost": 4.0})))
+
+    stages = asyncio.run(pipeline_stats())["stages"]
+    assert stages["demand"]["computed"] == 1
+    assert stages["total_cost"]["computed"] == 2
+    # Same draws: every run's profit rises by its demand
+    assert all(c > f for c, f in zip(cheaper.profits, first.profits))
+
+
+def test_store_io_runs_off_the_event_loop(monkeypatch, tmp_path):
+    import threading
+
+    import app.api.simulation as api
+    from app.simulation.cache import SimulationCache
+    from app.simulation.store import SimulationStore
+
+    store = SimulationStore(str(tmp_path))
+    threads = []
+    for name in ("get", "put"):
+        def record(*args, _method=getattr(store, name), **kwargs):
+            threads.append(threading.current_thread())
+            return _method(*args, **kwargs)
+        monkeypatch.setattr(store, name, record)
+    monkeypatch.setattr(api, "cache", SimulationCache(store=store))
+
+    req = SimulateRequest(price=10.0, num_runs=400, **BASE)
+    asyncio.run(simulate(req))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert store.stats()["entries"] == 1
+
+
+def test_large_summary_only_simulations_run_in_constant_memory(monkeypatch):
+    import app.api.simulation as api
+
+    monkeypatch.setattr(api, "MAX_RETAINED_RUNS", 1000)
+    req = SimulateRequest(
+        price=10.0, num_runs=5000, engine="numpy", distribution="histogram", bins=10, **BASE
+    )
+
+    resp = asyncio.run(simulate(req))
+    exact = asyncio.run(simulate(req.model_copy(update={"distribution": "samples"})))
+
+    assert resp.mean_profit == pytest.approx(exact.mean_profit, rel=1e-12)
+    assert resp.prob_loss == exact.prob_loss
+    assert sum(resp.histogram.counts) + resp.histogram.underflow + resp.histogram.overflow == 5000
@@ -0,0 +1,58 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.simulation.batch import noise_key, run_scenario_batch
+from app.simulation.results import run_simulation
+
+
+CONFIG = dict(
+    fixed_cost=900.0,
+    random_seed=7,
+)
+
+
+def assert_summaries_close(actual, expected):
+    assert actual.num_runs == expected.num_runs
+    assert actual.mean_profit == pytest.approx(expected.mean_profit, rel=1e-12)
+    assert actual.std_profit == pytest.approx(expected.std_profit, rel=1e-9)
+    assert actual.prob_loss == expected.prob_loss
+    assert actual.value_at_risk == pytest.approx(expected.value_at_risk, rel=1e-12)
+    assert actual.conditional_value_at_risk == pytest.approx(expected.conditional_value_at_risk, rel=1e-12)
+
+
+def test_batch_matches_individual_simulations_in_input_order(make_config):
+    base = make_config()
+    configs = [
+        base,
+        replace(base, price=12.0, unit_cost=6.0),
+        replace(base, random_seed=8),
+        replace(base, num_runs=500, fixed_cost=100.0),
+        replace(base, sampling="control_variate"),
+        replace(base, engine="python", num_runs=300),
+        replace(base, price=12.0, unit_cost=6.0),
+        base,
+    ]
+
+    summaries = run_scenario_batch(configs)
+
+    assert len(summaries) == len(configs)
+    for config, summary in zip(configs, summaries):
+        assert_summaries_close(summary, run_simulation(config).summary)
+
+
+def test_duplicates_share_one_summary(make_config):
+    config = make_config()
+
+    first, second = run_scenario_batch([config, replace(config)])
+
+    assert first is second
+
+
+def test_noise_key_ignores_decision_and_assumptions(make_config):
+    config = make_config()
+
+    assert noise_key(config) == noise_key(replace(config, price=3.0, base_demand=10.0, fixed_cost=0.0))
+    assert noise_key(config) != noise_key(replace(config, demand_noise_sigma=0.2))
+    assert noise_key(config) != noise_key(replace(config, sampling="antithetic"))
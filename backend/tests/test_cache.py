@@ -0,0 +1,110 @@
+import dataclasses
+
+import numpy as np
+
+from app.simulation import cache as cache_module
+from app.simulation.cache import (
+    SimulationCache,
+    cached_compare_pricing_decisions,
+    cached_paired_comparison,
+    cached_run_price_grid,
+    cached_run_simulation,
+    cached_sensitivity_analysis,
+    config_key,
+)
+
+
+CONFIG = dict(
+    fixed_cost=100.0,
+    demand_noise_distribution="normal",
+    demand_noise_sigma=0.2,
+    elasticity_noise_sigma=0.05,
+    num_runs=1000,
+    random_seed=1,
+)
+
+
+def test_key_is_canonical_and_covers_every_field(monkeypatch, make_config):
+    config = make_config()
+
+    assert config_key("simulation", config) == config_key("simulation", make_config())
+    assert config_key("simulation", config) != config_key("simulation", make_config(random_seed=2))
+    assert config_key("simulation", config) != config_key("simulation", make_config(engine="python"))
+    assert config_key("simulation", config) != config_key("compare", config)
+
+    before = config_key("simulation", config)
+    monkeypatch.setattr(cache_module, "ENGINE_VERSION", "test")
+    assert config_key("simulation", config) != before
+
+
+def test_repeated_simulation_is_served_from_cache(make_config):
+    cache = SimulationCache()
+    config = make_config()
+
+    first = cached_run_simulation(cache, config)
+    second = cached_run_simulation(cache, config)
+
+    assert second is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["bytes"] >= first.outcomes.nbytes
+
+
+def test_lru_eviction_under_byte_budget(make_config):
+    per_entry = 4 * 8 * 1000 + cache_module.SUMMARY_BYTES
+    cache = SimulationCache(max_bytes=2 * per_entry)
+
+    a = cached_run_simulation(cache, make_config(random_seed=1))
+    cached_run_simulation(cache, make_config(random_seed=2))
+    assert cached_run_simulation(cache, make_config(random_seed=1)) is a  # refresh a
+
+    cached_run_simulation(cache, make_config(random_seed=3))  # evicts seed 2
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+    assert cached_run_simulation(cache, make_config(random_seed=1)) is a
+
+
+def test_summaries_only_drops_outcomes(make_config):
+    cache = SimulationCache(summaries_only=True)
+    config = make_config()
+
+    result = cached_run_simulation(cache, config, need_outcomes=False)
+    cached = cached_run_simulation(cache, config, need_outcomes=False)
+
+    assert cached.outcomes is None
+    assert cached.summary == result.summary
+    assert cache.stats()["bytes"] == cache_module.SUMMARY_BYTES
+
+    # Callers that need raw outcomes recompute
+    assert cached_run_simulation(cache, config, need_outcomes=True).outcomes is not None
+    assert cache.stats()["misses"] == 2
+
+
+def test_grid_compare_and_sensitivity_are_cached(make_config):
+    cache = SimulationCache()
+    config = make_config()
+
+    grid = cached_run_price_grid(cache, config, np.array([8.0, 10.0]))
+    # Base price is irrelevant for a grid
+    assert cached_run_price_grid(cache, dataclasses.replace(config, price=3.0), [8.0, 10.0]) is grid
+
+    compared = cached_compare_pricing_decisions(cache, config, [8.0, 10.0])
+    assert cached_compare_pricing_decisions(cache, config, [8.0, 10.0]) is compared
+
+    impacts = cached_sensitivity_analysis(cache, config)
+    assert cached_sensitivity_analysis(cache, config) is impacts
+
+    assert cache.stats()["hits"] == 3
+
+
+def test_paired_comparison_is_cached_independently_of_base_price(make_config):
+    cache = SimulationCache()
+    config = make_config()
+
+    comparison = cached_paired_comparison(cache, config, [8.0, 10.0])
+
+    assert cached_paired_comparison(cache, dataclasses.replace(config, price=3.0), [8.0, 10.0]) is comparison
+    assert cached_paired_comparison(cache, config, [8.0, 11.0]) is not comparison
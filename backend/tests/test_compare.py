@@ -0,0 +1,73 @@
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from app.simulation.compare import compare_pricing_decisions, paired_comparison
+from app.simulation.results import run_simulation
+
+
+CONFIG = dict(
+    random_seed=8,
+)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_results_match_per_price_simulation(engine, make_config):
+    config = make_config(engine=engine, num_runs=500)
+    prices = [8.0, 10.0, 12.0]
+
+    results = compare_pricing_decisions(config, prices)
+
+    assert list(results) == prices
+    for price, result in results.items():
+        expected = run_simulation(dataclasses.replace(config, price=price))
+        np.testing.assert_allclose(result.outcomes.profit, expected.outcomes.profit, rtol=1e-12)
+        assert math.isclose(result.summary.mean_profit, expected.summary.mean_profit, rel_tol=1e-12)
+
+
+def test_pairs_are_computed_from_paired_runs(make_config):
+    config = make_config()
+    prices = [8.0, 10.0, 14.0]
+
+    comparison = paired_comparison(config, prices)
+    results = compare_pricing_decisions(config, prices)
+
+    assert [(p.price_a, p.price_b) for p in comparison.pairs] == [(8.0, 10.0), (8.0, 14.0), (10.0, 14.0)]
+    for pair in comparison.pairs:
+        delta = results[pair.price_a].outcomes.profit - results[pair.price_b].outcomes.profit
+        assert math.isclose(pair.mean_delta, delta.mean(), rel_tol=1e-9)
+        assert pair.prob_a_beats_b == np.mean(delta > 0)
+        assert pair.delta_percentiles[50] == np.sort(delta)[int(0.5 * (len(delta) - 1))]
+
+
+def test_pairs_do_not_depend_on_block_size(make_config):
+    config = make_config()
+    prices = [7.0, 8.0, 10.0, 12.0, 14.0]
+
+    whole = paired_comparison(config, prices)
+    # One pair (2000 runs) per block, and a block smaller than one pair
+    for block_cells in (config.num_runs, 1):
+        assert paired_comparison(config, prices, block_cells=block_cells).pairs == whole.pairs
+
+    with pytest.raises(ValueError):
+        paired_comparison(config, prices, block_cells=0)
+
+
+def test_paired_error_is_tighter_than_independent_error(make_config):
+    config = make_config()
+
+    comparison = paired_comparison(config, [9.0, 10.0])
+    a, b = comparison.summaries
+    independent = math.sqrt((a.profit_variance + b.profit_variance) / config.num_runs)
+
+    assert comparison.pairs[0].delta_stderr < independent / 3
+
+
+def test_invalid_prices_fail(make_config):
+    with pytest.raises(ValueError):
+        paired_comparison(make_config(), [])
+
+    with pytest.raises(ValueError):
+        compare_pricing_decisions(make_config(), [10.0, -1.0])
@@ -0,0 +1,125 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.monte_carlo import STREAM_CHUNK_RUNS
+from app.simulation.results import SimulationProgress, iter_simulation, run_simulation
+from app.simulation.sketch import KLLSketch
+
+
+CONFIG = dict(
+    fixed_cost=900.0,
+    num_runs=3 * STREAM_CHUNK_RUNS + 123,
+    random_seed=42,
+)
+
+
+@pytest.mark.parametrize("sampling", ["iid", "control_variate"])
+def test_constant_memory_moments_are_exact_and_quantiles_within_sketch_error(sampling, make_config):
+    config = make_config(sampling=sampling)
+    exact = run_simulation(config)
+
+    result = run_simulation(config, constant_memory=True)
+    summary = result.summary
+
+    assert result.outcomes is None
+    assert summary.num_runs == config.num_runs
+    assert summary.mean_profit == pytest.approx(exact.summary.mean_profit, rel=1e-12)
+    assert summary.std_profit == pytest.approx(exact.summary.std_profit, rel=1e-12)
+    assert summary.prob_loss == exact.summary.prob_loss
+    assert summary.min_profit == exact.summary.min_profit
+    assert summary.max_profit == exact.summary.max_profit
+
+    profits = np.sort(exact.outcomes.profit)
+    tolerance = KLLSketch.rank_error(200)
+    for p, value in summary.profit_percentiles.items():
+        rank = np.searchsorted(profits, value) / len(profits)
+        assert abs(rank - p / 100) <= tolerance
+    assert result.sketch.n == config.num_runs
+
+
+def test_constant_memory_is_identical_for_any_worker_count(make_config):
+    config = make_config()
+
+    serial = run_simulation(config, constant_memory=True)
+    parallel = run_simulation(config, workers=2, constant_memory=True)
+
+    assert parallel.summary == serial.summary
+
+
+@pytest.mark.parametrize("sampling", ["iid", "control_variate"])
+def test_constant_memory_stream_matches_run_simulation(sampling, make_config):
+    config = make_config(sampling=sampling)
+
+    *progress, result = iter_simulation(config, constant_memory=True)
+    expected = run_simulation(config, constant_memory=True)
+
+    assert all(isinstance(p, SimulationProgress) for p in progress)
+    assert [p.runs_completed for p in progress][-1] == config.num_runs
+    assert len(progress) == 4
+    assert result.outcomes is None
+    assert result.summary == expected.summary
+    assert result.sketch.n == config.num_runs
+
+    with pytest.raises(ValueError):
+        list(iter_simulation(make_config(engine="python", num_runs=10), constant_memory=True))
+
+
+def test_spilled_outcomes_match_the_in_memory_run(tmp_path, make_config):
+    config = make_config()
+
+    result = run_simulation(config, constant_memory=True, spill_dir=str(tmp_path))
+
+    assert isinstance(result.outcomes.profit, np.memmap)
+    np.testing.assert_array_equal(result.outcomes.profit, run_simulation(config).outcomes.profit)
+    np.testing.assert_array_equal(result.outcomes.demand, run_simulation(config).outcomes.demand)
+
+
+def test_spill_dir_requires_constant_memory(tmp_path, make_config):
+    with pytest.raises(ValueError):
+        run_simulation(make_config(), spill_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        run_simulation(make_config(engine="python", num_runs=10), constant_memory=True)
+
+
+def test_peak_rss_stays_flat_for_1e8_runs():
+    # Materialized, 10^8 runs would need 3.2 GB for the outcome columns alone
+    script = textwrap.dedent(
+        """
+        import dataclasses, json, resource
+        from app.simulation.config import PricingSimulationConfig
+        from app.simulation.results import SimulationProgress, iter_simulation, run_simulation
+
+        config = PricingSimulationConfig(
+            price=10.0, base_demand=500.0, price_elasticity=0.2, unit_cost=5.0,
+            fixed_cost=900.0, demand_noise_distribution="lognormal", demand_noise_sigma=0.3,
+            elasticity_noise_distribution="normal", elasticity_noise_sigma=0.1,
+            num_runs=10 ** 8, random_seed=1, engine="numpy",
+        )
+        # Warm up imports and allocator before the baseline
+        run_simulation(dataclasses.replace(config, num_runs=10 ** 6), constant_memory=True)
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        summary = run_simulation(config, constant_memory=True).summary
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(json.dumps({"baseline_kb": baseline, "peak_kb": peak, "num_runs": summary.num_runs}))
+        """
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parents[1],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    usage = json.loads(output.strip().splitlines()[-1])
+
+    assert usage["num_runs"] == 10 ** 8
+    # ru_maxrss is in KiB on Linux
+    assert usage["peak_kb"] - usage["baseline_kb"] < 64 * 1024
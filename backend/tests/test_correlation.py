@@ -0,0 +1,145 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.simulation.analytic import analytic_profit_moments
+from app.simulation.config import ConfigValidationError, PricingSimulationConfig
+from app.simulation.global_sensitivity import sobol_indices
+from app.simulation.horizon import HorizonAssumptions, simulate_horizon
+from app.simulation.monte_carlo import run_monte_carlo, sample_noise
+from app.simulation.results import run_simulation
+from app.simulation.sampler import ArraySampler, MultivariateSampler, correlation_factor
+
+CORRELATION = (
+    (1.0, 0.6, -0.3, 0.2),
+    (0.6, 1.0, 0.0, 0.4),
+    (-0.3, 0.0, 1.0, 0.5),
+    (0.2, 0.4, 0.5, 1.0),
+)
+
+
+CONFIG = dict(
+    num_runs=50_000,
+    noise_correlation=0.7,
+)
+
+
+def test_correlation_factor_is_validated_and_cached():
+    factor = correlation_factor(CORRELATION)
+
+    np.testing.assert_allclose(factor @ factor.T, CORRELATION, atol=1e-12)
+    assert correlation_factor(CORRELATION) is factor
+    assert not factor.flags.writeable
+
+    with pytest.raises(ValueError, match="square"):
+        correlation_factor(((1.0, 0.5),))
+    with pytest.raises(ValueError, match="symmetric"):
+        correlation_factor(((1.0, 0.5), (0.4, 1.0)))
+    with pytest.raises(ValueError, match="unit diagonal"):
+        correlation_factor(((2.0, 0.5), (0.5, 1.0)))
+    with pytest.raises(ValueError, match="positive definite"):
+        correlation_factor(((1.0, 0.9, -0.9), (0.9, 1.0, 0.9), (-0.9, 0.9, 1.0)))
+
+
+@pytest.mark.parametrize("method", ["iid", "antithetic", "lhs", "sobol"])
+def test_multivariate_sampler_copula(method):
+    sampler = MultivariateSampler(
+        ["normal", "lognormal", "lognormal", "normal"],
+        [0.2, 0.3, 0.1, 0.05],
+        CORRELATION,
+    )
+    noise = sampler.sample(ArraySampler(np.random.default_rng(1)), method, 100_000)
+
+    assert noise.shape == (4, 100_000)
+
+    # Latent normals carry the correlation; marginals are unchanged
+    latent = np.stack([
+        (noise[0] - 1.0) / 0.2,
+        np.log(noise[1]) / 0.3,
+        np.log(noise[2]) / 0.1,
+        (noise[3] - 1.0) / 0.05,
+    ])
+    np.testing.assert_allclose(np.corrcoef(latent), CORRELATION, atol=0.02)
+    np.testing.assert_allclose(latent.mean(axis=1), 0.0, atol=0.02)
+    np.testing.assert_allclose(latent.std(axis=1), 1.0, atol=0.02)
+
+    with pytest.raises(ValueError):
+        MultivariateSampler(["normal", "normal"], [0.1, 0.1], CORRELATION)
+
+
+@pytest.mark.parametrize("sampling", ["iid", "antithetic", "lhs", "sobol", "control_variate"])
+def test_config_noise_correlation(sampling, make_config):
+    config = make_config(sampling=sampling)
+    demand_noise, elasticity_noise = sample_noise(config)
+
+    rho = np.corrcoef(np.log(demand_noise), elasticity_noise)[0, 1]
+    assert rho == pytest.approx(0.7, abs=0.02)
+
+    # Marginals match the independent draws
+    independent, _ = sample_noise(replace(config, noise_correlation=0.0))
+    assert np.median(demand_noise) == pytest.approx(np.median(independent), rel=0.02)
+
+
+def test_correlation_shifts_the_profit_distribution(make_config):
+    # High demand paired with high elasticity offsets; profit spread narrows
+    positive = run_simulation(make_config(noise_correlation=0.8)).summary
+    independent = run_simulation(make_config(noise_correlation=0.0)).summary
+    negative = run_simulation(make_config(noise_correlation=-0.8)).summary
+
+    assert positive.std_profit < independent.std_profit < negative.std_profit
+
+    # The control variate stays unbiased under correlation
+    controlled = run_simulation(make_config(noise_correlation=0.8, sampling="control_variate")).summary
+    stderr = positive.std_profit / np.sqrt(positive.num_runs)
+    assert abs(controlled.mean_profit - positive.mean_profit) < 4 * stderr
+
+
+def test_correlation_requires_independence_free_engines(make_config):
+    with pytest.raises(ValueError):
+        run_monte_carlo(make_config(engine="python", num_runs=10))
+    with pytest.raises(ValueError):
+        analytic_profit_moments(make_config())
+    with pytest.raises(ValueError):
+        sobol_indices(make_config(num_runs=100))
+
+    request = {
+        "decision": {"price": 10.0},
+        "assumptions": {
+            "demand_model": {"base_demand": 500.0, "price_elasticity": 0.2},
+            "cost_model": {"unit_cost": 5.0, "fixed_cost": 300.0},
+        },
+        "uncertainty": {
+            "demand_noise": {"distribution": "normal", "sigma": 0.2},
+            "elasticity_noise": {"distribution": "normal", "sigma": 0.1},
+            "correlation": 0.5,
+        },
+        "simulation": {"num_runs": 100, "random_seed": 0},
+    }
+    with pytest.raises(ConfigValidationError):
+        PricingSimulationConfig.from_request(request)
+
+    request["simulation"]["engine"] = "numpy"
+    assert PricingSimulationConfig.from_request(request).noise_correlation == 0.5
+
+    request["uncertainty"]["correlation"] = 1.0
+    with pytest.raises(ConfigValidationError):
+        PricingSimulationConfig.from_request(request)
+
+
+def test_horizon_market_and_cost_shocks_are_correlated(make_config):
+    config = make_config(noise_correlation=0.0, num_runs=20_000)
+    horizon = HorizonAssumptions(periods=4, demand_volatility=0.1, cost_volatility=0.05, shock_correlation=-0.5)
+
+    outcomes = simulate_horizon(config, horizon)
+    calm = simulate_horizon(config, replace(horizon, demand_volatility=0.0))
+
+    market = np.log(outcomes.demand[:, 2] / calm.demand[:, 2])
+    unit_cost = (outcomes.total_cost - config.fixed_cost) / outcomes.demand
+    step = np.log(unit_cost[:, 2] / unit_cost[:, 1])
+
+    assert np.corrcoef(market, step)[0, 1] == pytest.approx(-0.5, abs=0.03)
+
+    # Demand shocks themselves do not depend on the correlation
+    independent = simulate_horizon(config, replace(horizon, shock_correlation=0.0))
+    assert np.array_equal(independent.demand, outcomes.demand)
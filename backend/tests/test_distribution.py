@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.simulation.aggregate import exact_percentiles
+from app.simulation.distribution import ecdf, profit_histogram, quantile_grid
+from app.simulation.sketch import KLLSketch
+
+
+@pytest.fixture
+def profits() -> np.ndarray:
+    return np.random.default_rng(0).normal(100.0, 50.0, size=20_000)
+
+
+def sketch_of(values: np.ndarray) -> KLLSketch:
+    sketch = KLLSketch(k=400, seed=1)
+    for chunk in np.array_split(values, 7):
+        sketch.update(chunk)
+    return sketch
+
+
+def test_histogram_matches_numpy_and_counts_out_of_range(profits):
+    hist = profit_histogram(profits, bins=40)
+
+    expected, edges = np.histogram(profits, bins=40)
+    np.testing.assert_array_equal(hist.counts, expected)
+    np.testing.assert_allclose(hist.edges, edges)
+    assert hist.underflow == hist.overflow == 0
+
+    clipped = profit_histogram(profits, bins=10, range=(0.0, 200.0))
+    assert clipped.underflow == np.count_nonzero(profits < 0)
+    assert clipped.overflow == np.count_nonzero(profits > 200)
+    assert clipped.counts.sum() + clipped.underflow + clipped.overflow == len(profits)
+
+
+def test_quantile_grid_uses_summary_rank_convention(profits):
+    grid = quantile_grid(profits, points=101)
+
+    expected = exact_percentiles(profits, [5, 50, 95])
+    assert grid.values[0] == profits.min()
+    assert grid.values[-1] == profits.max()
+    for p, value in expected.items():
+        assert grid.values[p] == value
+    assert np.all(np.diff(grid.values) >= 0)
+
+
+def test_ecdf_is_exact_fraction_below(profits):
+    curve = ecdf(profits, points=50)
+
+    expected = [np.mean(profits <= x) for x in curve.values]
+    np.testing.assert_allclose(curve.probabilities, expected)
+    assert curve.probabilities[-1] == 1.0
+
+
+def test_sketch_sources_agree_within_rank_error(profits):
+    sketch = sketch_of(profits)
+    tolerance = KLLSketch.rank_error(400)
+
+    grid = quantile_grid(sketch, points=21)
+    exact = quantile_grid(profits, points=21)
+    ranks = np.searchsorted(np.sort(profits), grid.values) / len(profits)
+    assert np.all(np.abs(ranks[1:-1] - exact.levels[1:-1]) <= tolerance)
+
+    curve = ecdf(sketch, points=30)
+    expected = [np.mean(profits <= x) for x in curve.values]
+    assert np.max(np.abs(curve.probabilities - expected)) <= tolerance
+
+    hist = profit_histogram(sketch, bins=10, range=(0.0, 200.0))
+    reference = profit_histogram(profits, bins=10, range=(0.0, 200.0))
+    assert np.max(np.abs(hist.counts - reference.counts)) <= 2 * tolerance * len(profits)
+
+
+def test_payload_is_independent_of_sample_count():
+    small = np.random.default_rng(1).normal(size=100)
+    large = np.random.default_rng(1).normal(size=100_000)
+
+    assert len(quantile_grid(small).values) == len(quantile_grid(large).values) == 101
+    assert len(profit_histogram(small).counts) == len(profit_histogram(large).counts) == 50
+
+
+def test_invalid_arguments_fail(profits):
+    with pytest.raises(ValueError):
+        profit_histogram(profits, bins=0)
+    with pytest.raises(ValueError):
+        quantile_grid(profits, points=1)
+    with pytest.raises(ValueError):
+        ecdf(np.empty(0))
@@ -0,0 +1,101 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.simulation.aggregate import StreamingAggregator, summarize_rows
+from app.simulation.batch import run_scenario_batch
+from app.simulation.config import ConfigValidationError, PricingSimulationConfig
+from app.simulation.grid import run_price_grid
+from app.simulation.model import OutcomeBatch
+from app.simulation.monte_carlo import run_monte_carlo
+from app.simulation.results import run_simulation
+
+
+CONFIG = dict(
+    num_runs=200_000,
+)
+
+
+def test_float32_outcomes_are_float32(make_config):
+    outcomes = run_monte_carlo(make_config(num_runs=1000, dtype="float32"))
+
+    for column in (outcomes.demand, outcomes.revenue, outcomes.total_cost, outcomes.profit):
+        assert column.dtype == np.float32
+
+
+@pytest.mark.parametrize("sampling", ["iid", "antithetic", "lhs", "sobol", "control_variate"])
+def test_float32_drift_against_float64(sampling, make_config):
+    # Same seed, same scenarios: only the arithmetic precision differs
+    config = make_config(sampling=sampling)
+    exact = run_simulation(config).summary
+    approx = run_simulation(replace(config, dtype="float32")).summary
+
+    scale = exact.std_profit
+    assert abs(approx.mean_profit - exact.mean_profit) < 1e-5 * scale
+    assert approx.std_profit == pytest.approx(exact.std_profit, rel=1e-5)
+    for p, value in exact.profit_percentiles.items():
+        assert abs(approx.profit_percentiles[p] - value) < 1e-5 * scale
+    for level, value in exact.value_at_risk.items():
+        assert abs(approx.value_at_risk[level] - value) < 1e-5 * scale
+        assert abs(approx.conditional_value_at_risk[level] - exact.conditional_value_at_risk[level]) < 1e-5 * scale
+
+    # Only runs within float32 rounding of break-even can flip sign
+    assert abs(approx.prob_loss - exact.prob_loss) <= 1e-4
+
+
+def test_float32_moments_accumulate_in_float64():
+    # Summing 10^6 float32 values near 10^4 in float32 loses several digits
+    rng = np.random.default_rng(0)
+    profit = (1e4 + rng.standard_normal(1_000_000)).astype(np.float32)
+    reference = profit.astype(np.float64)
+
+    outcomes = OutcomeBatch(demand=profit, revenue=profit, total_cost=profit, profit=profit)
+    summary = StreamingAggregator().update(outcomes).summary()
+    assert summary.mean_profit == pytest.approx(reference.mean(), rel=1e-12)
+    assert summary.std_profit == pytest.approx(reference.std(), rel=1e-9)
+
+    [row] = summarize_rows(profit[None, :])
+    assert row.mean_profit == pytest.approx(reference.mean(), rel=1e-12)
+    assert row.std_profit == pytest.approx(reference.std(), rel=1e-9)
+
+
+def test_float32_grid_and_batch_track_float64(make_config):
+    config = make_config(num_runs=20_000)
+    prices = [6.0, 10.0, 14.0]
+
+    exact = run_price_grid(config, prices)
+    approx = run_price_grid(replace(config, dtype="float32"), prices)
+    for a, e in zip(approx, exact):
+        assert abs(a.mean_profit - e.mean_profit) < 1e-5 * e.std_profit
+
+    configs = [replace(config, price=p, dtype="float32") for p in prices]
+    for a, e in zip(run_scenario_batch(configs), exact):
+        assert abs(a.mean_profit - e.mean_profit) < 1e-5 * e.std_profit
+
+
+def test_float32_requires_numpy_engine(make_config):
+    with pytest.raises(ValueError):
+        run_monte_carlo(make_config(num_runs=10, engine="python", dtype="float32"))
+
+    request = {
+        "decision": {"price": 10.0},
+        "assumptions": {
+            "demand_model": {"base_demand": 500.0, "price_elasticity": 0.2},
+            "cost_model": {"unit_cost": 5.0, "fixed_cost": 300.0},
+        },
+        "uncertainty": {
+            "demand_noise": {"distribution": "normal", "sigma": 0.2},
+            "elasticity_noise": {"distribution": "normal", "sigma": 0.1},
+        },
+        "simulation": {"num_runs": 100, "random_seed": 0, "dtype": "float32"},
+    }
+    with pytest.raises(ConfigValidationError):
+        PricingSimulationConfig.from_request(request)
+
+    request["simulation"]["engine"] = "numpy"
+    assert PricingSimulationConfig.from_request(request).dtype == "float32"
+
+    request["simulation"]["dtype"] = "float16"
+    with pytest.raises(ConfigValidationError):
+        PricingSimulationConfig.from_request(request)
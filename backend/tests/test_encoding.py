@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pytest
+
+from app.api.encoding import (
+    RAW_HEADER,
+    UnsupportedFormat,
+    decode_raw,
+    encode_array,
+    negotiate,
+)
+
+
+def test_negotiation_prefers_format_then_accept_then_json():
+    assert negotiate(None, None) == "json"
+    assert negotiate(None, "*/*") == "json"
+    assert negotiate(None, "application/x-npy;q=0.9, application/json") == "npy"
+    assert negotiate(None, "application/octet-stream") == "f64"
+    assert negotiate("f32", "application/json") == "f32"
+
+    with pytest.raises(UnsupportedFormat):
+        negotiate(None, "text/csv")
+    with pytest.raises(UnsupportedFormat):
+        negotiate("xml", None)
+
+
+@pytest.mark.parametrize("format, dtype", [("f64", np.float64), ("f32", np.float32)])
+def test_raw_round_trip(format, dtype):
+    values = np.random.default_rng(0).normal(size=1001)
+
+    body, media_type = encode_array(values, format)
+
+    assert media_type == f"application/x-risklens-{format}"
+    assert len(body) == RAW_HEADER.size + values.size * np.dtype(dtype).itemsize
+    np.testing.assert_array_equal(decode_raw(bytes(body)), values.astype(dtype))
+
+
+def test_npy_round_trip():
+    values = np.random.default_rng(0).normal(size=77)
+
+    body, _ = encode_array(values, "npy")
+
+    np.testing.assert_array_equal(np.load(io.BytesIO(bytes(body))), values)
+
+
+def test_arrow_requires_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        with pytest.raises(UnsupportedFormat):
+            encode_array(np.zeros(3), "arrow")
+        return
+
+    body, _ = encode_array(np.arange(3.0), "arrow")
+    table = pa.ipc.open_stream(bytes(body)).read_all()
+    assert table.column("profit").to_pylist() == [0.0, 1.0, 2.0]
+
+
+def test_invalid_inputs_fail():
+    with pytest.raises(ValueError):
+        encode_array(np.zeros((2, 2)), "f64")
+    with pytest.raises(ValueError):
+        decode_raw(b"\x00" * RAW_HEADER.size)
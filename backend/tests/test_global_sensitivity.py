@@ -0,0 +1,71 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from app.simulation.analytic import _elasticity_noise_mgf, analytic_profit_moments, noise_moments
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.global_sensitivity import sobol_indices
+
+
+CONFIG = dict(
+    elasticity_noise_sigma=0.3,
+    num_runs=1 << 14,
+    random_seed=2,
+    sampling="sobol",
+)
+
+
+def exact_demand_first_order(config: PricingSimulationConfig) -> float:
+    # E[profit | D] = (p - c) Q0 D M_E(-k p) - F, so V_D = ((p - c) Q0 M_E)^2 Var(D)
+    d1, d2 = noise_moments(config.demand_noise_distribution, config.demand_noise_sigma)
+    mgf = _elasticity_noise_mgf(
+        config.elasticity_noise_distribution,
+        config.elasticity_noise_sigma,
+        np.array([-config.price_elasticity * config.price]),
+    )[0]
+    scale = (config.price - config.unit_cost) * config.base_demand * mgf
+    return scale ** 2 * (d2 - d1 * d1) / analytic_profit_moments(config).profit_variance[0]
+
+
+@pytest.mark.parametrize("sampling", ["sobol", "iid"])
+def test_two_input_indices_match_exact_values(sampling, make_config):
+    config = make_config(sampling=sampling)
+    exact = exact_demand_first_order(config)
+
+    indices = sobol_indices(config)
+
+    assert indices.inputs == ["demand_noise", "elasticity_noise"]
+    assert abs(indices.first_order["demand_noise"] - exact) < 4 * indices.first_order_stderr["demand_noise"]
+    # With two inputs, the total index of one is 1 - first order of the other
+    assert abs(indices.total["elasticity_noise"] - (1 - exact)) < 4 * indices.total_stderr["elasticity_noise"]
+
+
+def test_additive_input_has_equal_first_order_and_total(make_config):
+    indices = sobol_indices(make_config(), unit_cost_sigma=0.2, fixed_cost_sigma=0.3)
+
+    assert indices.inputs == ["demand_noise", "elasticity_noise", "unit_cost", "fixed_cost"]
+    # Fixed cost enters profit additively: no interactions
+    assert indices.first_order["fixed_cost"] == pytest.approx(indices.total["fixed_cost"], abs=0.01)
+    # Elasticity interacts with demand noise
+    assert indices.total["elasticity_noise"] > indices.first_order["elasticity_noise"] + 0.02
+    assert 0 < indices.interaction < 1
+
+
+def test_dominant_input_explains_variance(make_config):
+    config = make_config(demand_noise_sigma=1e-4, elasticity_noise_sigma=1e-4)
+
+    indices = sobol_indices(config, fixed_cost_sigma=0.5)
+
+    assert indices.first_order["fixed_cost"] == pytest.approx(1.0, abs=0.01)
+    assert indices.total["demand_noise"] < 0.01
+
+
+def test_design_is_reproducible_and_validated(make_config):
+    config = make_config(num_runs=1000)
+
+    assert sobol_indices(config) == sobol_indices(config)
+    assert sobol_indices(config) != sobol_indices(dataclasses.replace(config, random_seed=3))
+
+    with pytest.raises(ValueError):
+        sobol_indices(config, unit_cost_sigma=-1.0)
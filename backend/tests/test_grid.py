@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.simulation import grid
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.grid import run_price_grid
+from app.simulation.results import run_simulation
+
+
+CONFIG = dict(
+    num_runs=300,
+    random_seed=5,
+)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_grid_matches_per_price_simulation(engine, make_config):
+    config = make_config(engine=engine)
+    prices = [6.0, 8.5, 10.0, 14.0]
+
+    summaries = run_price_grid(config, prices)
+
+    for price, summary in zip(prices, summaries):
+        expected = run_simulation(
+            PricingSimulationConfig(**{**config.__dict__, "price": price})
+        ).summary
+
+        assert math.isclose(summary.mean_profit, expected.mean_profit, rel_tol=1e-12)
+        assert math.isclose(summary.std_profit, expected.std_profit, rel_tol=1e-9)
+        assert summary.prob_loss == expected.prob_loss
+        for level, var in expected.value_at_risk.items():
+            assert math.isclose(summary.value_at_risk[level], var, rel_tol=1e-12)
+
+
+def test_grid_blocks_do_not_change_results(monkeypatch, make_config):
+    config = make_config()
+    prices = np.linspace(4.0, 16.0, 25)
+
+    whole = run_price_grid(config, prices)
+    monkeypatch.setattr(grid, "GRID_BLOCK_CELLS", config.num_runs * 2)
+    blocked = run_price_grid(config, prices)
+
+    assert [s.mean_profit for s in whole] == [s.mean_profit for s in blocked]
+
+
+def test_empty_grid_fails(make_config):
+    with pytest.raises(ValueError):
+        run_price_grid(make_config(), [])
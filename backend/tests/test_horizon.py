@@ -0,0 +1,119 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.simulation.horizon import HorizonAssumptions, run_horizon, simulate_horizon
+from app.simulation.monte_carlo import run_monte_carlo, sample_noise
+
+
+CONFIG = dict(
+    price=11.0,
+    num_runs=5000,
+    random_seed=4,
+)
+
+
+def test_static_horizon_repeats_the_single_period_model(make_config):
+    config = make_config()
+    single = run_monte_carlo(config)
+
+    outcomes = simulate_horizon(config, HorizonAssumptions(periods=12))
+
+    assert outcomes.profit.shape == (config.num_runs, 12)
+    for t in range(12):
+        assert np.array_equal(outcomes.profit[:, t], single.profit)
+        assert np.array_equal(outcomes.demand[:, t], single.demand)
+    assert np.all(outcomes.retention == 1.0)
+
+
+def test_churn_starts_after_the_retention_lag(make_config):
+    config = make_config()
+    horizon = HorizonAssumptions(periods=8, previous_price=10.0, churn_sensitivity=0.5, retention_lag=3)
+
+    outcomes = simulate_horizon(config, horizon)
+
+    # Churn in period 3 first removes customers in period 4
+    assert np.all(outcomes.retention[:, :4] == 1.0)
+    assert np.all(np.diff(outcomes.retention[:, 3:], axis=1) < 0)
+
+    # Per-run churn scales with the run's price sensitivity
+    _, elasticity_noise = sample_noise(config)
+    churn = 1.0 - outcomes.retention[:, 4]
+    np.testing.assert_allclose(churn, np.minimum(1.0, 0.5 * 0.1 * elasticity_noise), rtol=1e-9)
+
+    # A price cut causes no extra churn
+    cut = simulate_horizon(replace(config, price=9.0), horizon)
+    assert np.all(cut.retention == 1.0)
+
+
+def test_adoption_delay_converges_to_the_new_price_response(make_config):
+    config = make_config()
+    immediate = simulate_horizon(config, HorizonAssumptions(periods=40, previous_price=10.0))
+    delayed = simulate_horizon(config, HorizonAssumptions(periods=40, previous_price=10.0, adoption_delay=3.0))
+
+    # A price increase lowers demand gradually
+    assert np.all(delayed.demand[:, 0] > immediate.demand[:, 0])
+    assert np.all(np.diff(delayed.demand, axis=1) <= 0)
+    np.testing.assert_allclose(delayed.demand[:, -1], immediate.demand[:, -1], rtol=1e-4)
+
+
+def test_cost_inflation_compounds_per_period(make_config):
+    config = make_config()
+    outcomes = simulate_horizon(config, HorizonAssumptions(periods=6, cost_inflation=0.02))
+
+    unit_cost = (outcomes.total_cost - config.fixed_cost) / outcomes.demand
+    expected = config.unit_cost * 1.02 ** np.arange(6)
+    np.testing.assert_allclose(unit_cost, np.broadcast_to(expected, unit_cost.shape), rtol=1e-9)
+
+
+def test_shocks_are_reproducible_and_independent(make_config):
+    config = make_config()
+    horizon = HorizonAssumptions(periods=6, demand_volatility=0.1, cost_volatility=0.05)
+
+    first = simulate_horizon(config, horizon)
+    second = simulate_horizon(config, horizon)
+    assert np.array_equal(first.profit, second.profit)
+
+    # Switching one shock source off leaves the other's draws unchanged
+    demand_only = simulate_horizon(config, replace(horizon, cost_volatility=0.0))
+    assert np.array_equal(first.demand, demand_only.demand)
+
+
+def test_summary_tracks_cumulative_profit(make_config):
+    config = make_config()
+    result = run_horizon(config, HorizonAssumptions(periods=6, previous_price=10.0, churn_sensitivity=0.2))
+
+    cumulative = result.outcomes.cumulative_profit()
+    summary = result.summary
+
+    assert len(summary.cumulative) == 6
+    for t in range(6):
+        assert summary.cumulative[t].mean_profit == pytest.approx(cumulative[:, t].mean(), rel=1e-12)
+        assert summary.cumulative[t].prob_loss == np.mean(cumulative[:, t] < 0)
+    assert summary.total is summary.cumulative[-1]
+    assert summary.mean_profit == pytest.approx(result.outcomes.profit.mean(axis=0).tolist(), rel=1e-12)
+
+
+def test_float32_horizon(make_config):
+    config = make_config()
+    horizon = HorizonAssumptions(periods=12, previous_price=10.0, adoption_delay=2.0, churn_sensitivity=0.2)
+
+    exact = run_horizon(config, horizon).summary.total
+    approx_result = run_horizon(replace(config, dtype="float32"), horizon)
+
+    assert approx_result.outcomes.profit.dtype == np.float32
+    assert abs(approx_result.summary.total.mean_profit - exact.mean_profit) < 1e-5 * exact.std_profit
+
+
+def test_invalid_horizons(make_config):
+    with pytest.raises(ValueError):
+        HorizonAssumptions(periods=0)
+    with pytest.raises(ValueError):
+        HorizonAssumptions(previous_price=0.0)
+    with pytest.raises(ValueError):
+        HorizonAssumptions(cost_inflation=-1.0)
+    with pytest.raises(ValueError):
+        simulate_horizon(make_config(engine="python"), HorizonAssumptions())
+    with pytest.raises(ValueError):
+        simulate_horizon(make_config(sampling="control_variate"), HorizonAssumptions())
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.jobs import JobManager, SimulateJobRequest, cancel_job, create_job, get_job
+from app.api.scheduler import SchedulerBusy, SimulationScheduler
+from app.api.simulation import SimulateRequest, simulate
+
+pytestmark = pytest.mark.usefixtures("isolated_api")
+
+BASE = dict(
+    base_demand=500.0,
+    price_elasticity=0.2,
+    unit_cost=5.0,
+    fixed_cost=100.0,
+    demand_noise_sigma=0.2,
+    elasticity_noise_sigma=0.05,
+)
+
+
+def make_manager(**overrides) -> JobManager:
+    scheduler = SimulationScheduler(max_workers=1, max_inflight_cost=100, max_queue=4)
+    return JobManager(scheduler, **{"max_jobs": 4, "ttl_seconds": 60.0, **overrides})
+
+
+async def wait_done(manager: JobManager, job_id: str):
+    for _ in range(500):
+        job = manager.get(job_id)
+        if job.done:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_in_the_background_and_keeps_its_result():
+    manager = make_manager()
+
+    async def work(job):
+        return await manager.scheduler.run(10, sum, [1, 2, 3])
+
+    async def main():
+        job = manager.submit("sum", work)
+        assert job.status == "queued"
+        return await wait_done(manager, job.id)
+
+    job = asyncio.run(main())
+    assert job.status == "succeeded"
+    assert job.result == 6
+    assert job.progress == 1.0
+    assert manager.stats()["succeeded"] == 1
+
+
+def test_cancel_stops_stepping_between_chunks():
+    manager = make_manager()
+    steps = []
+    first_step = threading.Event()
+
+    def chunks():
+        for i in range(100):
+            steps.append(i)
+            first_step.set()
+            time.sleep(0.01)
+            yield i
+
+    async def work(job):
+        stream = await manager.scheduler.stream(10, chunks)
+        job.status = "running"
+        async for item in stream:
+            job.progress = (item + 1) / 100
+
+    async def main():
+        job = manager.submit("chunks", work)
+        while not first_step.is_set():
+            await asyncio.sleep(0.001)
+        manager.cancel(job.id)
+        await wait_done(manager, job.id)
+        # the step in flight finishes, then the slot is released
+        await asyncio.sleep(0.05)
+        return job
+
+    job = asyncio.run(main())
+    assert job.status == "cancelled"
+    assert len(steps) < 5
+    assert manager.scheduler.stats()["inflight_cost"] == 0
+
+
+def test_unfinished_jobs_are_bounded_and_finished_ones_expire():
+    manager = make_manager(max_jobs=1, ttl_seconds=0.05)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def work(job):
+            await release.wait()
+
+        job = manager.submit("wait", work)
+        with pytest.raises(SchedulerBusy):
+            manager.submit("wait", work)
+
+        release.set()
+        await wait_done(manager, job.id)
+        await asyncio.sleep(0.1)
+        return job
+
+    job = asyncio.run(main())
+    assert manager.get(job.id) is None
+    assert manager.stats()["expired"] == 1
+    assert manager.stats()["rejected"] == 1
+
+
+def test_simulate_job_reports_progress_and_the_simulate_result():
+    req = SimulateRequest(
+        price=10.0, num_runs=150_000, engine="numpy", distribution="histogram", random_seed=201, **BASE
+    )
+
+    async def main():
+        created = await create_job(SimulateJobRequest(kind="simulate", request=req, priority="high"))
+        assert created.status in ("queued", "running")
+
+        for _ in range(1000):
+            job = await get_job(created.id)
+            if job.status == "succeeded":
+                return job
+            await asyncio.sleep(0.01)
+        raise AssertionError("job did not finish")
+
+    job = asyncio.run(main())
+    assert job.priority == "high"
+    assert job.progress == 1.0
+    assert job.partial.runs_completed == 150_000
+    assert job.result == asyncio.run(simulate(req))
+
+
+def test_cancel_unknown_job_is_404():
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(cancel_job("missing"))
+    assert e.value.status_code == 404
@@ -1,8 +1,11 @@
 import math
+import numpy as np
 import pytest
 
 from app.simulation.model import (
+    OutcomeBatch,
     PricingDecision,
+    PricingOutcome,
     PricingParameters,
     evaluate_pricing_causal_model,
 )
@@ -73,3 +76,30 @@ def test_deterministic_behavior():
     outcome2 = evaluate_pricing_causal_model(decision, params)
 
     assert outcome1 == outcome2
+
+
+def test_outcome_batch_row_view_matches_columns():
+    batch = OutcomeBatch(
+        demand=[10.0, 20.0],
+        revenue=[100.0, 200.0],
+        total_cost=[60.0, 90.0],
+        profit=[40.0, 110.0],
+    )
+
+    assert len(batch) == 2
+    assert batch.profit.dtype == np.float64
+    assert batch.profit.flags["C_CONTIGUOUS"]
+    assert batch[1] == PricingOutcome(
+        demand=20.0, revenue=200.0, total_cost=90.0, profit=110.0
+    )
+    assert OutcomeBatch.from_outcomes(list(batch)).profit.tolist() == [40.0, 110.0]
+
+
+def test_outcome_batch_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        OutcomeBatch(
+            demand=[1.0, 2.0],
+            revenue=[1.0],
+            total_cost=[1.0, 2.0],
+            profit=[1.0, 2.0],
+        )
@@ -0,0 +1,125 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.simulation.config import PricingSimulationConfig
+from app.simulation.model import (
+    PricingDecision,
+    PricingParameters,
+    evaluate_from_config,
+    evaluate_pricing_causal_model,
+)
+from app.simulation.monte_carlo import run_monte_carlo, seed_sequence
+from app.simulation.sampler import DistributionSampler, enforce_valid_sample
+
+
+CONFIG = dict(
+    price=12.0,
+    base_demand=200.0,
+    price_elasticity=0.1,
+    unit_cost=4.0,
+    fixed_cost=50.0,
+    demand_noise_distribution="normal",
+    demand_noise_sigma=0.1,
+    elasticity_noise_sigma=0.05,
+    random_seed=7,
+    engine="python",
+)
+
+
+def test_default_engine_is_python(make_config):
+    fields = {k: v for k, v in vars(make_config()).items() if k != "engine"}
+    assert PricingSimulationConfig(**fields).engine == "python"
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_engine_is_reproducible_for_seed(engine, make_config):
+    config = make_config(engine=engine)
+
+    first = run_monte_carlo(config)
+    second = run_monte_carlo(config)
+
+    assert np.array_equal(first.profit, second.profit)
+    assert np.array_equal(first.demand, second.demand)
+
+
+def test_numpy_engine_seeds_do_not_collide_across_sign(make_config):
+    positive = run_monte_carlo(make_config(engine="numpy", random_seed=7))
+    negative = run_monte_carlo(make_config(engine="numpy", random_seed=-7))
+
+    assert not np.array_equal(positive.profit, negative.profit)
+
+    # Non-negative seeds keep their SeedSequence streams
+    assert seed_sequence(7).generate_state(4).tolist() == np.random.SeedSequence(7).generate_state(4).tolist()
+
+    with pytest.raises(ValueError):
+        seed_sequence(1 << 63)
+
+
+def test_numpy_engine_outcomes_are_internally_consistent(make_config):
+    config = make_config(engine="numpy")
+
+    for o in run_monte_carlo(config):
+        assert math.isclose(o.revenue, config.price * o.demand)
+        assert math.isclose(o.total_cost, config.fixed_cost + config.unit_cost * o.demand)
+        assert math.isclose(o.profit, o.revenue - o.total_cost)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal"])
+def test_engines_agree_in_distribution(distribution, make_config):
+    python_outcomes = run_monte_carlo(
+        make_config(engine="python", demand_noise_distribution=distribution, num_runs=20000)
+    )
+    numpy_outcomes = run_monte_carlo(
+        make_config(engine="numpy", demand_noise_distribution=distribution, num_runs=20000)
+    )
+
+    python_mean = float(np.mean(python_outcomes.profit))
+    numpy_mean = float(np.mean(numpy_outcomes.profit))
+
+    assert len(numpy_outcomes) == len(python_outcomes)
+    assert math.isclose(python_mean, numpy_mean, rel_tol=0.02)
+
+
+def test_numpy_engine_converges_to_deterministic_model_for_small_noise(make_config):
+    config = make_config(
+        engine="numpy",
+        demand_noise_sigma=1e-6,
+        elasticity_noise_sigma=1e-6,
+    )
+    expected = evaluate_from_config(config)
+
+    outcomes = run_monte_carlo(config)
+
+    assert np.allclose(outcomes.profit, expected.profit, rtol=1e-4)
+
+
+def test_unsupported_engine_fails(make_config):
+    with pytest.raises(ValueError):
+        run_monte_carlo(make_config(engine="fortran"))
+
+
+def test_python_engine_matches_legacy_scalar_loop(make_config):
+    config = make_config(num_runs=50)
+    rng = random.Random(config.random_seed)
+    sampler = DistributionSampler(rng)
+
+    expected = []
+    for _ in range(config.num_runs):
+        d = enforce_valid_sample(sampler.sample("normal", config.demand_noise_sigma))
+        e = enforce_valid_sample(sampler.sample("normal", config.elasticity_noise_sigma))
+        expected.append(
+            evaluate_pricing_causal_model(
+                PricingDecision(price=config.price),
+                PricingParameters(
+                    base_demand=config.base_demand * d,
+                    price_elasticity=config.price_elasticity * e,
+                    unit_cost=config.unit_cost,
+                    fixed_cost=config.fixed_cost,
+                ),
+            )
+        )
+
+    assert list(run_monte_carlo(config)) == expected
@@ -0,0 +1,129 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.simulation.monte_carlo import STREAM_CHUNK_RUNS, evaluate_noise, run_monte_carlo, sample_noise
+from app.simulation.pipeline import STAGES, SimulationPipeline
+from app.simulation.results import iter_simulation, run_simulation
+from app.simulation.sensitivity import sensitivity_analysis
+
+
+CONFIG = dict(
+    num_runs=STREAM_CHUNK_RUNS + 1000,
+    random_seed=6,
+)
+
+
+def computed(pipeline: SimulationPipeline):
+    return {name: counts["computed"] for name, counts in pipeline.stats()["stages"].items()}
+
+
+def assert_outcomes_equal(actual, expected):
+    for column in ("demand", "revenue", "total_cost", "profit"):
+        assert np.array_equal(getattr(actual, column), getattr(expected, column))
+
+
+def test_pipeline_reproduces_run_monte_carlo(make_config):
+    for config in (make_config(), make_config(dtype="float32"), make_config(sampling="sobol")):
+        assert_outcomes_equal(SimulationPipeline().evaluate(config), run_monte_carlo(config))
+
+    # The python engine: the batch model over its (scalar-loop) draws
+    config = make_config(engine="python", num_runs=500)
+    expected = evaluate_noise(config, *sample_noise(config))
+    assert_outcomes_equal(SimulationPipeline().evaluate(config), expected)
+
+
+def test_only_downstream_stages_are_recomputed(make_config):
+    pipeline = SimulationPipeline()
+    config = make_config()
+    parts = 2
+
+    pipeline.evaluate(config)
+    assert computed(pipeline) == {name: parts for name in STAGES}
+
+    # Costs: noise, demand and revenue are reused
+    cheaper = replace(config, unit_cost=4.0, fixed_cost=100.0)
+    assert_outcomes_equal(pipeline.evaluate(cheaper), run_monte_carlo(cheaper))
+    assert computed(pipeline) == {
+        "noise": parts, "demand": parts, "revenue": parts, "total_cost": 2 * parts, "profit": 2 * parts,
+    }
+
+    # Price: only the noise is reused
+    pipeline.evaluate(replace(config, price=12.0))
+    assert computed(pipeline) == {
+        "noise": parts, "demand": 2 * parts, "revenue": 2 * parts, "total_cost": 3 * parts, "profit": 3 * parts,
+    }
+
+    # Seed: everything is recomputed; the original config is still memoized
+    pipeline.evaluate(replace(config, random_seed=7))
+    before = computed(pipeline)
+    pipeline.evaluate(config)
+    assert computed(pipeline) == before
+
+
+def test_memoized_arrays_are_read_only_and_evicted_under_budget(make_config):
+    config = make_config(num_runs=1000)
+    pipeline = SimulationPipeline(max_bytes=5 * 8000)
+
+    outcomes = pipeline.evaluate(config)
+    assert not outcomes.profit.flags.writeable
+
+    # 6 arrays of 8000 bytes do not fit: the oldest entries go
+    assert pipeline.stats()["bytes"] <= 5 * 8000
+    assert pipeline.stats()["evictions"] > 0
+    assert_outcomes_equal(pipeline.evaluate(config), run_monte_carlo(config))
+
+
+@pytest.mark.parametrize("sampling", ["iid", "control_variate"])
+def test_run_simulation_with_pipeline_is_unchanged(sampling, make_config):
+    config = make_config(sampling=sampling)
+    pipeline = SimulationPipeline()
+
+    expected = run_simulation(config)
+    for cfg in (config, config):
+        result = run_simulation(cfg, pipeline=pipeline)
+        assert result.summary == expected.summary
+        assert_outcomes_equal(result.outcomes, expected.outcomes)
+
+    *_, streamed = iter_simulation(config, pipeline=pipeline)
+    assert streamed.summary == expected.summary
+
+    with pytest.raises(ValueError):
+        run_simulation(config, workers=2, pipeline=pipeline)
+    with pytest.raises(ValueError):
+        run_simulation(config, constant_memory=True, pipeline=pipeline)
+    with pytest.raises(ValueError):
+        run_simulation(make_config(engine="python", num_runs=10), pipeline=pipeline)
+
+
+def test_sensitivity_cost_legs_reuse_demand(make_config):
+    config = make_config()
+    pipeline = SimulationPipeline()
+
+    impacts = sensitivity_analysis(config, 0.1, pipeline=pipeline)
+
+    # Same numbers as evaluating every leg on the shared draws
+    noise = sample_noise(config)
+    base = np.mean(evaluate_noise(config, *noise).profit)
+    for name, impact in impacts.items():
+        perturbed = replace(config, **{name: getattr(config, name) * 1.1})
+        assert impact == float(np.mean(evaluate_noise(perturbed, *noise).profit)) - float(base)
+
+    # Demand: base, base_demand and price_elasticity legs; costs: every leg
+    parts = 2
+    assert computed(pipeline) == {
+        "noise": parts, "demand": 3 * parts, "revenue": 3 * parts, "total_cost": 5 * parts, "profit": 5 * parts,
+    }
+
+
+def test_sensitivity_under_control_variate_matches_run_simulation(make_config):
+    config = make_config(sampling="control_variate")
+
+    impacts = sensitivity_analysis(config, 0.1)
+
+    # Differences of the control-variate means, not of the raw ones
+    base = run_simulation(config).summary.mean_profit
+    for name, impact in impacts.items():
+        perturbed = replace(config, **{name: getattr(config, name) * 1.1})
+        assert impact == pytest.approx(run_simulation(perturbed).summary.mean_profit - base, rel=1e-12, abs=1e-9)
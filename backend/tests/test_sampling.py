@@ -0,0 +1,124 @@
+import dataclasses
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from app.simulation.analytic import analytic_profit_moments
+from app.simulation.config import ConfigValidationError, PricingSimulationConfig
+from app.simulation.grid import run_price_grid
+from app.simulation.monte_carlo import run_monte_carlo, sample_noise
+from app.simulation.qmc import norm_ppf, sobol_points
+from app.simulation.results import run_simulation
+from app.simulation.sampler import ArraySampler
+
+METHODS = ["iid", "antithetic", "lhs", "sobol", "control_variate"]
+
+
+def test_norm_ppf_matches_inverse_cdf():
+    u = np.array([1e-12, 1e-5, 0.02, 0.3, 0.5, 0.9, 0.999, 1 - 1e-9])
+    expected = [NormalDist().inv_cdf(x) for x in u]
+
+    np.testing.assert_allclose(norm_ppf(u), expected, rtol=1e-8, atol=1e-8)
+
+
+def test_scrambled_sobol_is_a_net():
+    points = sobol_points(256, 2, np.random.default_rng(0))
+
+    assert np.all((points > 0) & (points < 1))
+    # Every elementary box of volume 1/256 holds exactly one point
+    for a in range(9):
+        b = 8 - a
+        cells = np.floor(points[0] * 2 ** a) * 2 ** b + np.floor(points[1] * 2 ** b)
+        assert len(np.unique(cells)) == 256
+
+
+def test_lhs_and_antithetic_structure():
+    sampler = ArraySampler(np.random.default_rng(0))
+
+    z = sampler.standard_normals("lhs", 2, 500)
+    for row in z:
+        u = np.array([NormalDist().cdf(v) for v in row])
+        assert sorted(np.floor(u * 500).astype(int)) == list(range(500))
+
+    z = sampler.standard_normals("antithetic", 2, 501)
+    np.testing.assert_array_equal(z[:, 1::2], -z[:, 0:-1:2])
+
+
+@pytest.mark.parametrize("sampling", ["antithetic", "lhs", "sobol"])
+def test_noise_marginals_are_preserved(sampling, make_config):
+    config = make_config(sampling=sampling, num_runs=50_000)
+
+    demand_noise, elasticity_noise = sample_noise(config)
+
+    assert math.isclose(np.mean(np.log(demand_noise)), 0.0, abs_tol=0.01)
+    assert math.isclose(np.std(np.log(demand_noise)), 0.3, rel_tol=0.02)
+    assert math.isclose(np.mean(elasticity_noise), 1.0, abs_tol=0.003)
+    assert math.isclose(np.std(elasticity_noise), 0.1, rel_tol=0.02)
+
+
+@pytest.mark.parametrize("sampling", METHODS)
+def test_methods_are_unbiased_and_reproducible(sampling, make_config):
+    config = make_config(sampling=sampling)
+    expected = analytic_profit_moments(config).mean_profit[0]
+
+    means = [
+        run_simulation(dataclasses.replace(config, random_seed=seed)).summary.mean_profit
+        for seed in range(40)
+    ]
+    iid = [
+        run_simulation(make_config(random_seed=seed)).summary.mean_profit
+        for seed in range(40)
+    ]
+
+    # Never worse than plain draws, and centred on the exact mean
+    assert np.var(means) <= 1.2 * np.var(iid)
+    assert abs(np.mean(means) - expected) < 4 * math.sqrt(np.var(iid) / 40)
+
+    again = run_monte_carlo(config).profit
+    np.testing.assert_array_equal(run_monte_carlo(config).profit, again)
+
+
+def test_control_variate_only_changes_mean(make_config):
+    plain = run_simulation(make_config()).summary
+    adjusted = run_simulation(make_config(sampling="control_variate")).summary
+
+    assert adjusted.mean_profit != plain.mean_profit
+    assert dataclasses.replace(adjusted, mean_profit=plain.mean_profit) == plain
+
+
+@pytest.mark.parametrize("sampling", METHODS)
+def test_grid_matches_per_price_simulation(sampling, make_config):
+    config = make_config(sampling=sampling)
+    prices = [6.0, 10.0, 16.0]
+
+    summaries = run_price_grid(config, prices)
+
+    for price, summary in zip(prices, summaries):
+        expected = run_simulation(dataclasses.replace(config, price=price)).summary
+        assert math.isclose(summary.mean_profit, expected.mean_profit, rel_tol=1e-9)
+        assert summary.prob_loss == expected.prob_loss
+
+
+def test_sampling_requires_numpy_engine(make_config):
+    with pytest.raises(ValueError):
+        run_monte_carlo(make_config(engine="python", sampling="sobol"))
+
+    request = {
+        "decision": {"price": 10.0},
+        "assumptions": {
+            "demand_model": {"base_demand": 500.0, "price_elasticity": 0.2},
+            "cost_model": {"unit_cost": 5.0, "fixed_cost": 300.0},
+        },
+        "uncertainty": {
+            "demand_noise": {"distribution": "normal", "sigma": 0.2},
+            "elasticity_noise": {"distribution": "normal", "sigma": 0.1},
+        },
+        "simulation": {"num_runs": 100, "random_seed": 0, "sampling": "sobol"},
+    }
+    with pytest.raises(ConfigValidationError):
+        PricingSimulationConfig.from_request(request)
+
+    request["simulation"]["engine"] = "numpy"
+    assert PricingSimulationConfig.from_request(request).sampling == "sobol"
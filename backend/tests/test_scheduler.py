@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.api.scheduler import SchedulerBusy, SimulationScheduler, SimulationTooLarge
+
+
+def test_runs_work_off_the_event_loop():
+    scheduler = SimulationScheduler(max_workers=2, max_inflight_cost=100, max_queue=4)
+
+    async def main():
+        return await scheduler.run(10, threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+    assert scheduler.stats()["completed"] == 1
+    assert scheduler.stats()["inflight_cost"] == 0
+
+
+def test_jobs_over_budget_wait_and_full_queue_rejects():
+    scheduler = SimulationScheduler(max_workers=4, max_inflight_cost=100, max_queue=1)
+    gate = threading.Event()
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(80, gate.wait))
+        await asyncio.sleep(0.01)
+
+        # Doesn't fit next to the first job: queued
+        second = asyncio.create_task(scheduler.run(50, lambda: "second"))
+        await asyncio.sleep(0.01)
+        stats = scheduler.stats()
+        assert stats["inflight_cost"] == 80
+        assert stats["queue_depth"] == 1
+
+        # Queue is full
+        with pytest.raises(SchedulerBusy) as busy:
+            await scheduler.run(50, lambda: "third")
+        assert busy.value.retry_after >= 1
+
+        gate.set()
+        await first
+        assert await second == "second"
+
+    asyncio.run(main())
+
+    stats = scheduler.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = SimulationScheduler(max_workers=1, max_inflight_cost=10, max_queue=2)
+    gate = threading.Event()
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(10, gate.wait))
+        await asyncio.sleep(0.01)
+
+        waiting = asyncio.create_task(scheduler.run(10, lambda: None))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["queue_depth"] == 0
+
+        gate.set()
+        await first
+
+    asyncio.run(main())
+    assert scheduler.stats()["inflight_cost"] == 0
+
+
+def test_single_job_above_budget_is_rejected():
+    scheduler = SimulationScheduler(max_workers=1, max_inflight_cost=10, max_queue=2)
+
+    with pytest.raises(SimulationTooLarge):
+        asyncio.run(scheduler.run(11, lambda: None))
+
+
+def test_stream_steps_lazily_and_releases_when_closed():
+    scheduler = SimulationScheduler(max_workers=1, max_inflight_cost=10, max_queue=2)
+    steps = []
+    gate = threading.Event()
+
+    def produce():
+        for i in range(5):
+            if i == 1:
+                gate.wait()
+            steps.append(i)
+            yield i
+
+    async def main():
+        stream = await scheduler.stream(10, produce)
+        items = stream.__aiter__()
+        assert await items.__anext__() == 0
+
+        # Second step blocks in the worker; the consumer goes away meanwhile
+        pending = asyncio.ensure_future(items.__anext__())
+        await asyncio.sleep(0.01)
+        pending.cancel()
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["inflight_cost"] == 10
+
+        gate.set()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+
+    # The running step finished, no further step was started
+    assert steps == [0, 1]
+    assert scheduler.stats()["inflight_cost"] == 0
+    assert scheduler.stats()["completed"] == 1
+
+
+def test_waiters_are_admitted_by_priority_then_fifo():
+    scheduler = SimulationScheduler(max_workers=1, max_inflight_cost=10, max_queue=4)
+    gate = threading.Event()
+    order = []
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(10, gate.wait))
+        await asyncio.sleep(0.01)
+
+        waiting = []
+        for name, priority in [("low", -1), ("normal-1", 0), ("high", 1), ("normal-2", 0)]:
+            waiting.append(asyncio.create_task(scheduler.run(10, order.append, name, priority=priority)))
+            await asyncio.sleep(0.01)
+
+        gate.set()
+        await first
+        await asyncio.gather(*waiting)
+
+    asyncio.run(main())
+    assert order == ["high", "normal-1", "normal-2", "low"]
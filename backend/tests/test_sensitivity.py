@@ -0,0 +1,67 @@
+import dataclasses
+import math
+
+import pytest
+
+from app.simulation.analytic import analytic_profit_moments
+from app.simulation.results import run_simulation
+from app.simulation.sensitivity import (
+    ASSUMPTIONS,
+    local_sensitivities,
+    rank_assumptions_by_impact,
+    sensitivity_analysis,
+)
+
+
+CONFIG = dict(
+    num_runs=50_000,
+    random_seed=4,
+)
+
+
+@pytest.mark.parametrize("name", ASSUMPTIONS)
+def test_pathwise_derivatives_match_exact_derivatives(name, make_config):
+    config = make_config()
+    h = 1e-6 * getattr(config, name)
+
+    def exact_mean(value):
+        return analytic_profit_moments(dataclasses.replace(config, **{name: value})).mean_profit[0]
+
+    value = getattr(config, name)
+    expected = (exact_mean(value + h) - exact_mean(value - h)) / (2 * h)
+
+    sensitivity = local_sensitivities(config)[name]
+
+    assert abs(sensitivity.derivative - expected) <= 4 * sensitivity.derivative_stderr + 1e-9
+
+
+def test_elasticities_follow_from_derivatives(make_config):
+    config = make_config()
+    mean_profit = run_simulation(config).summary.mean_profit
+
+    sensitivities = local_sensitivities(config)
+
+    for name, s in sensitivities.items():
+        assert math.isclose(s.elasticity, s.derivative * getattr(config, name) / mean_profit, rel_tol=1e-9)
+        assert s.elasticity_stderr > 0
+    assert sensitivities["fixed_cost"].derivative_stderr == 0
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_finite_differences_match_separate_simulations(engine, make_config):
+    config = make_config(engine=engine, num_runs=500)
+
+    impacts = sensitivity_analysis(config, perturbation=0.1)
+
+    base = run_simulation(config).summary.mean_profit
+    for name in ASSUMPTIONS:
+        perturbed = dataclasses.replace(config, **{name: getattr(config, name) * 1.1})
+        expected = run_simulation(perturbed).summary.mean_profit - base
+        assert math.isclose(impacts[name], expected, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_ranking_orders_by_absolute_impact(make_config):
+    ranked = rank_assumptions_by_impact(make_config(num_runs=500))
+
+    assert [abs(v) for _, v in ranked] == sorted((abs(v) for _, v in ranked), reverse=True)
+    assert {name for name, _ in ranked} == set(ASSUMPTIONS)
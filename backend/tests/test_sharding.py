@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from app.simulation.monte_carlo import (
+    STREAM_CHUNK_RUNS,
+    num_chunks,
+    run_monte_carlo,
+    sample_noise_chunk,
+)
+from app.simulation.results import SimulationProgress, iter_simulation, run_simulation
+
+
+CONFIG = dict(
+    fixed_cost=900.0,
+    num_runs=3 * STREAM_CHUNK_RUNS + 123,
+    random_seed=42,
+)
+
+
+def test_chunk_streams_are_spawned_children_of_the_seed(make_config):
+    config = make_config()
+    child = np.random.SeedSequence(config.random_seed).spawn(num_chunks(config))[2]
+    expected = np.random.default_rng(child).lognormal(0.0, config.demand_noise_sigma, STREAM_CHUNK_RUNS)
+
+    demand_noise, _ = sample_noise_chunk(config, 2)
+
+    assert num_chunks(config) == 4
+    assert np.array_equal(demand_noise, np.maximum(1e-8, expected))
+
+
+def test_results_are_bit_identical_for_any_worker_count(make_config):
+    config = make_config()
+
+    serial = run_simulation(config)
+    for workers in (1, 2, 3):
+        sharded = run_simulation(config, workers=workers)
+
+        assert sharded.summary == serial.summary
+        assert np.array_equal(sharded.outcomes.profit, serial.outcomes.profit)
+
+
+def test_sharded_outcomes_match_unsharded_monte_carlo(make_config):
+    config = make_config()
+
+    assert np.array_equal(
+        run_simulation(config, workers=2).outcomes.profit,
+        run_monte_carlo(config).profit,
+    )
+
+
+def test_parallel_python_engine_fails(make_config):
+    with pytest.raises(ValueError):
+        run_simulation(make_config(engine="python", num_runs=10), workers=2)
+
+
+def test_iter_simulation_reports_progress_then_the_exact_result(make_config):
+    config = make_config()
+
+    *progress, result = iter_simulation(config)
+
+    assert all(isinstance(p, SimulationProgress) for p in progress)
+    assert [p.runs_completed for p in progress] == [
+        STREAM_CHUNK_RUNS, 2 * STREAM_CHUNK_RUNS, 3 * STREAM_CHUNK_RUNS, config.num_runs
+    ]
+    assert result.summary == run_simulation(config).summary
+    assert progress[-1].mean_profit == result.summary.mean_profit
+    assert progress[-1].prob_loss == result.summary.prob_loss
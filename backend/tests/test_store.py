@@ -0,0 +1,83 @@
+import json
+import sqlite3
+
+import numpy as np
+
+from app.simulation.cache import SimulationCache, cached_run_simulation, config_key
+from app.simulation.results import run_simulation
+from app.simulation.store import SimulationStore
+
+
+CONFIG = dict(
+    fixed_cost=100.0,
+    demand_noise_sigma=0.2,
+    elasticity_noise_sigma=0.05,
+    num_runs=5000,
+)
+
+
+def test_round_trip_memory_maps_outcomes(tmp_path, make_config):
+    config = make_config()
+    result = run_simulation(config)
+    key = config_key("simulation", config)
+
+    SimulationStore(str(tmp_path)).put(key, result, config)
+
+    # A fresh instance (e.g. after a restart) sees the result
+    loaded = SimulationStore(str(tmp_path)).get(key)
+
+    assert loaded.summary == result.summary
+    assert isinstance(loaded.outcomes.profit, np.memmap)
+    assert np.array_equal(loaded.outcomes.profit, result.outcomes.profit)
+
+
+def test_reaggregate_from_stored_columns(tmp_path, make_config):
+    config = make_config()
+    result = run_simulation(config)
+    store = SimulationStore(str(tmp_path))
+    store.put("k", result)
+
+    summary = store.reaggregate("k", percentiles=[1, 99], risk_levels=[0.9])
+
+    expected = run_simulation(config, risk_levels=[0.9]).summary
+    assert summary.value_at_risk == expected.value_at_risk
+    assert sorted(summary.profit_percentiles) == [1, 99]
+    assert store.reaggregate("missing") is None
+
+
+def test_gc_removes_least_recently_accessed(tmp_path, make_config):
+    results = [run_simulation(make_config(random_seed=s)) for s in range(3)]
+    per_result = 4 * (results[0].outcomes.nbytes // 4 + 128)
+    store = SimulationStore(str(tmp_path), max_bytes=2 * per_result)
+
+    store.put("a", results[0])
+    store.put("b", results[1])
+    store.get("a")  # b is now least recently used
+    store.put("c", results[2])
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+    assert not (tmp_path / "b"[:2] / "b").exists()
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_cache_falls_back_to_store_across_restarts(tmp_path, make_config):
+    config = make_config()
+
+    first = cached_run_simulation(
+        SimulationCache(store=SimulationStore(str(tmp_path))), config
+    )
+
+    cache = SimulationCache(store=SimulationStore(str(tmp_path)))
+    second = cached_run_simulation(cache, config)
+
+    assert cache.stats()["store_hits"] == 1
+    assert cache.stats()["misses"] == 0
+    assert second.summary == first.summary
+    assert np.array_equal(second.outcomes.profit, first.outcomes.profit)
+
+    # The index records the config of results written through the cache
+    with sqlite3.connect(tmp_path / "index.sqlite3") as conn:
+        [(config_json,)] = conn.execute("SELECT config_json FROM results").fetchall()
+    assert json.loads(config_json)["random_seed"] == config.random_seed